@@ -3,26 +3,14 @@ Module app.py - Logique principale de l'application Blow Chat YT
 Contient les classes et fonctions pour gérer la logique métier de l'application.
 """
 
-import configparser
-import math
 import os
 import pickle
 import queue
-import re
-import sys
 import threading
 import tkinter as tk
 from tkinter import messagebox
-from urllib.parse import parse_qs, urlparse
 
-import faiss
-import PyPDF2
-from googleapiclient.discovery import build
-from huggingface_hub import login
-from langchain.schema import AIMessage, HumanMessage, SystemMessage
-from langchain_groq import ChatGroq
-from sentence_transformers import SentenceTransformer
-from youtube_transcript_api import YouTubeTranscriptApi
+from langchain.schema import HumanMessage
 
 # Pour supprimer les messages d'erreur après la fermeture
 try:
@@ -94,161 +82,49 @@ def patched_after(self, ms, func=None, *args):
 # Appliquer le patch
 tk.Misc.after = patched_after
 
+from core import BlowChatCore
 from interface import BlowChatInterface
+from jobs import BackgroundJob
+from pipeline import PipelineCancelled
+from renderer import StreamRenderer, stream_intervals
+from scheduler import RequestScheduler
 
 
-class BlowChatApp:
-    """Classe principale pour la logique métier de l'application Blow Chat YT"""
+class BlowChatApp(BlowChatCore):
+    """Classe principale de l'application Blow Chat YT : logique métier reliée à l'interface graphique"""
     
     def __init__(self):
         """Initialisation de l'application"""
-        # Configuration
-        self.config = configparser.ConfigParser()
-        self.config_file = "config.ini"
-        
-        # Historique de conversation
-        self.conversation_history = []
-        
-        # Index et données pour la recherche
-        self.index = None
-        self.data = None
-        self.current_database_name = None
-        
-        # Créer les répertoires nécessaires
-        self.create_directories()
-        
-        # Charger la configuration (UNE SEULE FOIS ICI)
-        self.load_config()
-        
-        # Initialiser l'authentification Hugging Face
-        self.init_huggingface_auth()
+        # Configuration, répertoires, authentification et état de la recherche
+        super().__init__()
+        
+        # Opération en arrière-plan sur les bases de données (création ou enrichissement)
+        self.database_job = None
+        # Récupération YouTube en arrière-plan (transcriptions et rapports)
+        self.youtube_job = None
+        # Génération de réponse en cours (threading.Event d'interruption)
+        self.generation_cancel = None
+        # Recherche anticipée programmée pendant la saisie (identifiant 'after')
+        self.prefetch_after_id = None
+        # Questions de la conversation : une génération à la fois ([Model] request_policy)
+        self.request_scheduler = RequestScheduler(
+            self.start_request,
+            policy=self.config.get('Model', 'request_policy', fallback='queue'),
+            max_queue=self.config.getint('Model', 'request_queue_size', fallback=5)
+        )
+        # Délai entre deux tokens affichés pour chaque vitesse et cadence de l'affichage ([Stream])
+        self.stream_intervals = stream_intervals(self.config)
+        self.stream_frame_rate = self.config.getint('Stream', 'frame_rate', fallback=30)
         
         # Initialiser l'interface
         self.init_interface()
-        
-    def init_huggingface_auth(self):
-        """Initialise l'authentification avec Hugging Face Hub"""
-        try:
-            # D'abord vérifier les variables d'environnement
-            hf_token = os.environ.get('HUGGINGFACE_TOKEN')
-            
-            # Si non trouvé, vérifier dans le fichier de configuration
-            if not hf_token:
-                hf_token = self.config.get('API_KEYS', 'huggingface_token', fallback='')
-                
-            # S'authentifier seulement si un token est disponible
-            if hf_token:
-                login(token=hf_token)
-                print("Authentification Hugging Face réussie")
-            else:
-                print("Avertissement: Aucun token Hugging Face trouvé. Certaines fonctionnalités peuvent être limitées.")
-                
-        except Exception as e:
-            import logging
-            logging.getLogger('BlowChatYT').error(f"Erreur lors de l'initialisation de l'authentification Hugging Face: {e}")
-            print(f"Erreur d'authentification Hugging Face: {e}")
-    
-    def create_directories(self):
-        """Crée les répertoires nécessaires pour l'application"""
-        directories = [
-            "1_history_pkl",
-            "2_conversation_txt",
-            "3_transcriptions",
-            "4_markdown_reports",
-            "5_database"
-        ]
-        for directory in directories:
-            if not os.path.exists(directory):
-                os.makedirs(directory)
-                print(f"Répertoire créé : {directory}")
-    
-    def load_config(self):
-        """Charge la configuration depuis le fichier config.ini"""
-        try:
-            # Essayer de charger depuis le chemin par défaut
-            if os.path.exists(self.config_file):
-                self.config.read(self.config_file, encoding='utf-8')
-                print(f"Configuration chargée depuis {self.config_file}")
-            else:
-                # Vérifier si une configuration existe dans le dossier utilisateur
-                user_dir = os.path.expanduser("~")
-                alt_config_file = os.path.join(user_dir, "blow_chat_config.ini")
-                
-                if os.path.exists(alt_config_file):
-                    self.config_file = alt_config_file
-                    self.config.read(self.config_file, encoding='utf-8')
-                    print(f"Configuration chargée depuis le chemin alternatif: {self.config_file}")
-                else:
-                    # Créer une configuration par défaut
-                    self._create_default_config()
-                    print("Configuration par défaut créée")
-        except Exception as e:
-            print(f"Erreur lors du chargement de la configuration: {e}")
-            # Créer une configuration par défaut en cas d'erreur
-            self._create_default_config()
-            print("Configuration par défaut créée suite à une erreur")
-    
-    def _create_default_config(self):
-        """Crée une configuration par défaut"""
-        self.config['API_KEYS'] = {}
-        self.config['Appearance'] = {
-            'theme': 'blue',
-            'font_size': '12',
-            'color_system': '#0000FF',
-            'color_user': '#008000',
-            'color_model': '#FF0000',
-            'color_model_name': '#800080',
-            'color_user_name': '#FFA500'
-        }
-        self.config['Assistant'] = {
-            'name': 'LIHA',
-            'role': 'Assistant',
-            'objective': "Aider l'utilisateur"
-        }
-        self.config['Directories'] = {}
-        self.config['Model'] = {
-            'temperature': '0.3',
-            'max_tokens': '6000',
-            'max_history_length': '5'
-        }
-        self.config['Stream'] = {
-            'default_speed': 'Normal',
-            'lent': '1000',
-            'normal': '500',
-            'rapide': '100',
-            'tres_rapide': '50',
-            'turbo': '10'
-        }
-        self.save_config()
-    
-    def save_config(self):
-        """Sauvegarde la configuration dans le fichier config.ini et retourne True si réussi"""
-        try:
-            # Vérifier les droits d'écriture en essayant d'écrire un fichier test
-            test_file = os.path.join(os.path.dirname(self.config_file), "test_write.tmp")
-            try:
-                with open(test_file, 'w') as f:
-                    f.write("test")
-                os.remove(test_file)
-            except (IOError, PermissionError) as e:
-                print(f"ATTENTION: Impossible d'écrire dans le répertoire: {e}")
-                # Utiliser un chemin alternatif dans le dossier utilisateur
-                user_dir = os.path.expanduser("~")
-                self.config_file = os.path.join(user_dir, "blow_chat_config.ini")
-                print(f"Utilisation du chemin alternatif pour la configuration: {self.config_file}")
-            
-            # Sauvegarde proprement dite
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                self.config.write(f)
-            # print(f"Configuration sauvegardée dans {self.config_file}")
-            return True
-        except Exception as e:
-            print(f"ERREUR CRITIQUE lors de la sauvegarde de la configuration: {e}")
-            messagebox.showerror("Erreur de configuration", 
-                               f"Impossible de sauvegarder la configuration: {e}\n"
-                               "Vos paramètres ne seront pas conservés.")
-            return False
     
+    def report_config_error(self, error):
+        """Affiche une boîte de dialogue en cas d'échec de la sauvegarde de la configuration"""
+        messagebox.showerror("Erreur de configuration", 
+                             f"Impossible de sauvegarder la configuration: {error}\n"
+                             "Vos paramètres ne seront pas conservés.")
+        
     def init_interface(self):
         """Initialise l'interface graphique avec les callbacks nécessaires"""
         self.interface = BlowChatInterface(
@@ -263,7 +139,11 @@ class BlowChatApp:
             on_closing_callback=self.on_closing,
             on_enrich_database_callback=self.enrich_database,
             on_get_available_databases_callback=self.get_available_databases,
-            on_get_available_sources_callback=self.get_available_sources
+            on_get_available_sources_callback=self.get_available_sources,
+            on_cancel_database_job_callback=self.cancel_database_job,
+            on_cancel_youtube_job_callback=self.cancel_youtube_job,
+            on_cancel_generation_callback=self.cancel_generation_request,
+            on_draft_changed_callback=self.on_draft_changed
         )
         
         # S'assurer que la liste des callbacks after est initialisée
@@ -492,7 +372,7 @@ class BlowChatApp:
         history_files = os.path.join(history_folder, "memo.pkl")
         try:
             with open(history_files, 'wb') as f:
-                pickle.dump(self.conversation_history, f)
+                pickle.dump({'history': self.conversation_history, 'summary': self.conversation_summary}, f)
             # print("Historique de conversation sauvegardé automatiquement.")
             
             # Sauvegarder également la configuration
@@ -509,18 +389,23 @@ class BlowChatApp:
         if os.path.exists(history_files):
             try:
                 with open(history_files, 'rb') as f:
-                    self.conversation_history = pickle.load(f)
+                    saved = pickle.load(f)
+                # Anciennes sauvegardes : liste des messages, sans résumé
+                if isinstance(saved, dict):
+                    self.reset_memory(saved.get('history', []), saved.get('summary', ''))
+                else:
+                    self.reset_memory(saved)
                 # print("Historique de conversation chargé automatiquement.")
                 # Mettre à jour l'interface utilisateur
                 self.interface.update_conversation_display(self.conversation_history)
             except Exception as e:
                 print(f"Erreur lors du chargement de l'historique : {e}")
         else:
-            self.conversation_history = []
+            self.reset_memory()
     
     def reset_history(self):
-        """Réinitialise l'historique de conversation"""
-        self.conversation_history = []
+        """Réinitialise l'historique de conversation et son résumé"""
+        self.reset_memory()
         # Supprimer le fichier d'historique
         history_folder = "1_history_pkl"
         history_files = os.path.join(history_folder, "memo.pkl")
@@ -535,7 +420,8 @@ class BlowChatApp:
             with open(file_path, 'wb') as f:
                 pickle.dump({
                     'text': text_widget._textbox.get("1.0", "end"),
-                    'history': self.conversation_history
+                    'history': self.conversation_history,
+                    'summary': self.conversation_summary
                 }, f)
             messagebox.showinfo("Succès", "Conversation sauvegardée avec succès.")
         except Exception as e:
@@ -548,7 +434,7 @@ class BlowChatApp:
                 data = pickle.load(f)
             text_widget._textbox.delete("1.0", "end")
             text_widget._textbox.insert("1.0", data['text'])
-            self.conversation_history = data.get('history', [])
+            self.reset_memory(data.get('history', []), data.get('summary', ''))
             messagebox.showinfo("Succès", "Conversation chargée avec succès.")
         except Exception as e:
             self.interface.log_error(f"Erreur lors du chargement de la conversation : {e}", text_widget)
@@ -693,6 +579,19 @@ class BlowChatApp:
         except Exception:
             pass  # Ignorer les erreurs
         
+        # Arrêter l'opération en cours sur les bases (le point de contrôle permet de la reprendre)
+        self.cancel_database_job()
+        
+        # Arrêter la récupération YouTube en cours
+        self.cancel_youtube_job()
+        
+        # Abandonner les questions en attente et arrêter la génération en cours (ferme la connexion au modèle)
+        self.request_scheduler.clear()
+        self.cancel_generation_request()
+        
+        # Arrêter la surveillance du dossier source
+        self.stop_database_watcher()
+        
         # Sauvegarder l'historique
         try:
             self.save_history()
@@ -710,200 +609,199 @@ class BlowChatApp:
         # Effacer le champ de saisie
         entry_widget.delete(0, "end")
         
+        # Une seule génération à la fois : la question démarre, attend son tour ou est refusée
+        payload = (text_widget, model_name, groq_api_key, use_database, speed, assistant_name)
+        decision, position = self.request_scheduler.submit(query, payload)
+        if decision == 'queued':
+            self.log_chat_notice(text_widget, f"Question en attente (position {position}) : {query}")
+        elif decision == 'replaced':
+            self.log_chat_notice(text_widget, f"La réponse en cours est interrompue au profit de : {query}")
+            self.cancel_generation_request()
+        elif decision == 'duplicate':
+            self.log_chat_notice(text_widget, "Cette question est déjà en attente.")
+        elif decision == 'rejected':
+            # La question reste dans le champ de saisie pour être renvoyée plus tard
+            entry_widget.insert(0, query)
+            self.log_chat_notice(text_widget, "Une réponse est en cours de génération. Arrêtez-la ou attendez sa fin avant d'envoyer une nouvelle question.")
+        self.update_request_queue_display()
+    
+    def on_draft_changed(self, draft, use_database):
+        """
+        Programme la recherche anticipée du brouillon de question, une fois la saisie interrompue
+        pendant [Database] prefetch_debounce millisecondes
+        
+        Args:
+            draft: Texte du champ de saisie
+            use_database: Case « utiliser la base de données » cochée
+        """
+        if not use_database or not self.config.getboolean('Database', 'prefetch_enabled', fallback=False):
+            return
+        if self.prefetch_after_id is not None:
+            try:
+                self.interface.app.after_cancel(self.prefetch_after_id)
+            except Exception:
+                pass
+        debounce = self.config.getint('Database', 'prefetch_debounce', fallback=400)
+        self.prefetch_after_id = self.interface.app.after(debounce, lambda: self.prefetch_draft(draft))
+        self.interface.after_ids.append(self.prefetch_after_id)
+    
+    def prefetch_draft(self, draft):
+        """Lance la recherche anticipée d'un brouillon si une base est chargée"""
+        self.prefetch_after_id = None
+        if self.get_active_database()[1] is not None and not self.interface.is_closing:
+            self.retrieval_prefetcher.prefetch(draft)
+    
+    def log_chat_notice(self, text_widget, message):
+        """Affiche un message système dans la conversation"""
+        text_widget._textbox.insert("end", f"{message}\n\n", 'system')
+        text_widget._textbox.see("end")
+    
+    def update_request_queue_display(self):
+        """Affiche le nombre de questions en attente et leur temps d'attente"""
+        stats = self.request_scheduler.stats()
+        if stats['depth']:
+            text = f"En attente : {stats['depth']} · depuis {stats['oldest_wait']:.1f}s"
+        elif stats['served'] > 1:
+            text = f"Attente moyenne : {stats['average_wait']:.1f}s · max {stats['max_wait']:.1f}s"
+        else:
+            text = ""
+        self.interface.update_request_queue(text)
+    
+    def start_request(self, request):
+        """
+        Démarre la génération d'une question à son tour (appelé par l'ordonnanceur)
+        
+        Args:
+            request: ScheduledRequest dont payload contient les paramètres de on_submit
+        """
+        query = request.question
+        text_widget, model_name, groq_api_key, use_database, speed, assistant_name = request.payload
+        
         # Insérer le nom de l'utilisateur
         text_widget._textbox.insert("end", "Boss: ", 'user_name')
         # Insérer la question de l'utilisateur
         text_widget._textbox.insert("end", f"{query}\n\n", 'user')
         text_widget._textbox.see("end")
         
-        # Ajouter le message de l'utilisateur à l'historique
-        self.conversation_history.append(HumanMessage(content=query))
+        # Ajouter le message de l'utilisateur à l'historique (réécrit sous memory_lock par le résumé)
+        with self.memory_lock:
+            self.conversation_history.append(HumanMessage(content=query))
         
-        # Obtenir le contexte si la base de données est utilisée
-        context = ''
-        if use_database:
-            if self.index is None or self.data is None:
-                text_widget._textbox.insert("end", "La base de données n'est pas chargée. Veuillez la charger d'abord.\n", 'system')
-                context = ''
-            else:
-                try:
-                    # Recherche dans la base de données
-                    documents = self.search_documents(query, self.index, self.data, top_k=5, max_context_length=3000)
-                    context = "\n".join(documents)
-                except Exception as e:
-                    text_widget._textbox.insert("end", f"Erreur lors de la recherche dans la base de données : {e}\n", 'system')
-        
-        # Appeler generate_answer
-        self.generate_answer(query, context, text_widget, model_name, groq_api_key, speed, assistant_name)
+        # Recherche dans la base et génération dans un thread : l'interface ne se fige jamais
+        self.generate_answer(query, use_database, text_widget, model_name, groq_api_key, speed, assistant_name)
     
-    def generate_answer(self, query, context, text_widget, model_name, groq_api_key, speed, assistant_name):
-        """Génère une réponse du modèle"""
+    def generate_answer(self, query, use_database, text_widget, model_name, groq_api_key, speed, assistant_name):
+        """
+        Recherche le contexte puis génère la réponse du modèle dans un thread ; le texte, les
+        messages et l'état de la génération ('status') sont transmis à l'interface par une file
+        """
         q = queue.Queue()
+        renderer = StreamRenderer(self.stream_intervals.get(speed, self.stream_intervals["Normal"]),
+                                  self.stream_frame_rate)
         
         def insert_text():
-            """Fonction pour insérer le texte dans l'interface au fur et à mesure"""
+            """Affiche une image : le texte reçu depuis la précédente, au rythme de la vitesse choisie"""
+            # Lu avant de vider la file : le texte produit juste avant la fin du thread est affiché
+            finished = not thread.is_alive()
             try:
                 while True:
                     text, tag = q.get_nowait()
-                    if text:
-                        text_widget._textbox.insert("end", text, tag)
-                        text_widget._textbox.see("end")
-                        text_widget._textbox.update_idletasks()
+                    if tag == 'status':
+                        self.interface.set_chat_status(text)
+                    else:
+                        renderer.feed(text, tag)
             except queue.Empty:
                 pass
+            try:
+                # Après un arrêt, le texte déjà reçu est affiché sans attendre
+                runs = renderer.frame(flush=cancel_event.is_set())
+                if runs:
+                    textbox = text_widget._textbox
+                    for text, tag in runs:
+                        textbox.insert("end", text, tag)
+                    textbox.see("end")
             finally:
-                if thread.is_alive() and not self.interface.is_closing:
-                    # Déterminer l'intervalle en fonction de la vitesse
-                    interval_map = {
-                        "Lent": int(self.config.get('Stream', 'lent', fallback='1000')),
-                        "Normal": int(self.config.get('Stream', 'normal', fallback='500')),
-                        "Rapide": int(self.config.get('Stream', 'rapide', fallback='100')),
-                        "Très Rapide": int(self.config.get('Stream', 'tres_rapide', fallback='50')),
-                        "Turbo": int(self.config.get('Stream', 'turbo', fallback='10'))
-                    }
-                    interval = interval_map.get(speed, 500)
-                    after_id = text_widget.after(interval, insert_text)
+                if finished and not renderer.pending:
+                    # Génération terminée (ou interrompue) : tout le texte a été affiché
+                    self.end_generation(cancel_event)
+                elif not self.interface.is_closing:
+                    after_id = text_widget.after(renderer.frame_delay, insert_text)
                     # Ajouter l'ID à la liste des callbacks
                     self.interface.after_ids.append(after_id)
         
+        # Lire la personnalité de l'assistant dans le thread Tk avant de lancer le modèle
+        assistant_role = self.interface.model_role_var.get()
+        assistant_objective = self.interface.model_objective_var.get()
+        
+        def emit(text, tag):
+            q.put((text, tag))
+        
         def run_model():
-            """Fonction pour exécuter le modèle dans un thread séparé"""
-            if not groq_api_key:
-                q.put(("La clé API Groq n'a pas été fournie.\n\n", 'system'))
-                return
-            
-            os.environ['GROQ_API_KEY'] = groq_api_key
-            
-            # Construire les messages en incluant l'historique
-            messages = []
-            
-            # Ajouter le message système initial avec le rôle et l'objectif
-            assistant_role = self.interface.model_role_var.get()
-            assistant_objective = self.interface.model_objective_var.get()
-            system_prompt = f"{assistant_name}. Tu es {assistant_role}. Ton objectif est : {assistant_objective}."
-            
-            # Ajouter le nom de la base de données si elle est chargée
-            if self.current_database_name and context:
-                system_prompt += f"\n\nJe consulte pour toi la base de données '{self.current_database_name}'."
-                
-            if context:
-                system_prompt += f"\n\nContexte :\n{context}"
-            
-            messages.append(SystemMessage(content=system_prompt))
-            
-            # Vérifier la taille du system_prompt
-            token_count = self.count_tokens(system_prompt)
-            if token_count > 18000:
-                q.put(("\nLe contexte est trop volumineux pour le modèle. Veuillez réduire la taille du contexte.\n", 'system'))
+            """Fonction pour exécuter la recherche et le modèle dans un thread séparé"""
+            # Obtenir le contexte si la base de données est utilisée
+            context = ''
+            if use_database:
+                if self.get_active_database()[1] is None:
+                    emit("La base de données n'est pas chargée. Veuillez la charger d'abord.\n", 'system')
+                else:
+                    try:
+                        # Contexte déjà recherché pendant la saisie, sinon recherche dans la base
+                        # (chargement du modèle d'encodage au premier appel)
+                        prefetched = None
+                        if self.config.getboolean('Database', 'prefetch_enabled', fallback=False):
+                            prefetched = self.retrieval_prefetcher.take(query, self.get_database_fingerprint())
+                        if prefetched is not None:
+                            context = prefetched
+                        else:
+                            context = self.retrieve_context(query, top_k=5, max_context_length=3000)
+                    except Exception as e:
+                        emit(f"Erreur lors de la recherche dans la base de données : {e}\n", 'system')
+            
+            if cancel_event.is_set():
+                # Arrêt demandé pendant la recherche : aucun appel au modèle
+                self.end_cancelled_answer('', emit)
                 return
             
-            # Ajouter l'historique de la conversation
-            messages.extend(self.conversation_history)
-            
-            try:
-                # Paramètres du modèle depuis la configuration
-                temperature = float(self.config.get('Model', 'temperature', fallback='0.3'))
-                max_tokens = int(self.config.get('Model', 'max_tokens', fallback='6000'))
-                
-                llm = ChatGroq(
-                    model=model_name,
-                    temperature=temperature,
-                    max_tokens=max_tokens,
-                    timeout=None,
-                    max_retries=2,
-                    streaming=True,  # Activer le streaming
-                )
-                
-                # Insérer le nom du modèle avec le tag 'model_name'
-                q.put((f"{assistant_name}: ", 'model_name'))
-                
-                # Utiliser le streaming pour recevoir les tokens au fur et à mesure
-                response_stream = llm.stream(messages)
-                
-                response_content = ''
-                for chunk in response_stream:
-                    token = chunk.content  # Récupérer le token généré
-                    response_content += token
-                    q.put((token, 'model'))
-                
-                q.put(("\n\n", 'model'))
-                
-                # Ajouter la réponse du modèle à l'historique
-                self.conversation_history.append(AIMessage(content=response_content))
-                
-                # Limiter la taille de l'historique si nécessaire
-                max_history_length = int(self.config.get('Model', 'max_history_length', fallback='5'))
-                if len(self.conversation_history) > max_history_length * 2:
-                    # Supprimer les messages les plus anciens
-                    self.conversation_history[:] = self.conversation_history[-max_history_length*2:]
-                
-            except Exception as e:
-                q.put((f"\nErreur lors de l'appel à Groq : {e}\n\n", 'system'))
+            emit("Génération de la réponse…", 'status')
+            self.stream_answer(
+                context,
+                model_name,
+                groq_api_key,
+                assistant_name,
+                assistant_role,
+                assistant_objective,
+                emit,
+                cancel_event
+            )
         
+        cancel_event = threading.Event()
+        self.generation_cancel = cancel_event
+        self.interface.set_generation_running(True)
+        self.interface.set_chat_status("Recherche dans la base de données…" if use_database else "Génération de la réponse…")
         thread = threading.Thread(target=run_model)
         thread.start()
         
-        text_widget.after(100, insert_text)
-    
-    def count_tokens(self, text):
-        """
-        Compte approximativement le nombre de tokens dans le texte
-        Un token correspond à environ 4 caractères en moyenne
-        """
-        return len(text) // 4
+        text_widget.after(renderer.frame_delay, insert_text)
     
-    def get_available_databases(self):
-        """
-        Récupère la liste des bases de données vectorielles disponibles
-        
-        Returns:
-            list: Liste des noms de bases disponibles
-        """
-        database_folder = self.config.get('Directories', 'database', fallback='5_database')
-        available_dbs = []
-        
-        try:
-            # Parcourir tous les fichiers du dossier
-            for file in os.listdir(database_folder):
-                # Ne considérer que les fichiers .pkl qui ne commencent pas par 'faiss_index_'
-                if file.endswith('.pkl') and not file.startswith('faiss_index_'):
-                    # Extraire le nom de la base (sans l'extension .pkl)
-                    db_name = os.path.splitext(file)[0]
-                    # Vérifier que le fichier d'index correspondant existe
-                    if os.path.exists(os.path.join(database_folder, f'faiss_index_{db_name}.bin')):
-                        available_dbs.append(db_name)
-        except Exception as e:
-            print(f"Erreur lors de la recherche des bases disponibles : {e}")
-        
-        return available_dbs
+    def cancel_generation_request(self):
+        """Interrompt la génération de réponse en cours (bouton Arrêter)"""
+        if self.generation_cancel is not None:
+            self.cancel_generation(self.generation_cancel)
     
-    def get_available_sources(self):
+    def end_generation(self, cancel_event):
         """
-        Récupère la liste des dossiers source disponibles pour créer des bases
+        Marque la fin d'une génération de réponse
         
-        Returns:
-            list: Liste des dossiers disponibles
+        Args:
+            cancel_event: threading.Event de la génération terminée
         """
-        # Dossiers sources par défaut
-        default_sources = [
-            "3_transcriptions",
-            "4_markdown_reports"
-        ]
-        
-        # Ajouter les dossiers personnalisés depuis la configuration
-        custom_sources = []
-        if 'Sources' in self.config:
-            for key, value in self.config['Sources'].items():
-                if os.path.exists(value) and value not in default_sources:
-                    custom_sources.append(value)
-        
-        # Combiner les sources et vérifier leur existence
-        available_sources = []
-        for source in default_sources + custom_sources:
-            if os.path.exists(source) and os.path.isdir(source):
-                available_sources.append(source)
-        
-        return available_sources
+        if self.generation_cancel is cancel_event:
+            self.generation_cancel = None
+            self.interface.set_generation_running(False)
+            self.interface.set_chat_status("")
+            # Question suivante de la file
+            self.request_scheduler.finish()
+            self.update_request_queue_display()
     
     def load_database(self, database_name=None):
         """
@@ -920,8 +818,8 @@ class BlowChatApp:
             return
         
         try:
-            self.index, self.data = self.load_vector_database(database_name)
-            self.current_database_name = database_name
+            index, data = self.load_vector_database(database_name)
+            self.set_active_database(database_name, index, data)
             self.interface.use_database.set(True)
             messagebox.showinfo("Succès", f"Base de données '{database_name}' chargée avec succès.")
         except Exception as e:
@@ -929,118 +827,6 @@ class BlowChatApp:
             self.interface.use_database.set(False)
             messagebox.showerror("Erreur", f"Erreur lors du chargement de la base de données : {e}")
     
-    def load_vector_database(self, db_name):
-        """
-        Charge une base de données vectorielle.
-        
-        Args:
-            db_name: Nom de la base de données à charger
-            
-        Returns:
-            Tuple (index, data) ou None en cas d'erreur
-        """
-        try:
-            # Vérifier que la base existe
-            database_folder = self.config.get('Directories', 'database', fallback='5_database')
-            db_path = os.path.join(database_folder, f'{db_name}.pkl')
-            index_path = os.path.join(database_folder, f'faiss_index_{db_name}.bin')
-            
-            if not os.path.exists(db_path) or not os.path.exists(index_path):
-                print(f"La base de données '{db_name}' n'existe pas")
-                return None
-            
-            # Charger les données
-            with open(db_path, 'rb') as f:
-                data = pickle.load(f)
-            
-            # Charger l'index FAISS
-            index = faiss.read_index(index_path)
-            
-            # S'assurer que le modèle SentenceTransformer est disponible
-            # (nécessaire pour les recherches futures)
-            model_name = 'sentence-transformers/all-MiniLM-L6-v2'
-            try:
-                model = SentenceTransformer(model_name)
-                print(f"Modèle {model_name} chargé avec succès pour la recherche")
-            except Exception as e:
-                import logging
-                logging.getLogger('BlowChatYT').error(f"Erreur lors de l'initialisation du service d'embeddings pour la recherche: {e}")
-                print(f"Attention: Impossible de charger le modèle SentenceTransformer. Les recherches pourraient ne pas fonctionner correctement. Erreur: {e}")
-            
-            return index, data
-        except Exception as e:
-            import logging
-            logging.getLogger('BlowChatYT').error(f"Erreur lors du chargement de la base de données: {e}")
-            print(f"Erreur lors du chargement de la base de données '{db_name}': {e}")
-            return None
-    
-    def search_documents(self, query, index, data, top_k=10, max_context_length=4000):
-        """
-        Recherche les documents les plus pertinents pour une requête donnée.
-        Limite la longueur totale du contexte.
-        
-        Args:
-            query: Requête de recherche
-            index: Index FAISS à utiliser
-            data: Données des documents
-            top_k: Nombre maximal de résultats à retourner
-            max_context_length: Longueur maximale totale du contexte
-            
-        Returns:
-            list: Liste des documents pertinents
-        """
-        # Encoder la requête
-        model = SentenceTransformer('all-MiniLM-L6-v2')
-        query_vector = model.encode([query])
-        
-        # Recherche dans l'index
-        distances, indices = index.search(query_vector, top_k * 2)  # Obtenir plus de résultats pour filtrer ensuite
-        
-        results = []
-        total_length = 0
-        
-        # Ajouter des informations de source pour chaque document
-        for i, idx in enumerate(indices[0]):
-            if idx < len(data['documents']):
-                document = data['documents'][idx]
-                
-                # Ajouter des métadonnées si disponibles
-                if 'metadata' in data and idx < len(data['metadata']):
-                    metadata = data['metadata'][idx]
-                    source_info = f"\n[Source: {metadata.get('filename', 'inconnu')}]"
-                elif 'filenames' in data and idx < len(data['filenames']):
-                    source_info = f"\n[Source: {data['filenames'][idx]}]"
-                else:
-                    source_info = ""
-                
-                # Ajouter le score de similarité avec gestion des cas anormaux
-                distance = distances[0][i]
-                # Vérification de la validité de la distance (ni infini, ni NaN)
-                if not math.isfinite(distance):
-                    # Log pour le debug si la distance est invalide
-                    print(
-                        f"Distance invalide détectée à l'index {i}: {distance}"
-                    )
-                    similarity = "\n[Pertinence: valeur de distance invalide]"
-                else:
-                    # On borne la distance pour éviter l'overflow et garantir un pourcentage cohérent
-                    distance = min(max(distance, 0.0), 1.0)
-                    similarity = (
-                        f"\n[Pertinence: {100 * (1 - distance):.1f}%]"
-                    )
-                
-                # Document avec métadonnées
-                doc_with_meta = f"{document}{source_info}{similarity}\n---\n"
-                doc_length = len(doc_with_meta)
-                
-                if total_length + doc_length > max_context_length:
-                    break
-                
-                results.append(doc_with_meta)
-                total_length += doc_length
-                
-        return results
-    
     def start_database_tool(self, output_widget):
         """
         Démarre l'outil de création de base de données
@@ -1084,111 +870,26 @@ class BlowChatApp:
         except ValueError:
             chunk_size = 500  # Valeur par défaut
         
-        try:
-            output_widget._textbox.insert("end", f"Création de la base de données '{db_name}' à partir du dossier '{source_folder}'...\n", 'system')
-            self.create_vector_database(db_name, source_folder, chunk_size)
+        def create(job):
+            with self.database_write_lock:
+                return self.create_vector_database(db_name, source_folder, chunk_size,
+                                                   cancel_event=job.cancel_event,
+                                                   progress_callback=job.update_progress)
+        
+        def on_success(report):
             output_widget._textbox.insert("end", f"Base de données vectorielle '{db_name}' créée avec succès.\n", 'system')
+            for line in report:
+                output_widget._textbox.insert("end", f"{line}\n", 'system')
             
             # Mettre à jour la liste des bases disponibles
             self.update_database_list()
             
             # Sélectionner automatiquement la nouvelle base
             self.interface.selected_database.set(db_name)
-            
-            # Ajout d'un saut de ligne pour séparer ce bloc d'action
-            output_widget._textbox.insert("end", "\n", 'system')
-        except Exception as e:
-            output_widget._textbox.insert("end", f"Erreur lors de la création de la base de données : {e}\n", 'system')
-            # Ajout d'un saut de ligne pour séparer ce bloc d'action même en cas d'erreur
-            output_widget._textbox.insert("end", "\n", 'system')
-    
-    def create_vector_database(self, db_name, source_folder='3_transcriptions', chunk_size=500):
-        """
-        Crée une base de données vectorielle à partir des transcriptions et des PDF.
-        Les documents sont divisés en chunks de taille spécifiée.
         
-        Args:
-            db_name: Nom de la base de données à créer
-            source_folder: Dossier contenant les fichiers source
-            chunk_size: Taille des chunks de texte
-        """
-        try:
-            # Charger le modèle de transformation
-            model_name = 'sentence-transformers/all-MiniLM-L6-v2'
-            try:
-                model = SentenceTransformer(model_name)
-                print(f"Modèle {model_name} chargé avec succès")
-            except Exception as e:
-                import logging
-                logging.getLogger('BlowChatYT').error(f"Erreur lors de l'initialisation du service d'embeddings: {e}")
-                raise ValueError(f"Impossible de charger le modèle {model_name}. Veuillez vérifier votre connexion internet et votre token Hugging Face. Erreur: {e}")
-            
-            # Vérifier que le dossier source existe
-            if not os.path.exists(source_folder):
-                raise FileNotFoundError(f"Le dossier source '{source_folder}' n'existe pas")
-            
-            # Lire toutes les transcriptions et les PDF
-            documents = []
-            filenames = []
-            metadata = []
-            for filename in os.listdir(source_folder):
-                filepath = os.path.join(source_folder, filename)
-                if filename.endswith('.txt'):
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                elif filename.endswith('.pdf'):
-                    with open(filepath, 'rb') as f:
-                        reader = PyPDF2.PdfReader(f)
-                        text = ''
-                        for page in reader.pages:
-                            text += page.extract_text()
-                else:
-                    continue  # Ignorer les autres types de fichiers
-                
-                # Diviser le texte en chunks
-                text_chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-                documents.extend(text_chunks)
-                filenames.extend([filename] * len(text_chunks))
-                metadata.extend([{'filename': filename, 'chunk_index': idx, 'source_folder': source_folder} for idx in range(len(text_chunks))])
-            
-            # Vérifier qu'il y a des documents à traiter
-            if not documents:
-                raise ValueError(f"Aucun document texte ou PDF trouvé dans le dossier '{source_folder}'")
-            
-            # Encoder les documents en vecteurs
-            vectors = model.encode(documents)
-            
-            # Dossier de la base de données depuis la configuration
-            database_folder = self.config.get('Directories', 'database', fallback='5_database')
-            if not os.path.exists(database_folder):
-                os.makedirs(database_folder)
-            
-            # Chemins des fichiers
-            index_path = os.path.join(database_folder, f'faiss_index_{db_name}.bin')
-            db_path = os.path.join(database_folder, f'{db_name}.pkl')
-            
-            # Créer l'index FAISS
-            dimension = vectors.shape[1]
-            index = faiss.IndexFlatL2(dimension)
-            index.add(vectors)
-            
-            # Sauvegarder l'index et les métadonnées
-            faiss.write_index(index, index_path)
-            with open(db_path, 'wb') as f:
-                pickle.dump({
-                    'filenames': filenames, 
-                    'documents': documents, 
-                    'metadata': metadata,
-                    'creation_date': os.path.getctime(db_path) if os.path.exists(db_path) else None,
-                    'last_modified': os.path.getmtime(db_path) if os.path.exists(db_path) else None,
-                    'source_folder': source_folder,
-                    'chunk_size': chunk_size,
-                    'num_documents': len(documents)
-                }, f)
-        except Exception as e:
-            import logging
-            logging.getLogger('BlowChatYT').error(f"Erreur lors de la création de la base de données vectorielle: {e}")
-            raise
+        output_widget._textbox.insert("end", f"Création de la base de données '{db_name}' à partir du dossier '{source_folder}'...\n", 'system')
+        self.run_database_job(f"Création de '{db_name}'", create, output_widget, on_success,
+                              "Erreur lors de la création de la base de données")
     
     def enrich_database(self, output_widget):
         """
@@ -1217,599 +918,176 @@ class BlowChatApp:
         except ValueError:
             chunk_size = 500  # Valeur par défaut
         
-        try:
-            output_widget._textbox.insert("end", f"Enrichissement de la base '{db_name}' avec les documents de '{source_folder}'...\n", 'system')
-            self.enrich_vector_database(db_name, source_folder, output_widget, chunk_size)
-            # Ajout d'un saut de ligne pour séparer ce bloc d'action
-            output_widget._textbox.insert("end", "\n", 'system')
-        except Exception as e:
-            output_widget._textbox.insert("end", f"Erreur lors de l'enrichissement de la base : {e}\n", 'system')
-            # Ajout d'un saut de ligne pour séparer ce bloc d'action même en cas d'erreur
-            output_widget._textbox.insert("end", "\n", 'system')
-    
-    def enrich_vector_database(self, db_name, source_folder, output_widget, chunk_size=500):
-        """
-        Enrichit une base de données vectorielle existante avec de nouveaux documents.
+        def enrich(job):
+            with self.database_write_lock:
+                return self.enrich_vector_database(db_name, source_folder, job.output, chunk_size,
+                                                   cancel_event=job.cancel_event,
+                                                   progress_callback=job.update_progress)
         
-        Args:
-            db_name: Nom de la base de données à enrichir
-            source_folder: Dossier contenant les nouveaux fichiers
-            output_widget: Widget pour afficher les sorties
-            chunk_size: Taille des chunks de texte
-        """
-        try:
-            # Vérifier que la base existe
-            database_folder = self.config.get('Directories', 'database', fallback='5_database')
-            db_path = os.path.join(database_folder, f'{db_name}.pkl')
-            index_path = os.path.join(database_folder, f'faiss_index_{db_name}.bin')
-            
-            if not os.path.exists(db_path) or not os.path.exists(index_path):
-                output_widget._textbox.insert("end", f"Erreur : La base de données '{db_name}' n'existe pas.\n", 'system')
-                return
-            
-            # Charger la base existante
-            index = faiss.read_index(index_path)
-            with open(db_path, 'rb') as f:
-                data = pickle.load(f)
-            
-            # Créer un ensemble des noms de fichiers déjà présents dans la base pour une recherche rapide
-            existing_filenames = set()
-            if 'filenames' in data:
-                existing_filenames = set(data['filenames'])
-            
-            # Charger le modèle de transformation
-            model_name = 'sentence-transformers/all-MiniLM-L6-v2'
-            try:
-                model = SentenceTransformer(model_name)
-                print(f"Modèle {model_name} chargé avec succès pour l'enrichissement")
-            except Exception as e:
-                import logging
-                logging.getLogger('BlowChatYT').error(f"Erreur lors de l'initialisation du service d'embeddings pour l'enrichissement: {e}")
-                output_widget._textbox.insert("end", f"Erreur : Impossible de charger le modèle de transformation. Vérifiez votre connexion internet et votre token Hugging Face.\n", 'system')
-                return
-                
-            # Lire les nouveaux documents
-            new_documents = []
-            new_filenames = []
-            new_metadata = []
-            skipped_files = []
-            
-            for filename in os.listdir(source_folder):
-                filepath = os.path.join(source_folder, filename)
-                
-                # Vérifier si le fichier est déjà dans la base (par le nom)
-                if filename in existing_filenames:
-                    skipped_files.append(filename)
-                    continue  # Ignorer les fichiers déjà présents
-                    
-                if filename.endswith('.txt'):
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        text = f.read()
-                elif filename.endswith('.pdf'):
-                    with open(filepath, 'rb') as f:
-                        reader = PyPDF2.PdfReader(f)
-                        text = ''
-                        for page in reader.pages:
-                            text += page.extract_text()
-                else:
-                    continue  # Ignorer les autres types de fichiers
-                
-                # Diviser le texte en chunks
-                text_chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-                
-                if text_chunks:
-                    new_documents.extend(text_chunks)
-                    new_filenames.extend([filename] * len(text_chunks))
-                    
-                    # Index initial pour les nouveaux chunks
-                    start_idx = len(data['documents']) if 'documents' in data else 0
-                    
-                    new_metadata.extend([{
-                        'filename': filename, 
-                        'chunk_index': start_idx + idx, 
-                        'source_folder': source_folder,
-                        'added_date': os.path.getmtime(filepath)
-                    } for idx in range(len(text_chunks))])
-            
-            # Afficher les fichiers ignorés
-            if skipped_files:
-                ignored_msg = f"Les fichiers suivants étaient déjà présents dans la base et ont été ignorés : {', '.join(skipped_files)}"
-                output_widget._textbox.insert("end", f"{ignored_msg}\n", 'system')
-            
-            # Vérifier qu'il y a des documents à ajouter
-            if not new_documents:
-                output_widget._textbox.insert("end", f"Aucun nouveau document à ajouter depuis '{source_folder}'.\n", 'system')
-                # Ajout d'un saut de ligne pour séparer ce bloc d'action
-                output_widget._textbox.insert("end", "\n", 'system')
-                return
-            
-            # Encoder les nouveaux documents
-            output_widget._textbox.insert("end", f"Encodage de {len(new_documents)} nouveaux segments...\n", 'system')
-            new_vectors = model.encode(new_documents)
-            
-            # Ajouter les nouveaux vecteurs à l'index
-            index.add(new_vectors)
-            
-            # Mettre à jour les métadonnées
-            if 'filenames' in data:
-                data['filenames'].extend(new_filenames)
-            else:
-                data['filenames'] = new_filenames
-                
-            if 'documents' in data:
-                data['documents'].extend(new_documents)
-            else:
-                data['documents'] = new_documents
-                
-            if 'metadata' in data:
-                data['metadata'].extend(new_metadata)
-            else:
-                data['metadata'] = new_metadata
-            
-            # Mettre à jour les informations de la base
-            data['last_modified'] = os.path.getmtime(db_path) if os.path.exists(db_path) else None
-            data['num_documents'] = len(data['documents']) if 'documents' in data else len(new_documents)
-            
-            # Ajouter les sources
-            if 'sources' not in data:
-                data['sources'] = []
-            
-            if source_folder not in data['sources']:
-                data['sources'].append(source_folder)
-            
-            # Sauvegarder l'index et les métadonnées mis à jour
-            faiss.write_index(index, index_path)
-            with open(db_path, 'wb') as f:
-                pickle.dump(data, f)
-            
-            output_widget._textbox.insert("end", f"Base de données '{db_name}' enrichie avec {len(new_documents)} nouveaux segments.\n", 'system')
-            
-            # Ajout d'un saut de ligne pour séparer ce bloc d'action
-            output_widget._textbox.insert("end", "\n", 'system')
-            
+        def on_success(num_added):
             # Si la base actuelle est ouverte, la recharger
-            if self.current_database_name == db_name:
+            if num_added and self.current_database_name == db_name:
                 self.load_database(db_name)
-        except Exception as e:
-            output_widget._textbox.insert("end", f"Erreur lors de l'enrichissement de la base : {e}\n", 'system')
-            # Ajout d'un saut de ligne pour séparer ce bloc d'action même en cas d'erreur
-            output_widget._textbox.insert("end", "\n", 'system')
+        
+        output_widget._textbox.insert("end", f"Enrichissement de la base '{db_name}' avec les documents de '{source_folder}'...\n", 'system')
+        self.run_database_job(f"Enrichissement de '{db_name}'", enrich, output_widget, on_success,
+                              "Erreur lors de l'enrichissement de la base")
     
-    def start_youtube_tool(self, channel_name, video_ids_input, num_videos_str, api_key, output_widget):
+    def run_database_job(self, name, target, output_widget, on_success, error_message):
         """
-        Démarre l'outil YouTube pour récupérer les vidéos et transcriptions
+        Exécute une opération sur les bases de données en arrière-plan.
+        Les messages et la progression sont transmis à l'interface par une file thread-safe.
         
         Args:
-            channel_name: Nom ou ID de la chaîne YouTube
-            video_ids_input: Liste d'IDs ou URLs de vidéos séparés par des virgules
-            num_videos_str: Nombre de vidéos à récupérer (pour la chaîne)
-            api_key: Clé API YouTube
+            name: Nom de l'opération affiché dans la barre de progression
+            target: Fonction target(job) exécutée dans le thread de travail
             output_widget: Widget pour afficher les sorties
+            on_success: Fonction on_success(résultat) appelée dans le thread Tk en cas de succès
+            error_message: Préfixe du message affiché en cas d'erreur
         """
-        if not api_key:
-            messagebox.showerror("Erreur", "La clé API YouTube n'est pas définie.")
+        if self.database_job is not None and self.database_job.is_alive():
+            output_widget._textbox.insert("end", f"Une opération est déjà en cours : {self.database_job.name}.\n\n", 'system')
             return
         
-        try:
-            num_videos = int(num_videos_str)
-        except ValueError:
-            num_videos = 5
-            self.interface.log_error("Nombre de vidéos invalide, utilisation de la valeur par défaut (5).", output_widget)
-        
-        if video_ids_input.strip():
-            # L'utilisateur a spécifié des vidéos
-            video_ids = [vid.strip() for vid in video_ids_input.split(',')]
-            videos = self.get_videos_by_ids(video_ids, api_key, output_widget)
-        else:
-            # Utiliser le nom de la chaîne et le nombre de vidéos
-            try:
-                videos = self.get_videos_youtube(channel_name, api_key, num_videos, output_widget)
-            except Exception as e:
-                self.interface.log_error(f"Erreur lors de la récupération des vidéos : {e}", output_widget)
-                messagebox.showerror("Erreur", f"Erreur lors de la récupération des vidéos : {e}")
-                return
-        # Ajout d'un saut de ligne pour séparer les infos générales du traitement des vidéos
-        output_widget._textbox.insert("end", "\n", 'system')
-        
-        # Traitement des vidéos
-        for video in videos:
-            try:
-                video_id = video['id']
-                self.interface.log_info(f"Traitement de la vidéo {video_id} : {video['snippet']['title']}", output_widget)
-                
-                # Récupération de la transcription
-                transcription = self.get_transcription(video_id, ['en', 'fr'], output_widget)
-                if transcription:
-                    # Sauvegarde de la transcription
-                    self.save_transcription(video_id, transcription, output_widget)
-                    
-                    # Génération du rapport markdown
-                    self.generate_markdown_report(video, transcription, video.get('statistics', {}), output_widget)
-            except Exception as e:
-                self.interface.log_error(f"Erreur lors du traitement de la vidéo {video.get('id', 'inconnue')} : {e}", output_widget)
-            # Ajout d'un saut de ligne pour séparer chaque bloc de traitement de vidéo
-            output_widget._textbox.insert("end", "\n", 'system')
-        
-        self.interface.log_info("Traitement des vidéos terminé.", output_widget)
-        # Ajout d'un séparateur visuel pour bien distinguer chaque traitement
-        output_widget._textbox.insert("end", "\n================\n", 'system')
-        # Ajout d'un saut de ligne pour séparer ce bloc d'action (traitement d'un lot de vidéos)
-        output_widget._textbox.insert("end", "\n", 'system')
-        messagebox.showinfo("Succès", "Traitement des vidéos terminé.")
-        
-        # Mise à jour de la liste des sources après ajout des nouvelles transcriptions
-        self.update_source_list()
+        job = BackgroundJob(name, target)
+        self.database_job = job
+        self.interface.show_database_progress(name)
+        job.start()
+        self.poll_background_job(
+            job, output_widget, on_success, error_message,
+            self.interface.update_database_progress,
+            self.interface.hide_database_progress,
+            "Relancer l'opération reprendra depuis le dernier point de contrôle."
+        )
     
-    def get_videos_youtube(self, channel_name, api_key, num_videos, output_widget):
+    def poll_background_job(self, job, output_widget, on_success, error_message, on_progress, on_done, cancel_note):
         """
-        Récupère les vidéos d'une chaîne YouTube
+        Affiche les messages et la progression d'une opération en arrière-plan (thread Tk)
         
         Args:
-            channel_name: Nom ou ID de la chaîne YouTube
-            api_key: Clé API YouTube
-            num_videos: Nombre de vidéos à récupérer
+            job: Tâche BackgroundJob en cours
             output_widget: Widget pour afficher les sorties
-            
-        Returns:
-            list: Liste des vidéos récupérées
+            on_success: Fonction appelée avec le résultat en cas de succès
+            error_message: Préfixe du message affiché en cas d'erreur
+            on_progress: Fonction on_progress(fraction, texte) de mise à jour de la barre de progression
+            on_done: Fonction on_done(texte) appelée à la fin de l'opération
+            cancel_note: Précision affichée après l'annulation de l'opération
         """
-        youtube = build('youtube', 'v3', developerKey=api_key)
+        if self.interface.is_closing:
+            job.cancel()
+            return
         
-        # Obtenir l'ID du channel à partir du nom ou de l'ID
-        if re.match(r'^UC[a-zA-Z0-9_-]{22}$', channel_name):
-            # C'est déjà un ID de chaîne
-            channel_id = channel_name
-            self.interface.log_info(f"Utilisation de l'ID de chaîne fourni : {channel_id}", output_widget)
-        else:
-            # Rechercher l'ID à partir du nom
-            request = youtube.search().list(
-                part="snippet",
-                q=channel_name,
-                type="channel",
-                maxResults=1
-            )
-            response = request.execute()
-            
-            if not response['items']:
-                raise Exception(f"Channel non trouvé pour le nom {channel_name}")
-            
-            channel_id = response['items'][0]['id']['channelId']
-            self.interface.log_info(f"ID de chaîne trouvé : {channel_id}", output_widget)
-        
-        # Obtenir l'ID de la playlist des uploads
-        uploads_playlist_id = self.get_channel_uploads_playlist_id(channel_id, api_key)
-        self.interface.log_info(f"ID de playlist d'uploads : {uploads_playlist_id}", output_widget)
-        
-        # Obtenir les vidéos de la playlist des uploads
-        playlist_videos = self.get_videos_from_playlist(uploads_playlist_id, api_key, max_videos=num_videos)
-        self.interface.log_info(f"Nombre de vidéos trouvées : {len(playlist_videos)}", output_widget)
-        
-        video_ids = [item['contentDetails']['videoId'] for item in playlist_videos]
-        
-        # Obtenir les détails et statistiques des vidéos
-        videos = []
-        for i in range(0, len(video_ids), 50):  # L'API permet max 50 vidéos par requête
-            batch_ids = video_ids[i:i+50]
-            stats_request = youtube.videos().list(
-                part="snippet,statistics",
-                id=','.join(batch_ids)
-            )
-            stats_response = stats_request.execute()
-            videos.extend(stats_response['items'])
+        messages = job.drain_messages()
+        for text, tag in messages:
+            output_widget._textbox.insert("end", text, tag)
+        if messages:
+            output_widget._textbox.see("end")
+        on_progress(job.progress()['fraction'], job.format_progress())
+        
+        if job.is_alive():
+            after_id = output_widget.after(200, lambda: self.poll_background_job(
+                job, output_widget, on_success, error_message, on_progress, on_done, cancel_note))
+            self.interface.after_ids.append(after_id)
+            return
         
-        return videos
+        # Tâche terminée : afficher les derniers messages puis le résultat
+        for text, tag in job.drain_messages():
+            output_widget._textbox.insert("end", text, tag)
+        if isinstance(job.error, PipelineCancelled) or (job.cancelled and job.error is not None):
+            output_widget._textbox.insert("end", f"{job.name} annulé. {cancel_note}\n", 'system')
+        elif job.error is not None:
+            output_widget._textbox.insert("end", f"{error_message} : {job.error}\n", 'system')
+        else:
+            on_success(job.result)
+        # Ajout d'un saut de ligne pour séparer ce bloc d'action
+        output_widget._textbox.insert("end", "\n", 'system')
+        output_widget._textbox.see("end")
+        on_done(job.format_progress())
     
-    def get_channel_uploads_playlist_id(self, channel_id, api_key):
-        """
-        Récupère l'ID de la playlist des uploads d'une chaîne
-        
-        Args:
-            channel_id: ID de la chaîne YouTube
-            api_key: Clé API YouTube
-            
-        Returns:
-            str: ID de la playlist des uploads
-        """
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        request = youtube.channels().list(
-            part="contentDetails",
-            id=channel_id
-        )
-        response = request.execute()
-        
-        if not response['items']:
-            raise Exception(f"Chaîne introuvable pour l'ID {channel_id}")
-            
-        uploads_playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
-        return uploads_playlist_id
+    def cancel_database_job(self):
+        """Demande l'annulation de l'opération en cours sur les bases de données"""
+        if self.database_job is not None and self.database_job.is_alive():
+            self.database_job.cancel()
     
-    def get_videos_from_playlist(self, playlist_id, api_key, max_videos=None):
-        """
-        Récupère les vidéos d'une playlist YouTube
-        
-        Args:
-            playlist_id: ID de la playlist YouTube
-            api_key: Clé API YouTube
-            max_videos: Nombre maximal de vidéos à récupérer
-            
-        Returns:
-            list: Liste des vidéos de la playlist
-        """
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        videos = []
-        nextPageToken = None
-        
-        while True:
-            request = youtube.playlistItems().list(
-                part="snippet,contentDetails",
-                playlistId=playlist_id,
-                maxResults=50,
-                pageToken=nextPageToken
-            )
-            response = request.execute()
-            
-            videos.extend(response['items'])
-            
-            nextPageToken = response.get('nextPageToken')
-            if not nextPageToken or (max_videos and len(videos) >= max_videos):
-                break
-        
-        return videos[:max_videos] if max_videos else videos
+    def cancel_youtube_job(self):
+        """Demande l'annulation de la récupération YouTube en cours"""
+        if self.youtube_job is not None and self.youtube_job.is_alive():
+            self.youtube_job.cancel()
     
-    def get_videos_by_ids(self, video_ids, api_key, output_widget):
+    def start_youtube_tool(self, channel_name, video_ids_input, num_videos_str, api_key, output_widget,
+                           target_database=''):
         """
-        Récupère des vidéos à partir de leurs IDs
+        Démarre l'outil YouTube pour récupérer les vidéos et transcriptions en arrière-plan
         
         Args:
-            video_ids: Liste d'IDs ou URLs de vidéos YouTube
+            channel_name: Nom ou ID de la chaîne YouTube
+            video_ids_input: Liste d'IDs ou URLs de vidéos séparés par des virgules
+            num_videos_str: Nombre de vidéos à récupérer (pour la chaîne)
             api_key: Clé API YouTube
             output_widget: Widget pour afficher les sorties
-            
-        Returns:
-            list: Liste des vidéos récupérées
-        """
-        youtube = build('youtube', 'v3', developerKey=api_key)
-        videos = []
-        
-        for video_id in video_ids:
-            # Extraire l'ID de la vidéo si c'est une URL
-            extracted_id = self.extract_video_id(video_id)
-            if not extracted_id:
-                self.interface.log_error(f"ID de vidéo invalide : {video_id}", output_widget)
-                continue
-            
-            request = youtube.videos().list(
-                part="snippet,statistics",
-                id=extracted_id
-            )
-            response = request.execute()
-            
-            if response['items']:
-                video_data = response['items'][0]
-                video_data['id'] = extracted_id  # S'assurer que l'ID est correct
-                videos.append(video_data)
-                self.interface.log_info(f"Vidéo trouvée : {video_data['snippet']['title']}", output_widget)
-            else:
-                self.interface.log_error(f"Vidéo non trouvée pour l'ID {extracted_id}", output_widget)
-        
-        return videos
-    
-    def extract_video_id(self, url):
-        """
-        Extrait l'ID de la vidéo à partir d'une URL YouTube ou retourne l'ID si déjà donné
-        
-        Args:
-            url: URL YouTube ou ID de vidéo
-            
-        Returns:
-            str: ID de la vidéo ou None si non valide
-        """
-        # Si c'est déjà un ID de 11 caractères, on le retourne
-        if re.match(r'^[a-zA-Z0-9_-]{11}$', url):
-            return url
-        
-        # Sinon, on essaie de le récupérer à partir de l'URL
-        parsed_url = urlparse(url)
-        if parsed_url.hostname in ['www.youtube.com', 'youtube.com', 'm.youtube.com']:
-            if parsed_url.path == '/watch':
-                query = parse_qs(parsed_url.query)
-                if 'v' in query:
-                    return query['v'][0]
-            elif parsed_url.path.startswith(('/embed/', '/v/')):
-                return parsed_url.path.split('/')[2]
-        elif parsed_url.hostname == 'youtu.be':
-            return parsed_url.path[1:]
-        
-        return None
-    
-    def get_transcription(self, video_id, languages=['en', 'fr'], output_widget=None):
+            target_database: Base de données alimentée au fil de l'arrivée des vidéos (vide = aucune)
         """
-        Récupère la transcription d'une vidéo YouTube via les sous-titres
+        if not api_key:
+            messagebox.showerror("Erreur", "La clé API YouTube n'est pas définie.")
+            return
         
-        Args:
-            video_id: ID de la vidéo YouTube
-            languages: Liste des langues à essayer pour la transcription
-            output_widget: Widget pour afficher les sorties
-            
-        Returns:
-            str: Transcription de la vidéo ou None si non disponible
-        """
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages)
-            transcript = " ".join([item['text'] for item in transcript_list])
-            self.interface.log_info(f"Transcription récupérée pour la vidéo {video_id}", output_widget)
-            return transcript
-        except Exception as e:
-            self.interface.log_error(f"Impossible de récupérer la transcription pour la vidéo {video_id}: {e}", output_widget)
-            return None
-    
-    def save_transcription(self, video_id, transcription, output_widget):
-        """
-        Sauvegarde la transcription dans un fichier texte en UTF-8
-        
-        Args:
-            video_id: ID de la vidéo YouTube
-            transcription: Texte de la transcription
-            output_widget: Widget pour afficher les sorties
-        """
-        transcriptions_folder = self.config.get('Directories', 'transcriptions', fallback='3_transcriptions')
-        transcription_file = f"{transcriptions_folder}/{video_id}.txt"
-        with open(transcription_file, "w", encoding='utf-8') as f:
-            f.write(transcription)
-        self.interface.log_info(f"Transcription sauvegardée dans {transcription_file}", output_widget)
-    
-    def generate_markdown_report(self, video, transcription, stats, output_widget):
-        """
-        Génère un rapport markdown pour une vidéo
-        
-        Args:
-            video: Données de la vidéo
-            transcription: Texte de la transcription
-            stats: Statistiques de la vidéo
-            output_widget: Widget pour afficher les sorties
-        """
-        video_id = video['id']
-        report_content = f"# Rapport de la vidéo : {video['snippet']['title']}\n\n"
-        report_content += f"- **Date de publication** : {video['snippet']['publishedAt']}\n"
-        report_content += f"- **Description** : {video['snippet']['description']}\n"
-        report_content += f"- **Lien** : [https://www.youtube.com/watch?v={video_id}](https://www.youtube.com/watch?v={video_id})\n"
-        
-        # Ces statistiques peuvent ne pas être disponibles
-        if 'viewCount' in stats:
-            report_content += f"- **Vues** : {stats['viewCount']}\n"
-        
-        if 'likeCount' in stats:
-            report_content += f"- **Likes** : {stats['likeCount']}\n"
-        
-        if 'commentCount' in stats:
-            report_content += f"- **Commentaires** : {stats['commentCount']}\n"
+            num_videos = int(num_videos_str)
+        except ValueError:
+            num_videos = 5
+            self.interface.log_error("Nombre de vidéos invalide, utilisation de la valeur par défaut (5).", output_widget)
         
-        if 'shareCount' in stats:
-            report_content += f"- **Partages** : {stats['shareCount']}\n"
+        if self.youtube_job is not None and self.youtube_job.is_alive():
+            output_widget._textbox.insert("end", f"Une récupération est déjà en cours : {self.youtube_job.name}.\n\n", 'system')
+            return
         
-        # Ajouter un extrait de la transcription
-        if transcription:
-            excerpt = transcription[:500] + "..." if len(transcription) > 500 else transcription
-            report_content += f"- **Transcription (extrait)** :\n```\n{excerpt}\n```\n"
+        def fetch(job):
+            videos = self.fetch_videos(channel_name, video_ids_input, num_videos, api_key, job.output)
+            job.update_progress(0, len(videos), 0)
+            # Traitement des vidéos (transcriptions et rapports markdown) en parallèle
+            return self.process_videos(videos, job.output, cancel_event=job.cancel_event,
+                                       progress_callback=job.update_progress)
+        
+        def ingest(job):
+            # Pipeline de la chaîne jusqu'à la base : interrogeable au fil de l'arrivée des vidéos
+            return self.ingest_videos_to_database(target_database, channel_name, video_ids_input, num_videos,
+                                                  api_key, output_widget=job.output, cancel_event=job.cancel_event,
+                                                  progress_callback=job.update_progress)
+        
+        def on_success(processed):
+            messagebox.showinfo("Succès", "Traitement des vidéos terminé.")
+        
+        def on_done(text):
+            self.interface.hide_youtube_progress(text)
+            # Mise à jour de la liste des sources après ajout des nouvelles transcriptions
+            self.update_source_list()
+            if target_database:
+                self.update_database_list()
+        
+        if target_database:
+            job = BackgroundJob(f"Ingestion YouTube dans '{target_database}'", ingest,
+                                units=("Vidéos", "segments indexés", "seg/s"))
         else:
-            report_content += "- **Transcription** : Non disponible\n"
-        
-        # Dossier des rapports markdown depuis la configuration
-        markdown_folder = self.config.get('Directories', 'markdown_reports', fallback='4_markdown_reports')
-        report_file = f"{markdown_folder}/{video_id}_report.md"
-        with open(report_file, "w", encoding='utf-8') as f:
-            f.write(report_content)
-        
-        self.interface.log_info(f"Rapport markdown généré : {report_file}", output_widget)
-    
-    def clean_filename(self, filename):
-        """
-        Nettoie un nom de fichier en supprimant les caractères non valides
-        
-        Args:
-            filename: Nom de fichier à nettoyer
-            
-        Returns:
-            str: Nom de fichier nettoyé
-        """
-        filename = filename.strip()
-        # Remplacer les caractères non valides par un underscore
-        return re.sub(r'[<>:"/\\|?*@]', '', filename).replace(' ', '_')
-    
-    def get_database_info(self, db_name):
-        """
-        Récupère les informations d'une base de données
-        
-        Args:
-            db_name: Nom de la base de données
-            
-        Returns:
-            dict: Informations sur la base de données
-        """
-        database_folder = self.config.get('Directories', 'database', fallback='5_database')
-        db_path = os.path.join(database_folder, f'{db_name}.pkl')
-        
-        if not os.path.exists(db_path):
-            return {
-                'name': db_name,
-                'error': 'Base de données non trouvée'
-            }
-        
-        try:
-            with open(db_path, 'rb') as f:
-                data = pickle.load(f)
-            
-            # Récupérer les informations de base
-            info = {
-                'name': db_name,
-                'creation_date': data.get('creation_date'),
-                'last_modified': data.get('last_modified'),
-                'source_folder': data.get('source_folder', 'Non spécifié'),
-                'chunk_size': data.get('chunk_size', 'Non spécifié'),
-                'num_documents': data.get('num_documents', len(data.get('documents', []))),
-                'num_sources': len(set(data.get('filenames', [])))
-            }
-            
-            return info
-        except Exception as e:
-            return {
-                'name': db_name,
-                'error': str(e)
-            }
+            job = BackgroundJob("Récupération YouTube", fetch, units=("Vidéos", "transcriptions", "vidéos/s"))
+        self.youtube_job = job
+        self.interface.show_youtube_progress(job.name)
+        job.start()
+        self.poll_background_job(
+            job, output_widget, on_success, "Erreur lors de la récupération des vidéos",
+            self.interface.update_youtube_progress,
+            on_done,
+            "Les transcriptions déjà récupérées sont conservées."
+        )
     
     def start(self):
         """Démarre l'application"""
         # Vérifier que la configuration fonctionne correctement avant de démarrer
         self.verify_config_integrity()
+        # Surveiller le dossier source configuré pour enrichir automatiquement la base associée
+        self.start_database_watcher()
         # Démarrer l'interface
         self.interface.start()
         
-    def verify_config_integrity(self):
-        """Vérifie l'intégrité de la configuration et tente de la réparer si nécessaire"""
-        try:
-            # Vérifier que toutes les sections requises existent
-            required_sections = ['API_KEYS', 'Appearance', 'Assistant', 'Directories', 'Model', 'Stream']
-            for section in required_sections:
-                if section not in self.config:
-                    print(f"Section manquante dans la configuration: {section}")
-                    self._create_default_config()
-                    return
-            
-            # Vérifier que les options d'apparence essentielles sont présentes
-            appearance_options = ['theme', 'font_size', 'color_system', 'color_user', 
-                                'color_model', 'color_model_name', 'color_user_name']
-            
-            for option in appearance_options:
-                if option not in self.config['Appearance']:
-                    print(f"Option d'apparence manquante: {option}")
-                    # Recréer uniquement les options d'apparence manquantes
-                    defaults = {
-                        'theme': 'blue',
-                        'font_size': '12',
-                        'color_system': '#0000FF',
-                        'color_user': '#008000',
-                        'color_model': '#FF0000',
-                        'color_model_name': '#800080',
-                        'color_user_name': '#FFA500'
-                    }
-                    self.config['Appearance'][option] = defaults[option]
-            
-            # Essayer d'écrire la configuration pour vérifier les permissions d'écriture
-            self.save_config()
-            
-            # Vérifier que le fichier a bien été créé
-            if not os.path.exists(self.config_file):
-                print("Le fichier de configuration n'a pas été créé malgré la tentative de sauvegarde")
-                # Essayer avec un chemin alternatif
-                user_dir = os.path.expanduser("~")
-                self.config_file = os.path.join(user_dir, "blow_chat_config.ini")
-                self.save_config()
-                
-        except Exception as e:
-            print(f"Erreur lors de la vérification de la configuration: {e}")
-            # Tenter une réparation d'urgence
-            self._create_default_config()
-            
     def update_huggingface_token(self, token):
         """
         Met à jour le token Hugging Face et réapplique l'authentification
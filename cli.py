@@ -0,0 +1,283 @@
+"""
+Module cli.py - Interface en ligne de commande de Blow Chat YT
+Permet de créer et d'enrichir les bases de données, de récupérer des vidéos YouTube,
+de rechercher dans une base et d'interroger le modèle sans interface graphique (sans Tk).
+Le résultat de chaque commande est écrit en JSON sur la sortie standard ; les messages
+de suivi sont redirigés vers la sortie d'erreur.
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+from core import BlowChatCore
+from llm_backend import LLM_BACKENDS
+from pipeline import PipelineCancelled
+from storage import COMPRESSION_MODES as STORAGE_COMPRESSION_MODES
+from transport import TRANSPORT_MODES
+
+# Modèle Groq utilisé par défaut pour la commande ask
+DEFAULT_MODEL = "meta-llama/llama-4-scout-17b-16e-instruct"
+
+
+def build_parser():
+    """
+    Construit l'analyseur des arguments de la ligne de commande
+
+    Returns:
+        argparse.ArgumentParser: Analyseur avec une sous-commande par opération
+    """
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Blow Chat YT sans interface graphique (sortie JSON)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("list", help="Liste les bases de données et les dossiers sources")
+
+    for name, help_text in (("build", "Crée une base de données vectorielle"),
+                            ("enrich", "Enrichit une base de données existante")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("database", help="Nom de la base de données")
+        sub.add_argument("--source", default="3_transcriptions", help="Dossier des fichiers sources")
+        sub.add_argument("--chunk-size", type=int, default=500, help="Taille des segments de texte")
+
+    youtube = subparsers.add_parser("youtube", help="Récupère les transcriptions et rapports de vidéos YouTube")
+    youtube.add_argument("--channel", default="", help="Nom ou ID de la chaîne YouTube")
+    youtube.add_argument("--videos", default="", help="IDs ou URLs de vidéos séparés par des virgules")
+    youtube.add_argument("--count", type=int, default=5, help="Nombre de vidéos à récupérer pour la chaîne")
+    youtube.add_argument("--api-key", default=None, help="Clé API YouTube (défaut : config.ini)")
+    youtube.add_argument("--database", default=None,
+                         help="Base de données alimentée au fil de l'eau (créée si elle n'existe pas)")
+    youtube.add_argument("--chunk-size", type=int, default=500, help="Taille des segments d'une nouvelle base")
+    youtube.add_argument("--transport", choices=TRANSPORT_MODES, default=None,
+                         help="Transport YouTube : live, record, replay ou synthetic (défaut : config.ini)")
+    youtube.add_argument("--cassette", default=None, help="Dossier des réponses enregistrées (record/replay)")
+    youtube.add_argument("--quota-budget", type=int, default=None,
+                         help="Unités de quota maximales de l'importation (défaut : config.ini, 0 = pas de plafond)")
+
+    subparsers.add_parser("quota", help="Affiche le quota de l'API YouTube consommé aujourd'hui")
+
+    compress = subparsers.add_parser("compress", help="Compresse (ou décompresse) les transcriptions et rapports existants")
+    compress.add_argument("--folder", action="append", default=None,
+                          help="Dossier à convertir (défaut : transcriptions et rapports markdown)")
+    compress.add_argument("--mode", choices=STORAGE_COMPRESSION_MODES, default="gzip", help="Mode de stockage")
+
+    watch = subparsers.add_parser("watch", help="Surveille un dossier et enrichit la base au fil de l'eau")
+    watch.add_argument("database", help="Nom de la base de données")
+    watch.add_argument("--source", default="3_transcriptions", help="Dossier surveillé")
+    watch.add_argument("--interval", type=float, default=None, help="Intervalle de scrutation en secondes")
+    watch.add_argument("--debounce", type=float, default=None, help="Délai d'attente avant traitement en secondes")
+
+    search = subparsers.add_parser("search", help="Recherche les segments pertinents dans une base")
+    search.add_argument("database", help="Nom de la base de données")
+    search.add_argument("query", help="Requête de recherche")
+    search.add_argument("--top-k", type=int, default=5, help="Nombre de blocs de contexte")
+    search.add_argument("--max-context", type=int, default=3000, help="Longueur maximale du contexte")
+
+    ask = subparsers.add_parser("ask", help="Pose une question au modèle")
+    ask.add_argument("query", help="Question à poser")
+    ask.add_argument("--database", default=None, help="Base de données utilisée pour le contexte")
+    ask.add_argument("--model", default=DEFAULT_MODEL, help="Modèle Groq")
+    ask.add_argument("--api-key", default=None, help="Clé API Groq (défaut : config.ini)")
+    ask.add_argument("--top-k", type=int, default=5, help="Nombre de blocs de contexte")
+    ask.add_argument("--max-context", type=int, default=3000, help="Longueur maximale du contexte")
+    ask.add_argument("--backend", choices=LLM_BACKENDS, default=None,
+                     help="Moteur de génération : groq ou fake (modèle local simulé, défaut : config.ini)")
+
+    return parser
+
+
+def load_database(core, db_name):
+    """
+    Charge une base de données comme base active du coeur applicatif
+
+    Args:
+        core: Instance de BlowChatCore
+        db_name: Nom de la base de données
+
+    Raises:
+        ValueError: Si la base ne peut pas être chargée
+    """
+    result = core.load_vector_database(db_name)
+    if result is None:
+        raise ValueError(f"Impossible de charger la base de données '{db_name}'")
+    core.set_active_database(db_name, *result)
+
+
+def run_command(core, args, emit):
+    """
+    Exécute une sous-commande
+
+    Args:
+        core: Instance de BlowChatCore
+        args: Arguments analysés de la ligne de commande
+        emit: Fonction emit(objet) écrivant une ligne JSON intermédiaire sur la sortie standard
+
+    Returns:
+        dict: Résultat sérialisable en JSON
+    """
+    if args.command == "list":
+        return {
+            'databases': [core.get_database_info(name) for name in core.get_available_databases()],
+            'sources': core.get_available_sources()
+        }
+
+    if args.command == "build":
+        def report_progress(files_done, files_total, chunks_done):
+            print(f"Fichiers {files_done}/{files_total} · {chunks_done} segments", file=sys.stderr)
+
+        report = core.create_vector_database(args.database, args.source, args.chunk_size,
+                                             progress_callback=report_progress)
+        return {'database': args.database, 'report': report, 'info': core.get_database_info(args.database)}
+
+    if args.command == "enrich":
+        added = core.enrich_vector_database(args.database, args.source, None, args.chunk_size)
+        return {'database': args.database, 'added': added, 'info': core.get_database_info(args.database)}
+
+    if args.command == "youtube":
+        if args.transport or args.cassette:
+            if not core.config.has_section('YouTube'):
+                core.config.add_section('YouTube')
+            if args.transport:
+                core.config['YouTube']['transport'] = args.transport
+            if args.cassette:
+                core.config['YouTube']['cassette_folder'] = args.cassette
+            core.init_youtube_transport()
+        if args.quota_budget is not None:
+            if not core.config.has_section('YouTube'):
+                core.config.add_section('YouTube')
+            core.config['YouTube']['quota_budget'] = str(args.quota_budget)
+        api_key = args.api_key or core.config.get('API_KEYS', 'youtube_api_key', fallback='')
+        if not api_key and core.youtube_transport in ('replay', 'synthetic'):
+            # Hors ligne, la clé n'est jamais envoyée ni enregistrée
+            api_key = 'offline'
+        if not api_key:
+            raise ValueError("La clé API YouTube n'est pas définie.")
+        if not args.channel and not args.videos.strip():
+            raise ValueError("Indiquez une chaîne (--channel) ou des vidéos (--videos).")
+        started = time.perf_counter()
+        if args.database:
+            # Pipeline de la chaîne jusqu'à la base : interrogeable au fil de l'arrivée des vidéos
+            result = core.ingest_videos_to_database(
+                args.database, args.channel, args.videos, args.count, api_key, args.chunk_size,
+                progress_callback=lambda done, total, chunks: print(
+                    f"Vidéos {done}/{total} · {chunks} segments indexés", file=sys.stderr))
+            elapsed = time.perf_counter() - started
+            return {
+                **result,
+                'transport': core.youtube_transport,
+                'elapsed': round(elapsed, 3),
+                'videos_per_second': round(len(result['videos']) / elapsed, 2) if elapsed > 0 else None,
+                'info': core.get_database_info(args.database)
+            }
+        videos = core.fetch_videos(args.channel, args.videos, args.count, api_key)
+        processed = core.process_videos(videos, progress_callback=lambda done, total, saved: print(
+            f"Vidéos {done}/{total} · {saved} transcriptions", file=sys.stderr))
+        elapsed = time.perf_counter() - started
+        return {
+            'videos': [video['id'] for video in videos],
+            'processed': processed,
+            'quota_units': core.youtube_quota.budget_used,
+            'transport': core.youtube_transport,
+            'elapsed': round(elapsed, 3),
+            'videos_per_second': round(len(videos) / elapsed, 2) if elapsed > 0 else None
+        }
+
+    if args.command == "quota":
+        return core.youtube_quota.today()
+
+    if args.command == "compress":
+        folders = args.folder or [
+            core.config.get('Directories', 'transcriptions', fallback='3_transcriptions'),
+            core.config.get('Directories', 'markdown_reports', fallback='4_markdown_reports')
+        ]
+        return {folder: core.compress_folder(folder, args.mode) for folder in folders}
+
+    if args.command == "watch":
+        if not core.config.has_section('Database'):
+            core.config.add_section('Database')
+        core.config['Database']['watch_enabled'] = 'True'
+        core.config['Database']['watch_database'] = args.database
+        core.config['Database']['watch_folder'] = args.source
+        if args.interval is not None:
+            core.config['Database']['watch_interval'] = str(args.interval)
+        if args.debounce is not None:
+            core.config['Database']['watch_debounce'] = str(args.debounce)
+        syncs = []
+
+        def on_synced(summary):
+            syncs.append(summary)
+            emit({'database': args.database, **summary})
+
+        watcher = core.start_database_watcher(on_synced)
+        if watcher is None:
+            raise ValueError(f"Impossible de surveiller '{args.source}' pour la base '{args.database}'")
+        # Surveillance jusqu'à l'interruption (Ctrl+C)
+        try:
+            while not watcher.stop_event.is_set():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            core.stop_database_watcher()
+        return {'database': args.database, 'syncs': len(syncs)}
+
+    if args.command == "search":
+        load_database(core, args.database)
+        documents = core.search_documents(args.query, core.index, core.data,
+                                          top_k=args.top_k, max_context_length=args.max_context)
+        return {'database': args.database, 'query': args.query, 'results': documents}
+
+    if args.command == "ask":
+        if args.backend:
+            if not core.config.has_section('Model'):
+                core.config.add_section('Model')
+            core.config['Model']['backend'] = args.backend
+            core.init_llm_backend()
+        if args.database:
+            load_database(core, args.database)
+        result = core.ask(args.query, args.model, args.api_key, use_database=bool(args.database),
+                          top_k=args.top_k, max_context_length=args.max_context)
+        if result['answer'] is None:
+            raise RuntimeError(" ".join(result['messages']) or "Aucune réponse du modèle")
+        return {'query': args.query, 'model': args.model, 'database': args.database, **result}
+
+    raise ValueError(f"Commande inconnue : {args.command}")
+
+
+def main(argv=None):
+    """
+    Point d'entrée de la ligne de commande
+
+    Args:
+        argv: Arguments (None = sys.argv)
+
+    Returns:
+        int: Code de sortie (0 en cas de succès)
+    """
+    args = build_parser().parse_args(argv)
+    stdout = sys.stdout
+
+    def emit(output):
+        print(json.dumps(output, ensure_ascii=False, default=str), file=stdout, flush=True)
+
+    # Les messages de suivi de la logique métier vont sur stderr, stdout ne reçoit que le JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            core = BlowChatCore()
+            output, exit_code = run_command(core, args, emit), 0
+        except PipelineCancelled:
+            output, exit_code = {'error': "Opération annulée"}, 130
+        except KeyboardInterrupt:
+            output, exit_code = {'error': "Opération interrompue"}, 130
+        except Exception as e:
+            output, exit_code = {'error': str(e)}, 1
+    print(json.dumps(output, ensure_ascii=False, indent=2, default=str))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3102 @@
+"""
+Module core.py - Logique métier de Blow Chat YT indépendante de l'interface graphique
+Contient la configuration, les bases de données vectorielles, la recherche, l'outil YouTube
+et la génération des réponses, utilisables sans Tk (interface graphique ou ligne de commande).
+"""
+
+import configparser
+import json
+import math
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+
+import faiss
+from huggingface_hub import login
+from langchain.schema import AIMessage, HumanMessage, SystemMessage
+from sentence_transformers import SentenceTransformer
+
+import storage
+from extraction import SUPPORTED_EXTENSIONS, ExtractionCache, file_hash, read_source_file
+from fetcher import TokenBucket, map_as_completed
+from groq_api import GroqClientPool
+from ingest import AsyncPipeline
+from llm_backend import LLM_BACKENDS, FakeBackend
+from pipeline import Pipeline, PipelineCancelled
+from prefetch import RetrievalPrefetcher
+from quota import QuotaScheduler
+from response_cache import ResponseCache, fingerprint, normalize_question
+from transport import (TRANSPORT_MODES, Cassette, LiveTranscriptSource, RecordingHttp,
+                       RecordingTranscriptSource, ReplayHttp, ReplayTranscriptSource, SyntheticChannel)
+from watcher import FolderWatcher
+from youtube_api import PooledHttp, YouTubeClientPool
+
+
+class BlowChatCore:
+    """Logique métier de l'application Blow Chat YT, sans dépendance à l'interface graphique"""
+    
+    def __init__(self):
+        """Initialisation de la logique métier"""
+        # Configuration
+        self.config = configparser.ConfigParser()
+        self.config_file = "config.ini"
+        
+        # Historique de conversation
+        self.conversation_history = []
+        # Résumé des échanges retirés de l'historique ([Model] memory_mode = summary)
+        self.conversation_summary = ''
+        self.memory_lock = threading.Lock()
+        self.summary_thread = None
+        
+        # Index et données pour la recherche
+        self.index = None
+        self.data = None
+        self.current_database_name = None
+        
+        # Verrou de la base active (échange atomique de l'index et des données)
+        self.database_lock = threading.RLock()
+        # Verrou des écritures sur les bases (une seule mise à jour à la fois)
+        self.database_write_lock = threading.Lock()
+        # Surveillance d'un dossier source pour l'enrichissement automatique
+        self.database_watcher = None
+        # Verrou des états de synchronisation des chaînes (mis à jour par plusieurs threads)
+        self.channel_sync_lock = threading.Lock()
+        
+        # Créer les répertoires nécessaires
+        self.create_directories()
+        
+        # Charger la configuration (UNE SEULE FOIS ICI)
+        self.load_config()
+        
+        # Clients de l'API YouTube et source des transcriptions (transport [YouTube] transport)
+        self.youtube_clients = None
+        self.transcript_source = None
+        self.youtube_transport = 'live'
+        self.init_youtube_transport()
+        
+        # Décompte du quota de l'API YouTube Data, nouvelles tentatives et budget des importations
+        database_folder = self.config.get('Directories', 'database', fallback='5_database')
+        self.youtube_quota = QuotaScheduler(
+            os.path.join(database_folder, 'quota_usage.json'),
+            daily_limit=self.config.getint('YouTube', 'quota_daily_limit', fallback=10000),
+            max_retries=self.config.getint('YouTube', 'max_retries', fallback=5),
+            backoff_base=self.config.getfloat('YouTube', 'backoff_base', fallback=1.0),
+            backoff_max=self.config.getfloat('YouTube', 'backoff_max', fallback=60.0),
+            rate=self.config.getfloat('YouTube', 'api_rate', fallback=10.0)
+        )
+        
+        # Moteur de génération des réponses ([Model] backend) : clients Groq réutilisés d'un
+        # message à l'autre (pool de connexions partagé) ou modèle local simulé
+        self.llm_backend = None
+        self.llm_backend_name = 'groq'
+        self.init_llm_backend()
+        # Cache des réponses du modèle (questions déjà posées dans les mêmes conditions)
+        self.response_cache = ResponseCache(
+            os.path.join(database_folder, 'response_cache.pkl'),
+            mode=self.config.get('Model', 'response_cache', fallback='exact'),
+            max_entries=self.config.getint('Model', 'response_cache_size', fallback=500),
+            ttl=self.config.getint('Model', 'response_cache_ttl', fallback=86400),
+            threshold=self.config.getfloat('Model', 'response_cache_threshold', fallback=0.92)
+        )
+        # Modèle d'encodage des requêtes, chargé une seule fois (recherche et cache sémantique)
+        self.query_model = None
+        self.query_model_lock = threading.Lock()
+        # Embeddings des dernières requêtes : la question recherchée dans la base n'est pas
+        # réencodée pour le cache sémantique
+        self.query_vectors = OrderedDict()
+        self.query_vectors_lock = threading.Lock()
+        # Recherche anticipée du contexte pendant la saisie ([Database] prefetch_enabled)
+        self.retrieval_prefetcher = RetrievalPrefetcher(
+            self.prefetch_retrieval,
+            similarity=self.config.getfloat('Database', 'prefetch_similarity', fallback=0.9),
+            min_chars=self.config.getint('Database', 'prefetch_min_chars', fallback=8)
+        )
+        
+        # Initialiser l'authentification Hugging Face
+        self.init_huggingface_auth()
+    
+    def log_info(self, message, output_widget=None):
+        """
+        Affiche un message d'information dans la zone de texte ou sur la sortie standard
+        
+        Args:
+            message: Message à afficher
+            output_widget: Widget de texte où afficher le message (None = console)
+        """
+        if output_widget:
+            output_widget._textbox.insert("end", f"[INFO] {message}\n", 'system')
+            output_widget._textbox.see("end")
+        else:
+            print(f"[INFO] {message}")
+    
+    def log_error(self, message, output_widget=None):
+        """
+        Affiche un message d'erreur dans la zone de texte ou sur la sortie standard
+        
+        Args:
+            message: Message à afficher
+            output_widget: Widget de texte où afficher le message (None = console)
+        """
+        if output_widget:
+            output_widget._textbox.insert("end", f"[ERROR] {message}\n", 'system')
+            output_widget._textbox.see("end")
+        else:
+            print(f"[ERROR] {message}")
+    
+    def write_output(self, output_widget, text):
+        """
+        Écrit un texte brut dans la zone de texte ou sur la sortie standard
+        
+        Args:
+            output_widget: Widget de texte où écrire (None = console)
+            text: Texte à écrire
+        """
+        if output_widget:
+            output_widget._textbox.insert("end", text, 'system')
+        else:
+            print(text, end='')
+    
+    def report_config_error(self, error):
+        """
+        Signale une erreur de sauvegarde de la configuration (l'interface graphique affiche une boîte de dialogue)
+        
+        Args:
+            error: Exception levée lors de la sauvegarde
+        """
+    
+    def init_huggingface_auth(self):
+        """Initialise l'authentification avec Hugging Face Hub"""
+        try:
+            # D'abord vérifier les variables d'environnement
+            hf_token = os.environ.get('HUGGINGFACE_TOKEN')
+            
+            # Si non trouvé, vérifier dans le fichier de configuration
+            if not hf_token:
+                hf_token = self.config.get('API_KEYS', 'huggingface_token', fallback='')
+                
+            # S'authentifier seulement si un token est disponible
+            if hf_token:
+                login(token=hf_token)
+                print("Authentification Hugging Face réussie")
+            else:
+                print("Avertissement: Aucun token Hugging Face trouvé. Certaines fonctionnalités peuvent être limitées.")
+                
+        except Exception as e:
+            import logging
+            logging.getLogger('BlowChatYT').error(f"Erreur lors de l'initialisation de l'authentification Hugging Face: {e}")
+            print(f"Erreur d'authentification Hugging Face: {e}")
+    
+    def create_directories(self):
+        """Crée les répertoires nécessaires pour l'application"""
+        directories = [
+            "1_history_pkl",
+            "2_conversation_txt",
+            "3_transcriptions",
+            "4_markdown_reports",
+            "5_database"
+        ]
+        for directory in directories:
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+                print(f"Répertoire créé : {directory}")
+    
+    def load_config(self):
+        """Charge la configuration depuis le fichier config.ini"""
+        try:
+            # Essayer de charger depuis le chemin par défaut
+            if os.path.exists(self.config_file):
+                self.config.read(self.config_file, encoding='utf-8')
+                print(f"Configuration chargée depuis {self.config_file}")
+            else:
+                # Vérifier si une configuration existe dans le dossier utilisateur
+                user_dir = os.path.expanduser("~")
+                alt_config_file = os.path.join(user_dir, "blow_chat_config.ini")
+                
+                if os.path.exists(alt_config_file):
+                    self.config_file = alt_config_file
+                    self.config.read(self.config_file, encoding='utf-8')
+                    print(f"Configuration chargée depuis le chemin alternatif: {self.config_file}")
+                else:
+                    # Créer une configuration par défaut
+                    self._create_default_config()
+                    print("Configuration par défaut créée")
+        except Exception as e:
+            print(f"Erreur lors du chargement de la configuration: {e}")
+            # Créer une configuration par défaut en cas d'erreur
+            self._create_default_config()
+            print("Configuration par défaut créée suite à une erreur")
+    
+    def _create_default_config(self):
+        """Crée une configuration par défaut"""
+        self.config['API_KEYS'] = {}
+        self.config['Appearance'] = {
+            'theme': 'blue',
+            'font_size': '12',
+            'color_system': '#0000FF',
+            'color_user': '#008000',
+            'color_model': '#FF0000',
+            'color_model_name': '#800080',
+            'color_user_name': '#FFA500'
+        }
+        self.config['Assistant'] = {
+            'name': 'LIHA',
+            'role': 'Assistant',
+            'objective': "Aider l'utilisateur"
+        }
+        self.config['Directories'] = {}
+        self.config['Database'] = {
+            'neighbor_radius': '1',
+            'time_window': '60',
+            'extraction_workers': '0',
+            'pipeline_queue_size': '8',
+            'encode_batch_size': '64',
+            'checkpoint_interval': '500',
+            'watch_enabled': 'False',
+            'watch_database': '',
+            'watch_folder': '3_transcriptions',
+            'watch_interval': '5',
+            'watch_debounce': '10',
+            'prefetch_enabled': 'False',
+            'prefetch_debounce': '400',
+            'prefetch_similarity': '0.9',
+            'prefetch_min_chars': '8'
+        }
+        self.config['YouTube'] = {
+            'transcript_workers': '4',
+            'transcript_rate': '2',
+            'transcript_burst': '4',
+            'http_pool_size': '10',
+            'ingest_commit_interval': '5',
+            'compression': 'none',
+            'compression_level': '6',
+            'quota_daily_limit': '10000',
+            'quota_budget': '0',
+            'api_rate': '10',
+            'max_retries': '5',
+            'backoff_base': '1',
+            'backoff_max': '60',
+            'transport': 'live',
+            'cassette_folder': '5_database/cassettes',
+            'replay_latency': '0',
+            'synthetic_videos': '500',
+            'synthetic_latency': '0.05',
+            'synthetic_segments': '120',
+            'synthetic_missing_ratio': '0',
+            'synthetic_seed': '0'
+        }
+        self.config['Model'] = {
+            'temperature': '0.3',
+            'max_tokens': '6000',
+            'max_history_length': '5',
+            'http_pool_size': '10',
+            'keep_partial_answer': 'True',
+            'response_cache': 'exact',
+            'response_cache_size': '500',
+            'response_cache_ttl': '86400',
+            'response_cache_threshold': '0.92',
+            'memory_mode': 'window',
+            'memory_token_budget': '3000',
+            'summary_max_tokens': '500',
+            'summary_model': '',
+            'request_policy': 'queue',
+            'request_queue_size': '5',
+            'backend': 'groq',
+            'fake_ttft': '0.3',
+            'fake_tokens_per_second': '50',
+            'fake_answer_tokens': '200',
+            'fake_error_rate': '0',
+            'fake_error_after': '0',
+            'fake_seed': '0'
+        }
+        self.config['Stream'] = {
+            'default_speed': 'Normal',
+            'lent_token_ms': '60',
+            'normal_token_ms': '25',
+            'rapide_token_ms': '10',
+            'tres_rapide_token_ms': '4',
+            'turbo_token_ms': '0',
+            'frame_rate': '30'
+        }
+        self.save_config()
+    
+    def save_config(self):
+        """Sauvegarde la configuration dans le fichier config.ini et retourne True si réussi"""
+        try:
+            # Vérifier les droits d'écriture en essayant d'écrire un fichier test
+            test_file = os.path.join(os.path.dirname(self.config_file), "test_write.tmp")
+            try:
+                with open(test_file, 'w') as f:
+                    f.write("test")
+                os.remove(test_file)
+            except (IOError, PermissionError) as e:
+                print(f"ATTENTION: Impossible d'écrire dans le répertoire: {e}")
+                # Utiliser un chemin alternatif dans le dossier utilisateur
+                user_dir = os.path.expanduser("~")
+                self.config_file = os.path.join(user_dir, "blow_chat_config.ini")
+                print(f"Utilisation du chemin alternatif pour la configuration: {self.config_file}")
+            
+            # Sauvegarde proprement dite
+            with open(self.config_file, 'w', encoding='utf-8') as f:
+                self.config.write(f)
+            # print(f"Configuration sauvegardée dans {self.config_file}")
+            return True
+        except Exception as e:
+            print(f"ERREUR CRITIQUE lors de la sauvegarde de la configuration: {e}")
+            self.report_config_error(e)
+            return False
+    
+    def count_tokens(self, text):
+        """
+        Compte approximativement le nombre de tokens dans le texte
+        Un token correspond à environ 4 caractères en moyenne
+        """
+        return len(text) // 4
+    
+    def get_available_databases(self):
+        """
+        Récupère la liste des bases de données vectorielles disponibles
+        
+        Returns:
+            list: Liste des noms de bases disponibles
+        """
+        database_folder = self.config.get('Directories', 'database', fallback='5_database')
+        available_dbs = []
+        
+        try:
+            # Parcourir tous les fichiers du dossier
+            for file in os.listdir(database_folder):
+                # Ne considérer que les fichiers .pkl qui ne commencent pas par 'faiss_index_'
+                if file.endswith('.pkl') and not file.startswith('faiss_index_'):
+                    # Extraire le nom de la base (sans l'extension .pkl)
+                    db_name = os.path.splitext(file)[0]
+                    # Vérifier que le fichier d'index correspondant existe
+                    if os.path.exists(os.path.join(database_folder, f'faiss_index_{db_name}.bin')):
+                        available_dbs.append(db_name)
+        except Exception as e:
+            print(f"Erreur lors de la recherche des bases disponibles : {e}")
+        
+        return available_dbs
+    
+    def get_available_sources(self):
+        """
+        Récupère la liste des dossiers source disponibles pour créer des bases
+        
+        Returns:
+            list: Liste des dossiers disponibles
+        """
+        # Dossiers sources par défaut
+        default_sources = [
+            "3_transcriptions",
+            "4_markdown_reports"
+        ]
+        
+        # Ajouter les dossiers personnalisés depuis la configuration
+        custom_sources = []
+        if 'Sources' in self.config:
+            for key, value in self.config['Sources'].items():
+                if os.path.exists(value) and value not in default_sources:
+                    custom_sources.append(value)
+        
+        # Combiner les sources et vérifier leur existence
+        available_sources = []
+        for source in default_sources + custom_sources:
+            if os.path.exists(source) and os.path.isdir(source):
+                available_sources.append(source)
+        
+        return available_sources
+    
+    def load_vector_database(self, db_name):
+        """
+        Charge une base de données vectorielle.
+        
+        Args:
+            db_name: Nom de la base de données à charger
+            
+        Returns:
+            Tuple (index, data) ou None en cas d'erreur
+        """
+        try:
+            # Vérifier que la base existe
+            database_folder = self.config.get('Directories', 'database', fallback='5_database')
+            db_path = os.path.join(database_folder, f'{db_name}.pkl')
+            index_path = os.path.join(database_folder, f'faiss_index_{db_name}.bin')
+            
+            if not os.path.exists(db_path) or not os.path.exists(index_path):
+                print(f"La base de données '{db_name}' n'existe pas")
+                return None
+            
+            # Charger les données et l'index FAISS ensemble (jamais pendant leur remplacement)
+            with self.database_lock:
+                with open(db_path, 'rb') as f:
+                    data = pickle.load(f)
+                index = faiss.read_index(index_path)
+            
+            # Compléter l'index d'adjacence pour les bases plus anciennes
+            self.ensure_chunk_adjacency(data)
+            
+            # S'assurer que le modèle SentenceTransformer est disponible
+            # (nécessaire pour les recherches futures)
+            model_name = 'sentence-transformers/all-MiniLM-L6-v2'
+            try:
+                model = SentenceTransformer(model_name)
+                print(f"Modèle {model_name} chargé avec succès pour la recherche")
+            except Exception as e:
+                import logging
+                logging.getLogger('BlowChatYT').error(f"Erreur lors de l'initialisation du service d'embeddings pour la recherche: {e}")
+                print(f"Attention: Impossible de charger le modèle SentenceTransformer. Les recherches pourraient ne pas fonctionner correctement. Erreur: {e}")
+            
+            return index, data
+        except Exception as e:
+            import logging
+            logging.getLogger('BlowChatYT').error(f"Erreur lors du chargement de la base de données: {e}")
+            print(f"Erreur lors du chargement de la base de données '{db_name}': {e}")
+            return None
+    
+    def set_active_database(self, db_name, index, data):
+        """
+        Remplace la base active en une seule opération : une recherche en cours
+        conserve l'ancien couple (index, données) et ne voit jamais un mélange des deux
+        
+        Args:
+            db_name: Nom de la base (None pour décharger la base active)
+            index: Index FAISS de la base
+            data: Données de la base
+        """
+        with self.database_lock:
+            self.index, self.data = index, data
+            self.current_database_name = db_name
+    
+    def get_active_database(self):
+        """
+        Retourne un instantané cohérent de la base active
+        
+        Returns:
+            tuple: (nom, index, données), avec des valeurs None si aucune base n'est chargée
+        """
+        with self.database_lock:
+            return self.current_database_name, self.index, self.data
+    
+    def get_query_model(self):
+        """
+        Retourne le modèle d'encodage des requêtes, chargé au premier appel puis réutilisé
+        
+        Returns:
+            SentenceTransformer: Modèle all-MiniLM-L6-v2
+        """
+        with self.query_model_lock:
+            if self.query_model is None:
+                self.query_model = SentenceTransformer('all-MiniLM-L6-v2')
+            return self.query_model
+    
+    def encode_query(self, query):
+        """
+        Encode une requête, ou réutilise son embedding s'il a été calculé récemment
+        (recherche anticipée du brouillon, recherche du contexte, cache sémantique)
+        
+        Args:
+            query: Texte de la requête
+            
+        Returns:
+            numpy.ndarray: Embedding de forme (1, dimension)
+        """
+        with self.query_vectors_lock:
+            vector = self.query_vectors.get(query)
+            if vector is not None:
+                self.query_vectors.move_to_end(query)
+                return vector
+        vector = self.get_query_model().encode([query])
+        with self.query_vectors_lock:
+            self.query_vectors[query] = vector
+            while len(self.query_vectors) > 16:
+                self.query_vectors.popitem(last=False)
+        return vector
+    
+    def search_documents(self, query, index, data, top_k=10, max_context_length=4000, neighbor_radius=None):
+        """
+        Recherche les documents les plus pertinents pour une requête donnée.
+        Chaque résultat est étendu à ses chunks voisins dans le même fichier et les
+        fenêtres qui se chevauchent sont fusionnées en un seul bloc de contexte.
+        Limite la longueur totale du contexte.
+        
+        Args:
+            query: Requête de recherche
+            index: Index FAISS à utiliser
+            data: Données des documents
+            top_k: Nombre maximal de blocs de contexte à retourner
+            max_context_length: Longueur maximale totale du contexte
+            neighbor_radius: Nombre de chunks voisins à inclure de chaque côté
+                             (si None, utilise [Database] neighbor_radius)
+            
+        Returns:
+            list: Liste des documents pertinents
+        """
+        # Encoder la requête
+        query_vector = self.encode_query(query)
+        
+        # Recherche dans l'index
+        distances, indices = index.search(query_vector, top_k * 2)  # Obtenir plus de résultats pour filtrer ensuite
+        
+        # Rayon d'expansion autour de chaque chunk trouvé (0 = pas d'expansion)
+        if neighbor_radius is None:
+            neighbor_radius = self.config.getint('Database', 'neighbor_radius', fallback=1)
+        
+        # Fusionner les résultats avec leurs voisins en fenêtres contiguës
+        hits = [(int(idx), distances[0][i]) for i, idx in enumerate(indices[0])]
+        windows = self.merge_neighbor_windows(hits, data, neighbor_radius)
+        
+        results = []
+        total_length = 0
+        
+        # Ajouter des informations de source pour chaque fenêtre
+        for window in windows[:top_k]:
+            filename = window['filename']
+            
+            # Ajouter le score de similarité avec gestion des cas anormaux
+            distance = window['distance']
+            # Vérification de la validité de la distance (ni infini, ni NaN)
+            if not math.isfinite(distance):
+                # Log pour le debug si la distance est invalide
+                print(
+                    f"Distance invalide détectée pour la source {filename}: {distance}"
+                )
+                similarity = "\n[Pertinence: valeur de distance invalide]"
+            else:
+                # On borne la distance pour éviter l'overflow et garantir un pourcentage cohérent
+                distance = min(max(distance, 0.0), 1.0)
+                similarity = (
+                    f"\n[Pertinence: {100 * (1 - distance):.1f}%]"
+                )
+            
+            # Essayer d'abord la fenêtre complète, puis seulement les chunks trouvés
+            doc_with_meta = None
+            for chunk_ids in (window['chunk_ids'], window['hit_span']):
+                document = "".join(data['documents'][chunk_id] for chunk_id in chunk_ids)
+                source_info = self.format_source_info(data, chunk_ids[0], filename)
+                candidate = f"{document}{source_info}{similarity}\n---\n"
+                if total_length + len(candidate) <= max_context_length:
+                    doc_with_meta = candidate
+                    break
+            
+            if doc_with_meta is None:
+                break
+            
+            results.append(doc_with_meta)
+            total_length += len(doc_with_meta)
+                
+        return results
+    
+    def format_source_info(self, data, chunk_id, filename):
+        """
+        Formate la ligne [Source: ...] d'un bloc de contexte.
+        Pour une transcription horodatée, ajoute un lien vers le moment de la vidéo.
+        
+        Args:
+            data: Données de la base de données
+            chunk_id: ID du premier chunk du bloc
+            filename: Nom du fichier source
+            
+        Returns:
+            str: Ligne de source (vide si le fichier est inconnu)
+        """
+        if not filename:
+            return ""
+        metadata = data['metadata'][chunk_id] if chunk_id < len(data.get('metadata', [])) else {}
+        if metadata.get('video_id') and metadata.get('start') is not None:
+            link = f"https://www.youtube.com/watch?v={metadata['video_id']}&t={int(metadata['start'])}s"
+            return f"\n[Source: {filename} - {link}]"
+        return f"\n[Source: {filename}]"
+    
+    def build_chunk_adjacency(self, filenames):
+        """
+        Construit l'index d'adjacence des chunks à partir de la liste ordonnée des fichiers.
+        Les chunks d'un même fichier sont stockés de façon contiguë et dans l'ordre du texte.
+        
+        Args:
+            filenames: Liste des noms de fichiers, un par chunk (data['filenames'])
+            
+        Returns:
+            tuple: (adjacency, positions) où adjacency associe à chaque fichier la liste
+                   ordonnée de ses IDs de chunks, et positions donne pour chaque ID de chunk
+                   sa position dans son fichier
+        """
+        adjacency = {}
+        positions = []
+        for chunk_id, filename in enumerate(filenames):
+            file_chunks = adjacency.setdefault(filename, [])
+            positions.append(len(file_chunks))
+            file_chunks.append(chunk_id)
+        return adjacency, positions
+    
+    def ensure_chunk_adjacency(self, data):
+        """
+        S'assure que les données d'une base contiennent l'index d'adjacence des chunks.
+        Les bases créées avant l'ajout de cet index sont complétées à la volée.
+        
+        Args:
+            data: Données de la base de données
+        """
+        filenames = data.get('filenames', [])
+        if 'adjacency' not in data or len(data.get('chunk_positions', [])) != len(filenames):
+            data['adjacency'], data['chunk_positions'] = self.build_chunk_adjacency(filenames)
+    
+    def merge_neighbor_windows(self, hits, data, neighbor_radius=1):
+        """
+        Étend chaque résultat de recherche à ses chunks voisins et fusionne les fenêtres
+        qui se chevauchent ou se touchent dans un même fichier.
+        
+        Args:
+            hits: Liste de tuples (id du chunk, distance) triés par pertinence
+            data: Données de la base de données
+            neighbor_radius: Nombre de chunks voisins à inclure de chaque côté
+            
+        Returns:
+            list: Fenêtres triées par pertinence, chacune sous forme de dictionnaire avec
+                  'filename', 'chunk_ids', 'hit_span' et 'distance'
+        """
+        self.ensure_chunk_adjacency(data)
+        adjacency = data['adjacency']
+        positions = data['chunk_positions']
+        filenames = data.get('filenames', [])
+        num_documents = len(data['documents'])
+        
+        # Regrouper les intervalles (position début, position fin) par fichier
+        spans_by_file = {}
+        for chunk_id, distance in hits:
+            if chunk_id < 0 or chunk_id >= num_documents or chunk_id >= len(filenames):
+                continue
+            filename = filenames[chunk_id]
+            position = positions[chunk_id]
+            last_position = len(adjacency[filename]) - 1
+            spans_by_file.setdefault(filename, []).append({
+                'start': max(0, position - neighbor_radius),
+                'end': min(last_position, position + neighbor_radius),
+                'hits': [position],
+                'distance': distance
+            })
+        
+        # Fusionner les intervalles qui se chevauchent ou sont adjacents
+        windows = []
+        for filename, spans in spans_by_file.items():
+            spans.sort(key=lambda span: span['start'])
+            merged = [spans[0]]
+            for span in spans[1:]:
+                current = merged[-1]
+                if span['start'] <= current['end'] + 1:
+                    current['end'] = max(current['end'], span['end'])
+                    current['hits'].extend(span['hits'])
+                    current['distance'] = self._min_distance(current['distance'], span['distance'])
+                else:
+                    merged.append(span)
+            
+            file_chunks = adjacency[filename]
+            for span in merged:
+                windows.append({
+                    'filename': filename,
+                    'chunk_ids': file_chunks[span['start']:span['end'] + 1],
+                    'hit_span': file_chunks[min(span['hits']):max(span['hits']) + 1],
+                    'distance': span['distance']
+                })
+        
+        # Les fenêtres les plus pertinentes en premier (les distances invalides à la fin)
+        windows.sort(key=lambda window: window['distance'] if math.isfinite(window['distance']) else math.inf)
+        return windows
+    
+    def _min_distance(self, first, second):
+        """Retourne la plus petite des deux distances en ignorant les valeurs invalides"""
+        if not math.isfinite(first):
+            return second
+        if not math.isfinite(second):
+            return first
+        return min(first, second)
+    
+    def create_vector_database(self, db_name, source_folder='3_transcriptions', chunk_size=500,
+                               cancel_event=None, progress_callback=None):
+        """
+        Crée une base de données vectorielle à partir des transcriptions et des PDF.
+        Les documents sont divisés en chunks de taille spécifiée.
+        
+        Args:
+            db_name: Nom de la base de données à créer
+            source_folder: Dossier contenant les fichiers source
+            chunk_size: Taille des chunks de texte
+            cancel_event: threading.Event permettant d'annuler la création
+            progress_callback: Fonction de suivi de la progression (voir run_build_pipeline)
+            
+        Returns:
+            list: Rapport de débit de chaque étage du pipeline de construction
+        """
+        try:
+            # Charger le modèle de transformation
+            model_name = 'sentence-transformers/all-MiniLM-L6-v2'
+            try:
+                model = SentenceTransformer(model_name)
+                print(f"Modèle {model_name} chargé avec succès")
+            except Exception as e:
+                import logging
+                logging.getLogger('BlowChatYT').error(f"Erreur lors de l'initialisation du service d'embeddings: {e}")
+                raise ValueError(f"Impossible de charger le modèle {model_name}. Veuillez vérifier votre connexion internet et votre token Hugging Face. Erreur: {e}")
+            
+            # Vérifier que le dossier source existe
+            if not os.path.exists(source_folder):
+                raise FileNotFoundError(f"Le dossier source '{source_folder}' n'existe pas")
+            
+            # Ignorer les autres types de fichiers
+            source_files = storage.list_files(source_folder, SUPPORTED_EXTENSIONS)
+            
+            # Reprendre une construction interrompue depuis son dernier point de contrôle
+            checkpoint_state = {
+                'filenames': [],
+                'documents': [],
+                'metadata': [],
+                'checkpoint_mode': 'create',
+                'checkpoint_source': source_folder,
+                'checkpoint_chunk_size': chunk_size
+            }
+            index = None
+            resumed = self.load_build_checkpoint(db_name, source_folder, chunk_size, 'create')
+            if resumed:
+                index, checkpoint_state = resumed
+                done_files = set(checkpoint_state['filenames'])
+                source_files = [filename for filename in source_files if filename not in done_files]
+                print(f"Reprise de la création de '{db_name}' : {len(done_files)} fichiers déjà encodés")
+            
+            # Lecture, extraction, découpage, encodage et indexation en pipeline
+            result = self.run_build_pipeline(source_folder, source_files, chunk_size, model, index=index,
+                                             cancel_event=cancel_event, checkpoint=(db_name, checkpoint_state),
+                                             progress_callback=progress_callback)
+            documents = checkpoint_state['documents'] + result['documents']
+            filenames = checkpoint_state['filenames'] + result['filenames']
+            metadata = checkpoint_state['metadata'] + result['metadata']
+            index = result['index']
+            
+            # Vérifier qu'il y a des documents à traiter
+            if not documents:
+                raise ValueError(f"Aucun document texte ou PDF trouvé dans le dossier '{source_folder}'")
+            
+            # Chemin des métadonnées de la base
+            database_folder = self.config.get('Directories', 'database', fallback='5_database')
+            db_path = os.path.join(database_folder, f'{db_name}.pkl')
+            
+            # Sauvegarder l'index et les métadonnées
+            # Index d'adjacence (fichier, position) -> ID de chunk pour l'expansion des résultats
+            adjacency, chunk_positions = self.build_chunk_adjacency(filenames)
+            
+            self.save_vector_database(db_name, index, {
+                'filenames': filenames, 
+                'documents': documents, 
+                'metadata': metadata,
+                'adjacency': adjacency,
+                'chunk_positions': chunk_positions,
+                'file_signatures': self.get_file_signatures(source_folder, set(filenames), with_digest=True),
+                'creation_date': os.path.getctime(db_path) if os.path.exists(db_path) else None,
+                'last_modified': os.path.getmtime(db_path) if os.path.exists(db_path) else None,
+                'source_folder': source_folder,
+                'chunk_size': chunk_size,
+                'num_documents': len(documents)
+            })
+            
+            # La base est complète : le point de contrôle n'est plus nécessaire
+            self.clear_build_checkpoint(db_name)
+            
+            # Rapport de débit des étages du pipeline
+            for line in result['report']:
+                print(line)
+            return result['report']
+        except Exception as e:
+            import logging
+            logging.getLogger('BlowChatYT').error(f"Erreur lors de la création de la base de données vectorielle: {e}")
+            raise
+    
+    def get_extraction_cache(self):
+        """
+        Retourne le cache des textes extraits des PDF
+        
+        Returns:
+            ExtractionCache: Cache situé dans le dossier des bases de données
+        """
+        database_folder = self.config.get('Directories', 'database', fallback='5_database')
+        cache_folder = os.path.join(database_folder, 'extraction_cache')
+        max_workers = self.config.getint('Database', 'extraction_workers', fallback=0)
+        return ExtractionCache(cache_folder, max_workers)
+    
+    def run_build_pipeline(self, source_folder, source_files, chunk_size, model, index=None,
+                           track_added_date=False, cancel_event=None, checkpoint=None, progress_callback=None):
+        """
+        Construit les chunks et les vecteurs d'une liste de fichiers avec un pipeline à étages
+        (lecture -> extraction -> découpage -> encodage -> indexation) reliés par des files bornées.
+        Le disque, l'extraction des PDF et l'encodage travaillent ainsi en parallèle.
+        
+        Args:
+            source_folder: Dossier contenant les fichiers
+            source_files: Noms des fichiers à traiter
+            chunk_size: Taille des chunks de texte
+            model: Modèle SentenceTransformer pour l'encodage
+            index: Index FAISS existant à compléter (None = création d'un IndexFlatL2)
+            track_added_date: Ajouter la date du fichier ('added_date') aux métadonnées
+            cancel_event: threading.Event permettant d'annuler la construction
+            checkpoint: Tuple (nom de la base, état initial) pour enregistrer un point de contrôle
+                        tous les [Database] checkpoint_interval chunks (None = désactivé)
+            progress_callback: Fonction progress_callback(fichiers indexés, fichiers au total,
+                               segments indexés) appelée depuis les threads du pipeline
+            
+        Returns:
+            dict: 'index', 'documents', 'filenames', 'metadata' (dans l'ordre de l'index)
+                  et 'report' (débit de chaque étage)
+        """
+        queue_size = self.config.getint('Database', 'pipeline_queue_size', fallback=8)
+        batch_size = self.config.getint('Database', 'encode_batch_size', fallback=64)
+        cache = self.get_extraction_cache()
+        executor = cache.create_executor()
+        
+        checkpoint_interval = self.config.getint('Database', 'checkpoint_interval', fallback=500)
+        
+        result = {'index': index, 'documents': [], 'filenames': [], 'metadata': []}
+        pending = []  # Chunks en attente d'encodage : (nom du fichier, texte, métadonnées)
+        since_checkpoint = [0]  # Chunks indexés depuis le dernier point de contrôle
+        # Un fichier compte comme traité quand ses chunks sont indexés (l'encodage domine la durée)
+        progress = {'files': 0, 'chunks': 0}
+        progress_lock = threading.Lock()
+        
+        def report_progress(files=0, chunks=0):
+            with progress_lock:
+                progress['files'] += files
+                progress['chunks'] += chunks
+                files_done, chunks_done = progress['files'], progress['chunks']
+            if progress_callback:
+                progress_callback(files_done, len(source_files), chunks_done)
+        
+        def read_file(filename, emit):
+            emit((filename, read_source_file(os.path.join(source_folder, filename))))
+        
+        def extract_text(item, emit):
+            filename, source = item
+            text = source['text']
+            if text is None:
+                text = cache.extract_pdf(source['filepath'], source['digest'], executor)
+            emit((filename, source['filepath'], text))
+        
+        def chunk_text(item, emit):
+            filename, filepath, text = item
+            # Découpage par fenêtre temporelle si la transcription est horodatée
+            timings = self.load_transcript_timings(filepath, text) if filename.endswith('.txt') else None
+            text_chunks = self.chunk_document(text, chunk_size, timings)
+            added_date = os.path.getmtime(storage.stored_path(filepath)) if track_added_date else None
+            chunks = []
+            for idx, chunk in enumerate(text_chunks):
+                chunk_metadata = self.build_chunk_metadata(filename, idx, source_folder, chunk, timings)
+                if track_added_date:
+                    chunk_metadata['added_date'] = added_date
+                chunks.append((filename, chunk['text'], chunk_metadata))
+            if not chunks:
+                # Fichier vide : rien à encoder ni à indexer
+                report_progress(files=1)
+            # Tous les chunks d'un fichier restent groupés pour garder l'index d'adjacence contigu
+            emit(chunks)
+        
+        def encode_chunks(chunks, emit):
+            pending.extend(chunks)
+            if len(pending) >= batch_size:
+                flush_pending(emit)
+        
+        def flush_pending(emit):
+            if pending:
+                batch = list(pending)
+                pending.clear()
+                emit((batch, model.encode([text for _, text, _ in batch])))
+        
+        def insert_vectors(item, emit):
+            batch, vectors = item
+            if result['index'] is None:
+                result['index'] = faiss.IndexFlatL2(vectors.shape[1])
+            result['index'].add(vectors)
+            for filename, text, chunk_metadata in batch:
+                result['filenames'].append(filename)
+                result['documents'].append(text)
+                result['metadata'].append(chunk_metadata)
+            
+            # Chaque lot contient les chunks de fichiers entiers
+            report_progress(files=len({filename for filename, _, _ in batch}), chunks=len(batch))
+            
+            # Chaque lot se termine à la fin d'un fichier : le point de contrôle est toujours cohérent
+            since_checkpoint[0] += len(batch)
+            if checkpoint and checkpoint_interval > 0 and since_checkpoint[0] >= checkpoint_interval:
+                db_name, state = checkpoint
+                self.save_build_checkpoint(db_name, result['index'], state, result)
+                since_checkpoint[0] = 0
+        
+        extraction_workers = cache.max_workers or os.cpu_count() or 1
+        pipeline = Pipeline(queue_size, cancel_event)
+        pipeline.add_stage("Lecture", read_file, workers=2)
+        pipeline.add_stage("Extraction", extract_text, workers=extraction_workers)
+        pipeline.add_stage("Découpage", chunk_text)
+        pipeline.add_stage("Encodage", encode_chunks, on_end=flush_pending)
+        pipeline.add_stage("Indexation", insert_vectors)
+        try:
+            pipeline.run(source_files)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        
+        result['report'] = pipeline.format_report()
+        return result
+    
+    def get_checkpoint_paths(self, db_name):
+        """
+        Retourne les chemins du point de contrôle d'une construction de base
+        
+        Args:
+            db_name: Nom de la base de données
+            
+        Returns:
+            tuple: (chemin des données, chemin de l'index FAISS)
+        """
+        database_folder = self.config.get('Directories', 'database', fallback='5_database')
+        checkpoint_folder = os.path.join(database_folder, 'checkpoints')
+        return (
+            os.path.join(checkpoint_folder, f'{db_name}.pkl'),
+            os.path.join(checkpoint_folder, f'faiss_index_{db_name}.bin')
+        )
+    
+    def save_build_checkpoint(self, db_name, index, state, result):
+        """
+        Enregistre un point de contrôle de la construction en cours
+        
+        Args:
+            db_name: Nom de la base de données
+            index: Index FAISS contenant tous les vecteurs encodés jusqu'ici
+            state: État initial de la base (données déjà présentes avant cette exécution)
+            result: Chunks ajoutés par l'exécution en cours
+        """
+        data_path, index_path = self.get_checkpoint_paths(db_name)
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        
+        checkpoint_data = dict(state)
+        for key in ('filenames', 'documents', 'metadata'):
+            checkpoint_data[key] = state.get(key, []) + result[key]
+        
+        # Écriture atomique : un arrêt brutal laisse l'ancien point de contrôle intact
+        faiss.write_index(index, f'{index_path}.tmp')
+        with open(f'{data_path}.tmp', 'wb') as f:
+            pickle.dump(checkpoint_data, f)
+        os.replace(f'{index_path}.tmp', index_path)
+        os.replace(f'{data_path}.tmp', data_path)
+        print(f"Point de contrôle enregistré pour '{db_name}' : {len(checkpoint_data['documents'])} segments")
+    
+    def load_build_checkpoint(self, db_name, source_folder, chunk_size, mode):
+        """
+        Charge le point de contrôle d'une construction interrompue s'il correspond aux paramètres
+        
+        Args:
+            db_name: Nom de la base de données
+            source_folder: Dossier source de la construction
+            chunk_size: Taille des chunks de la construction
+            mode: 'create' ou 'enrich'
+            
+        Returns:
+            tuple: (index, données) ou None si aucun point de contrôle utilisable
+        """
+        data_path, index_path = self.get_checkpoint_paths(db_name)
+        if not os.path.exists(data_path) or not os.path.exists(index_path):
+            return None
+        try:
+            with open(data_path, 'rb') as f:
+                data = pickle.load(f)
+            checkpoint_params = (data.get('checkpoint_mode'), data.get('checkpoint_source'), data.get('checkpoint_chunk_size'))
+            if checkpoint_params != (mode, source_folder, chunk_size):
+                print(f"Point de contrôle de '{db_name}' ignoré : paramètres différents")
+                self.clear_build_checkpoint(db_name)
+                return None
+            index = faiss.read_index(index_path)
+            if index.ntotal != len(data.get('documents', [])):
+                print(f"Point de contrôle de '{db_name}' ignoré : index incohérent")
+                self.clear_build_checkpoint(db_name)
+                return None
+            return index, data
+        except Exception as e:
+            print(f"Impossible de charger le point de contrôle de '{db_name}': {e}")
+            return None
+    
+    def clear_build_checkpoint(self, db_name):
+        """Supprime le point de contrôle d'une construction terminée ou obsolète"""
+        for path in self.get_checkpoint_paths(db_name):
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def chunk_document(self, text, chunk_size, timings=None):
+        """
+        Divise un document en chunks contigus.
+        Sans horodatage, le texte est découpé tous les chunk_size caractères. Avec horodatage,
+        les segments sont regroupés par fenêtre temporelle ([Database] time_window, en secondes)
+        sans dépasser chunk_size caractères ni couper un segment ; un segment plus long que
+        chunk_size forme à lui seul un chunk.
+        
+        Args:
+            text: Texte du document
+            chunk_size: Taille maximale des chunks en caractères
+            timings: Horodatages des segments de la transcription (ou None)
+            
+        Returns:
+            list: Liste de dictionnaires {'text', 'start'} ('start' en secondes ou None)
+        """
+        if not timings:
+            return [{'text': text[i:i+chunk_size], 'start': None} for i in range(0, len(text), chunk_size)]
+        
+        time_window = self.config.getfloat('Database', 'time_window', fallback=60.0)
+        starts = timings['starts']
+        offsets = timings['offsets']
+        
+        chunks = []
+        first = 0
+        for i in range(1, len(starts) + 1):
+            # Le premier chunk inclut un éventuel texte avant le premier segment
+            begin = 0 if first == 0 else offsets[first]
+            if i < len(starts):
+                window_full = starts[i] - starts[first] >= time_window
+                # Le segment i ferait dépasser chunk_size : le chunk se termine avant lui
+                segment_end = offsets[i + 1] if i + 1 < len(starts) else len(text)
+                size_full = segment_end - begin > chunk_size
+                if not (window_full or size_full):
+                    continue
+            end = offsets[i] if i < len(starts) else len(text)
+            chunks.append({'text': text[begin:end], 'start': starts[first]})
+            first = i
+        return chunks
+    
+    def build_chunk_metadata(self, filename, chunk_index, source_folder, chunk, timings=None):
+        """
+        Construit les métadonnées d'un chunk
+        
+        Args:
+            filename: Nom du fichier source
+            chunk_index: Position du chunk dans son fichier
+            source_folder: Dossier source
+            chunk: Chunk retourné par chunk_document
+            timings: Horodatages de la transcription (ou None)
+            
+        Returns:
+            dict: Métadonnées du chunk
+        """
+        metadata = {'filename': filename, 'chunk_index': chunk_index, 'source_folder': source_folder}
+        if timings and chunk.get('start') is not None:
+            metadata['video_id'] = timings.get('video_id') or os.path.splitext(filename)[0]
+            metadata['start'] = chunk['start']
+        return metadata
+    
+    def enrich_vector_database(self, db_name, source_folder, output_widget, chunk_size=500,
+                               cancel_event=None, progress_callback=None):
+        """
+        Enrichit une base de données vectorielle existante avec de nouveaux documents.
+        
+        Args:
+            db_name: Nom de la base de données à enrichir
+            source_folder: Dossier contenant les nouveaux fichiers
+            output_widget: Widget pour afficher les sorties
+            chunk_size: Taille des chunks de texte
+            cancel_event: threading.Event permettant d'annuler l'enrichissement
+            progress_callback: Fonction de suivi de la progression (voir run_build_pipeline)
+            
+        Returns:
+            int: Nombre de segments ajoutés à la base
+        """
+        try:
+            # Vérifier que la base existe
+            database_folder = self.config.get('Directories', 'database', fallback='5_database')
+            db_path = os.path.join(database_folder, f'{db_name}.pkl')
+            index_path = os.path.join(database_folder, f'faiss_index_{db_name}.bin')
+            
+            if not os.path.exists(db_path) or not os.path.exists(index_path):
+                self.write_output(output_widget, f"Erreur : La base de données '{db_name}' n'existe pas.\n")
+                return 0
+            
+            # Charger le point de contrôle d'un enrichissement interrompu, sinon la base existante
+            resumed = self.load_build_checkpoint(db_name, source_folder, chunk_size, 'enrich')
+            if resumed:
+                index, data = resumed
+                self.write_output(output_widget, f"Reprise de l'enrichissement depuis le dernier point de contrôle ({len(data['documents'])} segments).\n")
+            else:
+                index = faiss.read_index(index_path)
+                with open(db_path, 'rb') as f:
+                    data = pickle.load(f)
+                data.setdefault('filenames', [])
+                data.setdefault('documents', [])
+                data.setdefault('metadata', [])
+            data.update({'checkpoint_mode': 'enrich', 'checkpoint_source': source_folder, 'checkpoint_chunk_size': chunk_size})
+            
+            # Créer un ensemble des noms de fichiers déjà présents dans la base pour une recherche rapide
+            existing_filenames = set()
+            if 'filenames' in data:
+                existing_filenames = set(data['filenames'])
+            
+            # Charger le modèle de transformation
+            model_name = 'sentence-transformers/all-MiniLM-L6-v2'
+            try:
+                model = SentenceTransformer(model_name)
+                print(f"Modèle {model_name} chargé avec succès pour l'enrichissement")
+            except Exception as e:
+                import logging
+                logging.getLogger('BlowChatYT').error(f"Erreur lors de l'initialisation du service d'embeddings pour l'enrichissement: {e}")
+                self.write_output(output_widget, f"Erreur : Impossible de charger le modèle de transformation. Vérifiez votre connexion internet et votre token Hugging Face.\n")
+                return 0
+                
+            skipped_files = []
+            source_files = []
+            # Seuls les fichiers pris en charge sont listés, en clair ou compressés
+            for filename in storage.list_files(source_folder, SUPPORTED_EXTENSIONS):
+                # Vérifier si le fichier est déjà dans la base (par le nom)
+                if filename in existing_filenames:
+                    skipped_files.append(filename)
+                    continue  # Ignorer les fichiers déjà présents
+                source_files.append(filename)
+            
+            # Afficher les fichiers ignorés
+            if skipped_files:
+                ignored_msg = f"Les fichiers suivants étaient déjà présents dans la base et ont été ignorés : {', '.join(skipped_files)}"
+                self.write_output(output_widget, f"{ignored_msg}\n")
+            
+            # Lecture, extraction, découpage, encodage et ajout à l'index existant en pipeline
+            self.write_output(output_widget, f"Traitement de {len(source_files)} nouveaux fichiers...\n")
+            result = self.run_build_pipeline(source_folder, source_files, chunk_size, model, index=index,
+                                             track_added_date=True, cancel_event=cancel_event,
+                                             checkpoint=(db_name, data), progress_callback=progress_callback)
+            new_documents = result['documents']
+            new_filenames = result['filenames']
+            new_metadata = result['metadata']
+            
+            # Vérifier qu'il y a des documents à ajouter
+            if not new_documents and not resumed:
+                self.write_output(output_widget, f"Aucun nouveau document à ajouter depuis '{source_folder}'.\n")
+                # Ajout d'un saut de ligne pour séparer ce bloc d'action
+                self.write_output(output_widget, "\n")
+                return 0
+            
+            # Mettre à jour les métadonnées
+            if 'filenames' in data:
+                data['filenames'].extend(new_filenames)
+            else:
+                data['filenames'] = new_filenames
+                
+            if 'documents' in data:
+                data['documents'].extend(new_documents)
+            else:
+                data['documents'] = new_documents
+                
+            if 'metadata' in data:
+                data['metadata'].extend(new_metadata)
+            else:
+                data['metadata'] = new_metadata
+            
+            # Reconstruire l'index d'adjacence des chunks
+            data['adjacency'], data['chunk_positions'] = self.build_chunk_adjacency(data['filenames'])
+            
+            # Mettre à jour les informations de la base
+            data['last_modified'] = os.path.getmtime(db_path) if os.path.exists(db_path) else None
+            data['num_documents'] = len(data['documents']) if 'documents' in data else len(new_documents)
+            
+            # Ajouter les sources
+            if 'sources' not in data:
+                data['sources'] = []
+            
+            if source_folder not in data['sources']:
+                data['sources'].append(source_folder)
+            
+            # Empreintes des fichiers ajoutés pour la synchronisation automatique
+            data.setdefault('file_signatures', {}).update(
+                self.get_file_signatures(source_folder, set(new_filenames), with_digest=True))
+            
+            # Sauvegarder l'index et les métadonnées mis à jour
+            for key in ('checkpoint_mode', 'checkpoint_source', 'checkpoint_chunk_size'):
+                data.pop(key, None)
+            self.save_vector_database(db_name, index, data)
+            self.clear_build_checkpoint(db_name)
+            
+            self.write_output(output_widget, f"Base de données '{db_name}' enrichie avec {len(new_documents)} nouveaux segments.\n")
+            for line in result['report']:
+                self.write_output(output_widget, f"{line}\n")
+            
+            # Ajout d'un saut de ligne pour séparer ce bloc d'action
+            self.write_output(output_widget, "\n")
+            return len(new_documents)
+        except PipelineCancelled:
+            # L'annulation est gérée par l'appelant ; le point de contrôle permet de reprendre
+            raise
+        except Exception as e:
+            self.write_output(output_widget, f"Erreur lors de l'enrichissement de la base : {e}\n")
+            # Ajout d'un saut de ligne pour séparer ce bloc d'action même en cas d'erreur
+            self.write_output(output_widget, "\n")
+            return 0
+    
+    def save_vector_database(self, db_name, index, data):
+        """
+        Enregistre l'index et les métadonnées d'une base de façon atomique : les deux fichiers
+        sont écrits à côté puis mis en place ensemble, un lecteur ne voit jamais une base à moitié écrite
+        
+        Args:
+            db_name: Nom de la base de données
+            index: Index FAISS à enregistrer
+            data: Données de la base (documents, noms de fichiers, métadonnées...)
+        """
+        database_folder = self.config.get('Directories', 'database', fallback='5_database')
+        if not os.path.exists(database_folder):
+            os.makedirs(database_folder)
+        
+        index_path = os.path.join(database_folder, f'faiss_index_{db_name}.bin')
+        db_path = os.path.join(database_folder, f'{db_name}.pkl')
+        
+        faiss.write_index(index, f'{index_path}.tmp')
+        with open(f'{db_path}.tmp', 'wb') as f:
+            pickle.dump(data, f)
+        with self.database_lock:
+            os.replace(f'{index_path}.tmp', index_path)
+            os.replace(f'{db_path}.tmp', db_path)
+    
+    def get_file_signatures(self, source_folder, filenames, with_digest=False):
+        """
+        Relève la taille, la date de modification et éventuellement l'empreinte des fichiers d'une base
+        
+        Args:
+            source_folder: Dossier contenant les fichiers
+            filenames: Noms des fichiers
+            with_digest: Calculer l'empreinte SHA-256 du contenu (sinon 'digest' vaut None)
+            
+        Returns:
+            dict: {nom du fichier: {'size', 'mtime', 'digest', 'timings'}}, 'timings' valant
+                  (taille, date de modification) du fichier d'horodatage d'une transcription ou None
+        """
+        signatures = {}
+        for filename in filenames:
+            filepath = os.path.join(source_folder, filename)
+            real_path = storage.stored_path(filepath)
+            if real_path is not None:
+                stat = os.stat(real_path)
+                timings_path = storage.stored_path(self.get_timings_path(filepath)) if filename.endswith('.txt') else None
+                timings_stat = os.stat(timings_path) if timings_path is not None else None
+                signatures[filename] = {
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime_ns,
+                    'digest': file_hash(filepath) if with_digest else None,
+                    'timings': (timings_stat.st_size, timings_stat.st_mtime_ns) if timings_stat else None
+                }
+        return signatures
+    
+    def sync_vector_database(self, db_name, source_folder, filenames=None, cancel_event=None):
+        """
+        Synchronise une base avec son dossier source : ajoute les nouveaux fichiers, réindexe
+        les fichiers modifiés (ou dont les horodatages ont changé) et retire les fichiers
+        supprimés du dossier. La nouvelle base est construite à côté de l'ancienne,
+        enregistrée de façon atomique puis échangée avec la base active si c'est elle.
+        
+        Args:
+            db_name: Nom de la base de données
+            source_folder: Dossier source surveillé
+            filenames: Fichiers à examiner (None = tous les fichiers du dossier)
+            cancel_event: threading.Event permettant d'annuler la synchronisation
+            
+        Returns:
+            dict: 'added', 'updated' et 'removed' (noms des fichiers), 'chunks_added' et 'chunks_removed'
+        """
+        with self.database_write_lock:
+            database_folder = self.config.get('Directories', 'database', fallback='5_database')
+            db_path = os.path.join(database_folder, f'{db_name}.pkl')
+            index_path = os.path.join(database_folder, f'faiss_index_{db_name}.bin')
+            if not os.path.exists(db_path) or not os.path.exists(index_path):
+                raise FileNotFoundError(f"La base de données '{db_name}' n'existe pas")
+            
+            with self.database_lock:
+                with open(db_path, 'rb') as f:
+                    data = pickle.load(f)
+                index = faiss.read_index(index_path)
+            
+            # Noms logiques des fichiers pris en charge, en clair ou compressés
+            present = storage.list_files(source_folder, SUPPORTED_EXTENSIONS)
+            requested = None
+            if filenames is not None:
+                requested = {storage.logical_name(filename) for filename in filenames}
+            candidates = [filename for filename in present if requested is None or filename in requested]
+            
+            # Fichiers de ce dossier indexés dans la base mais supprimés depuis
+            folder = os.path.normpath(source_folder)
+            indexed = {metadata.get('filename') for metadata in data.get('metadata', [])
+                       if os.path.normpath(metadata.get('source_folder', '')) == folder}
+            removed = indexed - set(present)
+            if requested is not None:
+                removed &= requested
+            removed = sorted(removed)
+            
+            # Comparer chaque fichier à son empreinte enregistrée (taille, date et horodatages, puis contenu)
+            existing_filenames = set(data.get('filenames', []))
+            stored_signatures = data.setdefault('file_signatures', {})
+            added, updated = [], []
+            signatures_changed = False
+            for filename, signature in self.get_file_signatures(source_folder, candidates).items():
+                stored = stored_signatures.get(filename)
+                if filename not in existing_filenames:
+                    signature['digest'] = file_hash(os.path.join(source_folder, filename))
+                    added.append(filename)
+                    stored_signatures[filename] = signature
+                    continue
+                if stored is None:
+                    # Base antérieure aux empreintes : l'état actuel sert de référence
+                    signature['digest'] = file_hash(os.path.join(source_folder, filename))
+                    stored_signatures[filename] = signature
+                    signatures_changed = True
+                    continue
+                if 'timings' not in stored:
+                    # Empreinte antérieure au suivi des horodatages : ceux présents servent de référence
+                    stored['timings'] = signature['timings']
+                    signatures_changed = True
+                timings_changed = stored['timings'] != signature['timings']
+                if stored['size'] == signature['size'] and stored['mtime'] == signature['mtime'] and not timings_changed:
+                    continue
+                signature['digest'] = file_hash(os.path.join(source_folder, filename))
+                if signature['digest'] == stored.get('digest') and not timings_changed:
+                    # Fichier touché mais contenu identique
+                    stored_signatures[filename] = signature
+                    signatures_changed = True
+                    continue
+                updated.append(filename)
+                stored_signatures[filename] = signature
+            for filename in removed:
+                stored_signatures.pop(filename, None)
+            
+            summary = {'added': added, 'updated': updated, 'removed': removed, 'chunks_added': 0, 'chunks_removed': 0}
+            if not added and not updated and not removed:
+                if signatures_changed:
+                    self.save_vector_database(db_name, index, data)
+                return summary
+            
+            # Retirer les chunks des fichiers modifiés ou supprimés en reconstruisant l'index sans eux
+            if updated or removed:
+                dropped = set(updated) | set(removed)
+                keep = [i for i, filename in enumerate(data['filenames']) if filename not in dropped]
+                summary['chunks_removed'] = len(data['filenames']) - len(keep)
+                new_index = faiss.IndexFlatL2(index.d)
+                if keep:
+                    new_index.add(index.reconstruct_n(0, index.ntotal)[keep])
+                index = new_index
+                for key in ('filenames', 'documents', 'metadata'):
+                    data[key] = [data[key][i] for i in keep]
+            
+            if added or updated:
+                # Charger le modèle de transformation
+                model_name = 'sentence-transformers/all-MiniLM-L6-v2'
+                try:
+                    model = SentenceTransformer(model_name)
+                except Exception as e:
+                    raise ValueError(f"Impossible de charger le modèle {model_name}. Veuillez vérifier votre connexion internet et votre token Hugging Face. Erreur: {e}")
+                
+                chunk_size = data.get('chunk_size', 500)
+                result = self.run_build_pipeline(source_folder, added + updated, chunk_size, model, index=index,
+                                                 track_added_date=True, cancel_event=cancel_event)
+                index = result['index']
+                data['filenames'].extend(result['filenames'])
+                data['documents'].extend(result['documents'])
+                data['metadata'].extend(result['metadata'])
+                summary['chunks_added'] = len(result['documents'])
+            
+            # Reconstruire l'index d'adjacence et les informations de la base
+            data['adjacency'], data['chunk_positions'] = self.build_chunk_adjacency(data['filenames'])
+            data['last_modified'] = os.path.getmtime(db_path)
+            data['num_documents'] = len(data['documents'])
+            data.setdefault('sources', [])
+            if source_folder not in data['sources']:
+                data['sources'].append(source_folder)
+            
+            self.save_vector_database(db_name, index, data)
+            
+            # Échanger la base active si c'est celle qui vient d'être synchronisée
+            if self.get_active_database()[0] == db_name:
+                self.set_active_database(db_name, index, data)
+            return summary
+    
+    def start_database_watcher(self, on_synced=None):
+        """
+        Démarre la surveillance du dossier source configuré ([Database] watch_*) et
+        enrichit automatiquement la base associée en arrière-plan
+        
+        Args:
+            on_synced: Fonction on_synced(résumé) appelée (dans le thread de surveillance)
+                       après chaque synchronisation qui a modifié la base
+            
+        Returns:
+            FolderWatcher: Surveillance démarrée, ou None si elle est désactivée
+        """
+        if not self.config.getboolean('Database', 'watch_enabled', fallback=False):
+            return None
+        db_name = self.config.get('Database', 'watch_database', fallback='').strip()
+        source_folder = self.config.get('Database', 'watch_folder', fallback='3_transcriptions').strip()
+        if not db_name or not os.path.isdir(source_folder):
+            print(f"Surveillance désactivée : base '{db_name}' ou dossier '{source_folder}' invalide")
+            return None
+        
+        def on_change(filenames):
+            summary = self.sync_vector_database(db_name, source_folder, filenames,
+                                                cancel_event=watcher.stop_event)
+            if summary['added'] or summary['updated'] or summary['removed']:
+                print(f"Base '{db_name}' synchronisée : {len(summary['added'])} fichiers ajoutés, "
+                      f"{len(summary['updated'])} modifiés, {len(summary['removed'])} supprimés")
+                if on_synced:
+                    on_synced(summary)
+        
+        watcher = FolderWatcher(
+            source_folder,
+            on_change,
+            interval=self.config.getfloat('Database', 'watch_interval', fallback=5.0),
+            debounce=self.config.getfloat('Database', 'watch_debounce', fallback=10.0)
+        )
+        self.database_watcher = watcher
+        watcher.start()
+        print(f"Surveillance du dossier '{source_folder}' pour la base '{db_name}'")
+        return watcher
+    
+    def stop_database_watcher(self):
+        """Arrête la surveillance du dossier source si elle est active"""
+        if self.database_watcher is not None:
+            self.database_watcher.stop()
+            self.database_watcher = None
+    
+    def init_llm_backend(self):
+        """
+        (Re)construit le moteur de génération des réponses selon [Model] backend : 'groq'
+        (service Groq) ou 'fake' (modèle local simulé, sans réseau ni clé API, dont le délai
+        avant le premier token, le débit et les erreurs sont configurables)
+        
+        Returns:
+            str: Moteur utilisé
+        """
+        name = self.config.get('Model', 'backend', fallback='groq').strip().lower()
+        if name not in LLM_BACKENDS:
+            print(f"Moteur de génération inconnu '{name}', utilisation du moteur 'groq'")
+            name = 'groq'
+        
+        if self.llm_backend is not None:
+            self.llm_backend.close()
+        if name == 'fake':
+            self.llm_backend = FakeBackend(
+                ttft=self.config.getfloat('Model', 'fake_ttft', fallback=0.3),
+                tokens_per_second=self.config.getfloat('Model', 'fake_tokens_per_second', fallback=50.0),
+                answer_tokens=self.config.getint('Model', 'fake_answer_tokens', fallback=200),
+                error_rate=self.config.getfloat('Model', 'fake_error_rate', fallback=0.0),
+                error_after=self.config.getint('Model', 'fake_error_after', fallback=0),
+                seed=self.config.getint('Model', 'fake_seed', fallback=0)
+            )
+        else:
+            self.llm_backend = GroqClientPool(pool_size=self.config.getint('Model', 'http_pool_size', fallback=10))
+        self.llm_backend_name = name
+        return name
+    
+    def init_youtube_transport(self):
+        """
+        (Re)construit le transport de l'API YouTube Data et la source des transcriptions selon
+        [YouTube] transport : 'live' (réseau), 'record' (réseau, réponses enregistrées dans
+        cassette_folder), 'replay' (réponses enregistrées rejouées sans réseau) ou 'synthetic'
+        (chaîne générée localement, de taille et de latence configurables)
+        
+        Returns:
+            str: Mode de transport utilisé
+        """
+        mode = self.config.get('YouTube', 'transport', fallback='live').strip().lower()
+        if mode not in TRANSPORT_MODES:
+            print(f"Transport YouTube inconnu '{mode}', utilisation du transport 'live'")
+            mode = 'live'
+        cassette_folder = self.config.get('YouTube', 'cassette_folder', fallback='5_database/cassettes')
+        
+        if mode == 'synthetic':
+            channel = SyntheticChannel(
+                num_videos=self.config.getint('YouTube', 'synthetic_videos', fallback=500),
+                latency=self.config.getfloat('YouTube', 'synthetic_latency', fallback=0.05),
+                segments=self.config.getint('YouTube', 'synthetic_segments', fallback=120),
+                missing_ratio=self.config.getfloat('YouTube', 'synthetic_missing_ratio', fallback=0.0),
+                seed=self.config.getint('YouTube', 'synthetic_seed', fallback=0)
+            )
+            http, transcript_source = channel, channel
+        elif mode == 'replay':
+            latency = self.config.getfloat('YouTube', 'replay_latency', fallback=0.0)
+            cassette = Cassette(cassette_folder)
+            http, transcript_source = ReplayHttp(cassette, latency), ReplayTranscriptSource(cassette, latency)
+        else:
+            http = PooledHttp(pool_size=self.config.getint('YouTube', 'http_pool_size', fallback=10))
+            transcript_source = LiveTranscriptSource()
+            if mode == 'record':
+                cassette = Cassette(cassette_folder)
+                http = RecordingHttp(http, cassette)
+                transcript_source = RecordingTranscriptSource(transcript_source, cassette)
+        
+        if self.youtube_clients is not None:
+            self.youtube_clients.close()
+        # Clients de l'API YouTube (un par clé, construits à la demande sans accès réseau)
+        database_folder = self.config.get('Directories', 'database', fallback='5_database')
+        self.youtube_clients = YouTubeClientPool(os.path.join(database_folder, 'discovery_cache'), http)
+        self.transcript_source = transcript_source
+        self.youtube_transport = mode
+        if mode != 'live':
+            print(f"Transport YouTube : {mode}")
+        return mode
+    
+    def get_youtube_client(self, api_key):
+        """
+        Retourne le client de l'API YouTube associé à une clé (réutilisé d'un appel à l'autre)
+        
+        Args:
+            api_key: Clé API YouTube
+            
+        Returns:
+            Resource: Client de l'API YouTube Data v3
+        """
+        return self.youtube_clients.get(api_key)
+    
+    def get_videos_youtube(self, channel_name, api_key, num_videos, output_widget):
+        """
+        Récupère les vidéos d'une chaîne YouTube qui n'ont pas encore été récupérées.
+        L'état de synchronisation de la chaîne évite de réinterroger l'API pour les vidéos déjà connues.
+        
+        Args:
+            channel_name: Nom ou ID de la chaîne YouTube
+            api_key: Clé API YouTube
+            num_videos: Nombre de vidéos récentes à couvrir
+            output_widget: Widget pour afficher les sorties
+            
+        Returns:
+            list: Liste des vidéos à traiter (sans celles déjà récupérées)
+        """
+        state, requested_ids = self.list_channel_video_ids(channel_name, api_key, num_videos, output_widget)
+        
+        # Ne garder que les vidéos de la plage demandée qui n'ont pas encore été récupérées
+        video_ids = [video_id for video_id in requested_ids if not self.is_video_ingested(video_id, state)]
+        self.log_info(f"Nombre de vidéos trouvées : {len(requested_ids)}, dont {len(video_ids)} à récupérer", output_widget)
+        
+        # Obtenir les détails et statistiques des vidéos
+        return self.get_video_details(self.get_youtube_client(api_key), video_ids)
+    
+    def list_channel_video_ids(self, channel_name, api_key, num_videos, output_widget=None):
+        """
+        Liste les IDs des vidéos les plus récentes d'une chaîne et met à jour son état de synchronisation
+        
+        Args:
+            channel_name: Nom ou ID de la chaîne YouTube
+            api_key: Clé API YouTube
+            num_videos: Nombre de vidéos récentes à couvrir
+            output_widget: Widget pour afficher les sorties
+            
+        Returns:
+            tuple: (état de synchronisation de la chaîne, IDs des vidéos de la plus récente à la plus ancienne)
+        """
+        youtube = self.get_youtube_client(api_key)
+        
+        # Chaîne déjà synchronisée : ID et playlist des uploads connus
+        aliases = self.load_channel_aliases()
+        state = self.load_channel_sync_state(aliases.get(channel_name, channel_name))
+        
+        if state:
+            channel_id = state['channel_id']
+            uploads_playlist_id = state['uploads_playlist_id']
+            self.log_info(f"Chaîne connue : {channel_id} (dernière synchronisation {state.get('last_synced', 'inconnue')})", output_widget)
+        else:
+            # Obtenir l'ID du channel à partir du nom ou de l'ID
+            if re.match(r'^UC[a-zA-Z0-9_-]{22}$', channel_name):
+                # C'est déjà un ID de chaîne
+                channel_id = channel_name
+                self.log_info(f"Utilisation de l'ID de chaîne fourni : {channel_id}", output_widget)
+            else:
+                # Rechercher l'ID à partir du nom
+                request = youtube.search().list(
+                    part="snippet",
+                    q=channel_name,
+                    type="channel",
+                    maxResults=1
+                )
+                response = self.youtube_quota.execute(request, 'search.list')
+                
+                if not response['items']:
+                    raise Exception(f"Channel non trouvé pour le nom {channel_name}")
+                
+                channel_id = response['items'][0]['id']['channelId']
+                self.log_info(f"ID de chaîne trouvé : {channel_id}", output_widget)
+            
+            # Obtenir l'ID de la playlist des uploads
+            uploads_playlist_id = self.get_channel_uploads_playlist_id(channel_id, api_key)
+            self.log_info(f"ID de playlist d'uploads : {uploads_playlist_id}", output_widget)
+            
+            state = self.load_channel_sync_state(channel_id) or {
+                'channel_id': channel_id,
+                'uploads_playlist_id': uploads_playlist_id,
+                'seen': [],
+                'seen_complete': False,
+                'ingested': []
+            }
+            if channel_name != channel_id:
+                aliases[channel_name] = channel_id
+                self.save_channel_aliases(aliases)
+        
+        # Parcourir les uploads (du plus récent au plus ancien) jusqu'aux vidéos déjà connues
+        seen = state['seen']
+        known_head = seen[0] if seen else None
+        new_ids = []
+        reached_known = False
+        complete = False
+        for item, is_last in self.iter_playlist_items(uploads_playlist_id, api_key):
+            video_id = item['contentDetails']['videoId']
+            if video_id == known_head:
+                reached_known = True
+                break
+            new_ids.append(video_id)
+            complete = is_last
+            if len(new_ids) >= num_videos:
+                break
+        
+        if reached_known:
+            playlist_ids = new_ids + seen
+            complete = state.get('seen_complete', False)
+            self.log_info(f"{len(new_ids)} nouvelles vidéos depuis la dernière synchronisation", output_widget)
+            if len(playlist_ids) < num_videos and not complete:
+                # La plage demandée dépasse celle déjà parcourue : reprendre sans arrêt anticipé
+                playlist_ids = [item['contentDetails']['videoId']
+                                for item, _ in self.iter_playlist_items(uploads_playlist_id, api_key, max_videos=num_videos)]
+                complete = len(playlist_ids) < num_videos
+        else:
+            playlist_ids = new_ids
+        
+        state['seen'] = playlist_ids
+        state['seen_complete'] = complete
+        state['last_seen_video_id'] = playlist_ids[0] if playlist_ids else None
+        state['last_synced'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        self.save_channel_sync_state(state)
+        return state, playlist_ids[:num_videos]
+    
+    def get_channel_sync_folder(self):
+        """Retourne le dossier des états de synchronisation des chaînes"""
+        database_folder = self.config.get('Directories', 'database', fallback='5_database')
+        return os.path.join(database_folder, 'channel_sync')
+    
+    def load_channel_aliases(self):
+        """
+        Charge la correspondance nom de chaîne saisi -> ID de chaîne
+        
+        Returns:
+            dict: {nom saisi: ID de chaîne}
+        """
+        aliases_path = os.path.join(self.get_channel_sync_folder(), 'aliases.json')
+        if not os.path.exists(aliases_path):
+            return {}
+        try:
+            with open(aliases_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Correspondances des chaînes illisibles, elles seront recréées : {e}")
+            return {}
+    
+    def save_channel_aliases(self, aliases):
+        """Enregistre la correspondance nom de chaîne saisi -> ID de chaîne"""
+        self.write_json_atomic(os.path.join(self.get_channel_sync_folder(), 'aliases.json'), aliases)
+    
+    def load_channel_sync_state(self, channel_id):
+        """
+        Charge l'état de synchronisation d'une chaîne
+        
+        Args:
+            channel_id: ID de la chaîne YouTube
+            
+        Returns:
+            dict: État ('channel_id', 'uploads_playlist_id', 'seen' (IDs des uploads du plus récent
+                  au plus ancien), 'seen_complete', 'last_seen_video_id', 'ingested', 'last_synced')
+                  ou None si la chaîne n'a jamais été synchronisée
+        """
+        state_path = os.path.join(self.get_channel_sync_folder(), f"{self.clean_filename(channel_id)}.json")
+        if not os.path.exists(state_path):
+            return None
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"État de synchronisation illisible pour {channel_id}, resynchronisation complète : {e}")
+            return None
+    
+    def save_channel_sync_state(self, state):
+        """
+        Enregistre l'état de synchronisation d'une chaîne
+        
+        Args:
+            state: État de synchronisation (voir load_channel_sync_state)
+        """
+        with self.channel_sync_lock:
+            state_path = os.path.join(self.get_channel_sync_folder(), f"{self.clean_filename(state['channel_id'])}.json")
+            self.write_json_atomic(state_path, state)
+    
+    def write_json_atomic(self, path, content):
+        """
+        Écrit un fichier JSON via un fichier temporaire (jamais de fichier à moitié écrit)
+        
+        Args:
+            path: Chemin du fichier
+            content: Contenu sérialisable en JSON
+        """
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(content, f, ensure_ascii=False, indent=2)
+        os.replace(f"{path}.tmp", path)
+    
+    def is_video_ingested(self, video_id, state=None):
+        """
+        Indique si une vidéo a déjà été récupérée (état de la chaîne ou transcription et rapport présents)
+        
+        Args:
+            video_id: ID de la vidéo YouTube
+            state: État de synchronisation de la chaîne (optionnel)
+            
+        Returns:
+            bool: True si la vidéo n'a pas besoin d'être récupérée à nouveau
+        """
+        if state and video_id in state.get('ingested', []):
+            return True
+        transcriptions_folder = self.config.get('Directories', 'transcriptions', fallback='3_transcriptions')
+        markdown_folder = self.config.get('Directories', 'markdown_reports', fallback='4_markdown_reports')
+        return (storage.exists(os.path.join(transcriptions_folder, f"{video_id}.txt"))
+                and storage.exists(os.path.join(markdown_folder, f"{video_id}_report.md")))
+    
+    def record_ingested_video(self, video):
+        """
+        Ajoute une vidéo récupérée à l'état de synchronisation de sa chaîne
+        
+        Args:
+            video: Données de la vidéo (snippet.channelId identifie la chaîne)
+        """
+        channel_id = video.get('snippet', {}).get('channelId')
+        if not channel_id:
+            return
+        with self.channel_sync_lock:
+            state = self.load_channel_sync_state(channel_id)
+            if state is None:
+                return
+            if video['id'] not in state['ingested']:
+                state['ingested'].append(video['id'])
+            state_path = os.path.join(self.get_channel_sync_folder(), f"{self.clean_filename(channel_id)}.json")
+            self.write_json_atomic(state_path, state)
+    
+    def get_video_details(self, youtube, video_ids):
+        """
+        Récupère les détails et statistiques de vidéos par lots de 50 IDs
+        
+        Args:
+            youtube: Client de l'API YouTube
+            video_ids: IDs des vidéos (sans doublons)
+            
+        Returns:
+            list: Vidéos trouvées, dans l'ordre des IDs demandés
+        """
+        found = {}
+        for i in range(0, len(video_ids), 50):  # L'API permet max 50 vidéos par requête
+            batch_ids = video_ids[i:i+50]
+            stats_request = youtube.videos().list(
+                part="snippet,statistics",
+                id=','.join(batch_ids),
+                maxResults=50
+            )
+            stats_response = self.youtube_quota.execute(stats_request, 'videos.list')
+            for item in stats_response.get('items', []):
+                found[item['id']] = item
+        return [found[video_id] for video_id in video_ids if video_id in found]
+    
+    def get_channel_uploads_playlist_id(self, channel_id, api_key):
+        """
+        Récupère l'ID de la playlist des uploads d'une chaîne
+        
+        Args:
+            channel_id: ID de la chaîne YouTube
+            api_key: Clé API YouTube
+            
+        Returns:
+            str: ID de la playlist des uploads
+        """
+        youtube = self.get_youtube_client(api_key)
+        request = youtube.channels().list(
+            part="contentDetails",
+            id=channel_id
+        )
+        response = self.youtube_quota.execute(request, 'channels.list')
+        
+        if not response['items']:
+            raise Exception(f"Chaîne introuvable pour l'ID {channel_id}")
+            
+        uploads_playlist_id = response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
+        return uploads_playlist_id
+    
+    def get_videos_from_playlist(self, playlist_id, api_key, max_videos=None):
+        """
+        Récupère les vidéos d'une playlist YouTube
+        
+        Args:
+            playlist_id: ID de la playlist YouTube
+            api_key: Clé API YouTube
+            max_videos: Nombre maximal de vidéos à récupérer
+            
+        Returns:
+            list: Liste des vidéos de la playlist
+        """
+        return [item for item, _ in self.iter_playlist_items(playlist_id, api_key, max_videos)]
+    
+    def iter_playlist_items(self, playlist_id, api_key, max_videos=None):
+        """
+        Parcourt les éléments d'une playlist page par page ; la page suivante n'est demandée
+        que si l'appelant continue l'itération
+        
+        Args:
+            playlist_id: ID de la playlist YouTube
+            api_key: Clé API YouTube
+            max_videos: Nombre maximal d'éléments à parcourir
+            
+        Yields:
+            tuple: (élément de la playlist, True s'il s'agit du dernier élément de la playlist)
+        """
+        youtube = self.get_youtube_client(api_key)
+        nextPageToken = None
+        count = 0
+        
+        while True:
+            request = youtube.playlistItems().list(
+                part="snippet,contentDetails",
+                playlistId=playlist_id,
+                maxResults=50,
+                pageToken=nextPageToken
+            )
+            response = self.youtube_quota.execute(request, 'playlistItems.list')
+            
+            nextPageToken = response.get('nextPageToken')
+            items = response['items']
+            for position, item in enumerate(items):
+                if max_videos and count >= max_videos:
+                    return
+                count += 1
+                yield item, not nextPageToken and position == len(items) - 1
+            
+            if not nextPageToken or (max_videos and count >= max_videos):
+                break
+    
+    def get_videos_by_ids(self, video_ids, api_key, output_widget):
+        """
+        Récupère des vidéos à partir de leurs IDs ou URLs : les doublons sont supprimés,
+        les détails sont demandés par lots de 50 et les vidéos introuvables sont signalées
+        
+        Args:
+            video_ids: Liste d'IDs ou URLs de vidéos YouTube
+            api_key: Clé API YouTube
+            output_widget: Widget pour afficher les sorties
+            
+        Returns:
+            list: Liste des vidéos récupérées
+        """
+        unique_ids = self.normalize_video_ids(video_ids, output_widget)
+        if not unique_ids:
+            return []
+        
+        # Une requête pour 50 vidéos au lieu d'une par vidéo
+        youtube = self.get_youtube_client(api_key)
+        videos = self.get_video_details(youtube, unique_ids)
+        for video_data in videos:
+            self.log_info(f"Vidéo trouvée : {video_data['snippet']['title']}", output_widget)
+        
+        # Signaler les vidéos absentes de la réponse (supprimées, privées ou ID erroné)
+        found_ids = {video_data['id'] for video_data in videos}
+        missing_ids = [video_id for video_id in unique_ids if video_id not in found_ids]
+        for video_id in missing_ids:
+            self.log_error(f"Vidéo non trouvée pour l'ID {video_id}", output_widget)
+        if missing_ids:
+            self.log_info(f"{len(videos)} vidéos trouvées, {len(missing_ids)} introuvables", output_widget)
+        
+        return videos
+    
+    def normalize_video_ids(self, video_ids, output_widget=None):
+        """
+        Extrait les IDs de vidéos d'une liste d'IDs ou d'URLs et supprime les doublons en gardant l'ordre
+        
+        Args:
+            video_ids: Liste d'IDs ou URLs de vidéos YouTube
+            output_widget: Widget pour afficher les sorties
+            
+        Returns:
+            list: IDs distincts des vidéos valides
+        """
+        unique_ids = []
+        seen = set()
+        for video_id in video_ids:
+            extracted_id = self.extract_video_id(video_id.strip())
+            if not extracted_id:
+                self.log_error(f"ID de vidéo invalide : {video_id}", output_widget)
+                continue
+            if extracted_id not in seen:
+                seen.add(extracted_id)
+                unique_ids.append(extracted_id)
+        
+        if len(unique_ids) < len(video_ids):
+            self.log_info(f"{len(unique_ids)} vidéos distinctes sur {len(video_ids)} entrées", output_widget)
+        return unique_ids
+    
+    def extract_video_id(self, url):
+        """
+        Extrait l'ID de la vidéo à partir d'une URL YouTube ou retourne l'ID si déjà donné
+        
+        Args:
+            url: URL YouTube ou ID de vidéo
+            
+        Returns:
+            str: ID de la vidéo ou None si non valide
+        """
+        # Si c'est déjà un ID de 11 caractères, on le retourne
+        url = url.strip()
+        if re.match(r'^[a-zA-Z0-9_-]{11}$', url):
+            return url
+        
+        # Sinon, on essaie de le récupérer à partir de l'URL
+        parsed_url = urlparse(url)
+        if parsed_url.hostname in ['www.youtube.com', 'youtube.com', 'm.youtube.com']:
+            if parsed_url.path == '/watch':
+                query = parse_qs(parsed_url.query)
+                if 'v' in query:
+                    return query['v'][0]
+            elif parsed_url.path.startswith(('/embed/', '/v/', '/shorts/', '/live/')):
+                return parsed_url.path.split('/')[2]
+        elif parsed_url.hostname == 'youtu.be':
+            return parsed_url.path[1:]
+        
+        return None
+    
+    def get_transcription(self, video_id, languages=['en', 'fr'], output_widget=None):
+        """
+        Récupère la transcription d'une vidéo YouTube via les sous-titres
+        
+        Args:
+            video_id: ID de la vidéo YouTube
+            languages: Liste des langues à essayer pour la transcription
+            output_widget: Widget pour afficher les sorties
+            
+        Returns:
+            str: Transcription de la vidéo ou None si non disponible
+        """
+        transcript, _ = self.get_transcription_with_timings(video_id, languages, output_widget)
+        return transcript
+    
+    def get_transcription_with_timings(self, video_id, languages=['en', 'fr'], output_widget=None):
+        """
+        Récupère la transcription d'une vidéo YouTube en conservant l'horodatage des segments
+        
+        Args:
+            video_id: ID de la vidéo YouTube
+            languages: Liste des langues à essayer pour la transcription
+            output_widget: Widget pour afficher les sorties
+            
+        Returns:
+            tuple: (transcription, timings) ou (None, None) si non disponible.
+                   timings contient les tableaux 'starts', 'durations' et 'offsets'
+                   (position de chaque segment dans le texte)
+        """
+        try:
+            transcript_list = self.transcript_source.get_transcript(video_id, languages)
+            transcript, timings = self.join_transcript_segments(transcript_list)
+            timings['video_id'] = video_id
+            self.log_info(f"Transcription récupérée pour la vidéo {video_id}", output_widget)
+            return transcript, timings
+        except Exception as e:
+            self.log_error(f"Impossible de récupérer la transcription pour la vidéo {video_id}: {e}", output_widget)
+            return None, None
+    
+    def join_transcript_segments(self, segments):
+        """
+        Assemble les segments d'une transcription en un seul texte
+        
+        Args:
+            segments: Liste de segments {'text', 'start', 'duration'} de la source des transcriptions
+            
+        Returns:
+            tuple: (texte, timings) avec les tableaux compacts 'starts', 'durations' et 'offsets'
+        """
+        texts = []
+        starts = []
+        durations = []
+        offsets = []
+        position = 0
+        for segment in segments:
+            # Même séparateur qu'auparavant : les segments sont joints par un espace
+            if texts:
+                position += 1
+            offsets.append(position)
+            starts.append(round(float(segment.get('start', 0.0)), 2))
+            durations.append(round(float(segment.get('duration', 0.0)), 2))
+            texts.append(segment['text'])
+            position += len(segment['text'])
+        
+        timings = {'starts': starts, 'durations': durations, 'offsets': offsets}
+        return " ".join(texts), timings
+    
+    def get_timings_path(self, transcription_path):
+        """Retourne le chemin du fichier d'horodatage associé à une transcription"""
+        return f"{os.path.splitext(storage.logical_name(transcription_path))[0]}.timings.json"
+    
+    def load_transcript_timings(self, transcription_path, text):
+        """
+        Charge les horodatages associés à une transcription s'ils existent et sont cohérents
+        
+        Args:
+            transcription_path: Chemin du fichier de transcription
+            text: Texte de la transcription
+            
+        Returns:
+            dict: Horodatages ou None si absents ou invalides
+        """
+        timings_path = self.get_timings_path(transcription_path)
+        if not storage.exists(timings_path):
+            return None
+        try:
+            timings = json.loads(storage.read_text(timings_path))
+            starts = timings.get('starts', [])
+            offsets = timings.get('offsets', [])
+            # Ignorer des horodatages qui ne correspondent plus au texte
+            if not starts or len(starts) != len(offsets) or offsets[-1] > len(text):
+                return None
+            return timings
+        except Exception as e:
+            print(f"Horodatages ignorés pour {transcription_path}: {e}")
+            return None
+    
+    def get_storage_compression(self):
+        """
+        Retourne le mode de stockage des transcriptions et des rapports ([YouTube] compression)
+        
+        Returns:
+            tuple: ('none' ou 'gzip', niveau de compression)
+        """
+        compression = self.config.get('YouTube', 'compression', fallback='none').strip().lower()
+        if compression not in storage.COMPRESSION_MODES:
+            print(f"Mode de compression inconnu '{compression}', stockage en clair")
+            compression = 'none'
+        return compression, self.config.getint('YouTube', 'compression_level', fallback=6)
+    
+    def compress_folder(self, folder, compression=None):
+        """
+        Convertit les transcriptions, horodatages et rapports existants d'un dossier vers le mode
+        de stockage demandé. Les dates de modification sont conservées et les empreintes ne
+        changent pas : les bases et la surveillance ne réindexent pas les fichiers convertis.
+        
+        Args:
+            folder: Dossier à convertir
+            compression: 'none' ou 'gzip' (None = [YouTube] compression)
+            
+        Returns:
+            dict: 'files' (nombre de fichiers convertis), 'bytes_before' et 'bytes_after'
+        """
+        default_compression, level = self.get_storage_compression()
+        compression = compression or default_compression
+        summary = {'files': 0, 'bytes_before': 0, 'bytes_after': 0}
+        for filename in storage.list_files(folder, ('.txt', '.md', '.json')):
+            sizes = storage.convert_file(os.path.join(folder, filename), compression, level)
+            if sizes:
+                summary['files'] += 1
+                summary['bytes_before'] += sizes[0]
+                summary['bytes_after'] += sizes[1]
+        print(f"{summary['files']} fichiers convertis dans '{folder}' : "
+              f"{summary['bytes_before']} -> {summary['bytes_after']} octets")
+        return summary
+    
+    def save_transcription(self, video_id, transcription, output_widget, timings=None):
+        """
+        Sauvegarde la transcription dans un fichier texte en UTF-8
+        
+        Args:
+            video_id: ID de la vidéo YouTube
+            transcription: Texte de la transcription
+            output_widget: Widget pour afficher les sorties
+            timings: Horodatages des segments (enregistrés dans un fichier .timings.json)
+        """
+        transcriptions_folder = self.config.get('Directories', 'transcriptions', fallback='3_transcriptions')
+        transcription_file = f"{transcriptions_folder}/{video_id}.txt"
+        compression, level = self.get_storage_compression()
+        # Horodatages écrits en premier et fichiers mis en place d'un bloc : la surveillance
+        # du dossier ne voit jamais une transcription incomplète
+        if timings:
+            timings_file = self.get_timings_path(transcription_file)
+            storage.write_text(timings_file, json.dumps(timings, separators=(',', ':')), compression, level)
+        saved_file = storage.write_text(transcription_file, transcription, compression, level)
+        self.log_info(f"Transcription sauvegardée dans {saved_file}", output_widget)
+    
+    def generate_markdown_report(self, video, transcription, stats, output_widget):
+        """
+        Génère un rapport markdown pour une vidéo
+        
+        Args:
+            video: Données de la vidéo
+            transcription: Texte de la transcription
+            stats: Statistiques de la vidéo
+            output_widget: Widget pour afficher les sorties
+        """
+        video_id = video['id']
+        report_content = f"# Rapport de la vidéo : {video['snippet']['title']}\n\n"
+        report_content += f"- **Date de publication** : {video['snippet']['publishedAt']}\n"
+        report_content += f"- **Description** : {video['snippet']['description']}\n"
+        report_content += f"- **Lien** : [https://www.youtube.com/watch?v={video_id}](https://www.youtube.com/watch?v={video_id})\n"
+        
+        # Ces statistiques peuvent ne pas être disponibles
+        if 'viewCount' in stats:
+            report_content += f"- **Vues** : {stats['viewCount']}\n"
+        
+        if 'likeCount' in stats:
+            report_content += f"- **Likes** : {stats['likeCount']}\n"
+        
+        if 'commentCount' in stats:
+            report_content += f"- **Commentaires** : {stats['commentCount']}\n"
+        
+        if 'shareCount' in stats:
+            report_content += f"- **Partages** : {stats['shareCount']}\n"
+        
+        # Ajouter un extrait de la transcription
+        if transcription:
+            excerpt = transcription[:500] + "..." if len(transcription) > 500 else transcription
+            report_content += f"- **Transcription (extrait)** :\n```\n{excerpt}\n```\n"
+        else:
+            report_content += "- **Transcription** : Non disponible\n"
+        
+        # Dossier des rapports markdown depuis la configuration
+        markdown_folder = self.config.get('Directories', 'markdown_reports', fallback='4_markdown_reports')
+        report_file = f"{markdown_folder}/{video_id}_report.md"
+        compression, level = self.get_storage_compression()
+        report_file = storage.write_text(report_file, report_content, compression, level)
+        
+        self.log_info(f"Rapport markdown généré : {report_file}", output_widget)
+    
+    def clean_filename(self, filename):
+        """
+        Nettoie un nom de fichier en supprimant les caractères non valides
+        
+        Args:
+            filename: Nom de fichier à nettoyer
+            
+        Returns:
+            str: Nom de fichier nettoyé
+        """
+        filename = filename.strip()
+        # Remplacer les caractères non valides par un underscore
+        return re.sub(r'[<>:"/\\|?*@]', '', filename).replace(' ', '_')
+    
+    def get_database_info(self, db_name):
+        """
+        Récupère les informations d'une base de données
+        
+        Args:
+            db_name: Nom de la base de données
+            
+        Returns:
+            dict: Informations sur la base de données
+        """
+        database_folder = self.config.get('Directories', 'database', fallback='5_database')
+        db_path = os.path.join(database_folder, f'{db_name}.pkl')
+        
+        if not os.path.exists(db_path):
+            return {
+                'name': db_name,
+                'error': 'Base de données non trouvée'
+            }
+        
+        try:
+            with open(db_path, 'rb') as f:
+                data = pickle.load(f)
+            
+            # Récupérer les informations de base
+            info = {
+                'name': db_name,
+                'creation_date': data.get('creation_date'),
+                'last_modified': data.get('last_modified'),
+                'source_folder': data.get('source_folder', 'Non spécifié'),
+                'chunk_size': data.get('chunk_size', 'Non spécifié'),
+                'num_documents': data.get('num_documents', len(data.get('documents', []))),
+                'num_sources': len(set(data.get('filenames', [])))
+            }
+            
+            return info
+        except Exception as e:
+            return {
+                'name': db_name,
+                'error': str(e)
+            }
+    
+    def verify_config_integrity(self):
+        """Vérifie l'intégrité de la configuration et tente de la réparer si nécessaire"""
+        try:
+            # Vérifier que toutes les sections requises existent
+            required_sections = ['API_KEYS', 'Appearance', 'Assistant', 'Directories', 'Model', 'Stream']
+            for section in required_sections:
+                if section not in self.config:
+                    print(f"Section manquante dans la configuration: {section}")
+                    self._create_default_config()
+                    return
+            
+            # Vérifier que les options d'apparence essentielles sont présentes
+            appearance_options = ['theme', 'font_size', 'color_system', 'color_user', 
+                                'color_model', 'color_model_name', 'color_user_name']
+            
+            for option in appearance_options:
+                if option not in self.config['Appearance']:
+                    print(f"Option d'apparence manquante: {option}")
+                    # Recréer uniquement les options d'apparence manquantes
+                    defaults = {
+                        'theme': 'blue',
+                        'font_size': '12',
+                        'color_system': '#0000FF',
+                        'color_user': '#008000',
+                        'color_model': '#FF0000',
+                        'color_model_name': '#800080',
+                        'color_user_name': '#FFA500'
+                    }
+                    self.config['Appearance'][option] = defaults[option]
+            
+            # Essayer d'écrire la configuration pour vérifier les permissions d'écriture
+            self.save_config()
+            
+            # Vérifier que le fichier a bien été créé
+            if not os.path.exists(self.config_file):
+                print("Le fichier de configuration n'a pas été créé malgré la tentative de sauvegarde")
+                # Essayer avec un chemin alternatif
+                user_dir = os.path.expanduser("~")
+                self.config_file = os.path.join(user_dir, "blow_chat_config.ini")
+                self.save_config()
+                
+        except Exception as e:
+            print(f"Erreur lors de la vérification de la configuration: {e}")
+            # Tenter une réparation d'urgence
+            self._create_default_config()
+        
+    def retrieve_context(self, query, top_k=5, max_context_length=3000):
+        """
+        Construit le contexte d'une question à partir de la base de données chargée
+        
+        Args:
+            query: Question de l'utilisateur
+            top_k: Nombre de segments à retrouver
+            max_context_length: Longueur maximale du contexte
+            
+        Returns:
+            str: Contexte à transmettre au modèle
+        """
+        _, index, data = self.get_active_database()
+        documents = self.search_documents(query, index, data, top_k=top_k, max_context_length=max_context_length)
+        return "\n".join(documents)
+    
+    def get_database_fingerprint(self):
+        """
+        Identifie la base active et son contenu
+        
+        Returns:
+            tuple: (nom, identifiant de l'index, nombre de vecteurs), ou None si aucune base n'est chargée
+        """
+        database_name, index, _ = self.get_active_database()
+        if index is None:
+            return None
+        return database_name, id(index), index.ntotal
+    
+    def prefetch_retrieval(self, draft):
+        """
+        Recherche le contexte d'un brouillon de question (voir RetrievalPrefetcher)
+        
+        Args:
+            draft: Texte en cours de saisie
+            
+        Returns:
+            tuple: (empreinte de la base interrogée, contexte)
+        """
+        database_key = self.get_database_fingerprint()
+        return database_key, self.retrieve_context(draft, top_k=5, max_context_length=3000)
+    
+    def build_system_prompt(self, context, assistant_name, assistant_role, assistant_objective):
+        """
+        Construit le message système à partir de la personnalité de l'assistant et du contexte
+        
+        Args:
+            context: Contexte issu de la base de données (chaîne vide si aucun)
+            assistant_name: Nom de l'assistant
+            assistant_role: Rôle de l'assistant
+            assistant_objective: Objectif de l'assistant
+            
+        Returns:
+            str: Message système
+        """
+        system_prompt = f"{assistant_name}. Tu es {assistant_role}. Ton objectif est : {assistant_objective}."
+        
+        # Ajouter le nom de la base de données si elle est chargée
+        if self.current_database_name and context:
+            system_prompt += f"\n\nJe consulte pour toi la base de données '{self.current_database_name}'."
+            
+        if context:
+            system_prompt += f"\n\nContexte :\n{context}"
+        
+        # Résumé des échanges plus anciens que l'historique conservé
+        if self.conversation_summary:
+            system_prompt += f"\n\nRésumé de la conversation précédente :\n{self.conversation_summary}"
+        return system_prompt
+    
+    def get_llm(self, model_name, temperature, max_tokens, groq_api_key):
+        """
+        Retourne le client du modèle pour ces réglages (réutilisé tant qu'ils ne changent pas)
+        
+        Args:
+            model_name: Nom du modèle Groq
+            temperature: Température de génération
+            max_tokens: Nombre maximal de tokens de la réponse
+            groq_api_key: Clé API Groq
+            
+        Returns:
+            ChatGroq: Client en mode streaming (FakeChatModel avec le moteur 'fake')
+        """
+        return self.llm_backend.get(model_name, temperature, max_tokens, groq_api_key)
+    
+    def stream_answer(self, context, model_name, groq_api_key, assistant_name, assistant_role,
+                      assistant_objective, on_token, cancel_event=None):
+        """
+        Génère la réponse du modèle en streaming à partir de l'historique de conversation
+        
+        Args:
+            context: Contexte issu de la base de données (chaîne vide si aucun)
+            model_name: Nom du modèle Groq
+            groq_api_key: Clé API Groq
+            assistant_name: Nom de l'assistant
+            assistant_role: Rôle de l'assistant
+            assistant_objective: Objectif de l'assistant
+            on_token: Fonction on_token(texte, tag) appelée pour chaque morceau de texte produit
+            cancel_event: threading.Event interrompant la génération (voir cancel_generation)
+            
+        Returns:
+            str: Réponse complète du modèle (ou réponse partielle conservée si la génération
+                 a été interrompue), ou None en cas d'échec
+        """
+        if not groq_api_key and self.llm_backend_name == 'groq':
+            on_token("La clé API Groq n'a pas été fournie.\n\n", 'system')
+            return None
+        
+        # Construire les messages en incluant l'historique
+        system_prompt = self.build_system_prompt(context, assistant_name, assistant_role, assistant_objective)
+        messages = [SystemMessage(content=system_prompt)]
+        
+        # Vérifier la taille du system_prompt
+        token_count = self.count_tokens(system_prompt)
+        if token_count > 18000:
+            on_token("\nLe contexte est trop volumineux pour le modèle. Veuillez réduire la taille du contexte.\n", 'system')
+            return None
+        
+        # Ajouter l'historique de la conversation
+        history = self.select_history_messages()
+        messages.extend(history)
+        
+        try:
+            # Paramètres du modèle depuis la configuration
+            temperature = float(self.config.get('Model', 'temperature', fallback='0.3'))
+            max_tokens = int(self.config.get('Model', 'max_tokens', fallback='6000'))
+            
+            # Question déjà posée dans les mêmes conditions : réponse rejouée sans appel au modèle
+            persona = f"{assistant_name}\n{assistant_role}\n{assistant_objective}"
+            cached_answer, similarity, cache_entry = self.lookup_cached_answer(
+                model_name, system_prompt, persona, context, history, temperature, max_tokens)
+            if cached_answer is not None:
+                return self.replay_cached_answer(cached_answer, similarity, assistant_name, on_token, cancel_event,
+                                                 model_name, groq_api_key)
+            
+            llm = self.get_llm(model_name, temperature, max_tokens, groq_api_key)
+            
+            # Insérer le nom du modèle avec le tag 'model_name'
+            on_token(f"{assistant_name}: ", 'model_name')
+            
+            # Utiliser le streaming pour recevoir les tokens au fur et à mesure
+            response_content = ''
+            try:
+                for chunk in self.llm_backend.stream(llm, messages, cancel_event):
+                    token = chunk.content  # Récupérer le token généré
+                    response_content += token
+                    on_token(token, 'model')
+            except Exception:
+                # La fermeture de la connexion par cancel_generation interrompt la lecture
+                if cancel_event is None or not cancel_event.is_set():
+                    raise
+            
+            on_token("\n\n", 'model')
+            
+            if cancel_event is not None and cancel_event.is_set():
+                return self.end_cancelled_answer(response_content, on_token)
+            
+            # Conserver la réponse complète pour les prochaines fois
+            if cache_entry is not None and response_content:
+                key, scope, vector = cache_entry
+                self.response_cache.put(key, response_content, scope, vector)
+            
+            self.record_answer(response_content, model_name, groq_api_key)
+            return response_content
+        except Exception as e:
+            on_token(f"\nErreur lors de l'appel à Groq : {e}\n\n", 'system')
+            return None
+    
+    def record_answer(self, response_content, model_name=None, groq_api_key=None):
+        """
+        Ajoute la réponse du modèle à l'historique en limitant sa taille : les messages les plus
+        anciens sont supprimés, ou résumés en arrière-plan en mode mémoire 'summary'
+        
+        Args:
+            response_content: Réponse complète
+            model_name: Modèle de la génération (utilisé pour le résumé si [Model] summary_model est vide)
+            groq_api_key: Clé API Groq (sans clé, pas de résumé avec le moteur 'groq')
+        """
+        # Le thread de résumé réécrit l'historique sous memory_lock
+        with self.memory_lock:
+            self.conversation_history.append(AIMessage(content=response_content))
+        
+        max_history_length = int(self.config.get('Model', 'max_history_length', fallback='5'))
+        # Le moteur simulé résume sans clé API
+        backend_ready = bool(groq_api_key) or self.llm_backend_name != 'groq'
+        if self.config.get('Model', 'memory_mode', fallback='window') == 'summary' and backend_ready:
+            self.schedule_summary(model_name, groq_api_key)
+            # Filet de sécurité si les résumés prennent du retard
+            max_history_length *= 4
+        
+        # Limiter la taille de l'historique si nécessaire (supprimer les messages les plus anciens)
+        with self.memory_lock:
+            if len(self.conversation_history) > max_history_length * 2:
+                self.conversation_history[:] = self.conversation_history[-max_history_length*2:]
+    
+    def select_history_messages(self):
+        """
+        Sélectionne les messages de l'historique transmis au modèle : tout l'historique conservé,
+        ou en mode mémoire 'summary' les échanges les plus récents tenant dans
+        [Model] memory_token_budget (résumé compris)
+        
+        Returns:
+            list: Messages, du plus ancien au plus récent
+        """
+        with self.memory_lock:
+            history = list(self.conversation_history)
+            summary = self.conversation_summary
+        if self.config.get('Model', 'memory_mode', fallback='window') != 'summary':
+            return history
+        
+        budget = self.config.getint('Model', 'memory_token_budget', fallback=3000) - self.count_tokens(summary)
+        selected = []
+        used = 0
+        for message in reversed(history):
+            cost = self.count_tokens(message.content)
+            # La dernière question est toujours transmise
+            if selected and used + cost > budget:
+                break
+            selected.insert(0, message)
+            used += cost
+        # Commencer par une question plutôt que par une réponse isolée
+        while len(selected) > 1 and not isinstance(selected[0], HumanMessage):
+            selected.pop(0)
+        return selected
+    
+    def schedule_summary(self, model_name, groq_api_key):
+        """
+        Résume en arrière-plan les échanges sortis de la fenêtre de l'historique
+        ([Model] max_history_length), sans retarder la réponse qui vient d'être affichée
+        
+        Args:
+            model_name: Modèle de la génération
+            groq_api_key: Clé API Groq
+        """
+        window = int(self.config.get('Model', 'max_history_length', fallback='5')) * 2
+        with self.memory_lock:
+            if self.summary_thread is not None and self.summary_thread.is_alive():
+                # Le prochain résumé reprendra les échanges restants
+                return
+            if len(self.conversation_history) <= window:
+                return
+            evicted = self.conversation_history[:-window]
+            self.summary_thread = threading.Thread(
+                target=self.fold_into_summary,
+                args=(evicted, self.config.get('Model', 'summary_model', fallback='') or model_name, groq_api_key),
+                daemon=True
+            )
+            self.summary_thread.start()
+    
+    def fold_into_summary(self, evicted, model_name, groq_api_key):
+        """
+        Intègre des échanges au résumé de la conversation puis les retire de l'historique
+        
+        Args:
+            evicted: Messages les plus anciens de l'historique
+            model_name: Modèle utilisé pour le résumé
+            groq_api_key: Clé API Groq
+        """
+        summary = self.conversation_summary
+        exchanges = "\n".join(
+            f"{'Utilisateur' if isinstance(message, HumanMessage) else 'Assistant'} : {message.content}"
+            for message in evicted
+        )
+        max_tokens = self.config.getint('Model', 'summary_max_tokens', fallback=500)
+        instructions = (
+            "Tu tiens à jour le résumé d'une conversation entre un utilisateur et un assistant. "
+            "Intègre les nouveaux échanges au résumé existant en conservant les faits, les demandes "
+            "et les décisions utiles pour la suite, sans commentaire. "
+            f"Le résumé doit faire au plus {max_tokens * 3 // 4} mots."
+        )
+        try:
+            llm = self.get_llm(model_name, 0.0, max_tokens, groq_api_key)
+            new_summary = llm.invoke([
+                SystemMessage(content=instructions),
+                HumanMessage(content=f"Résumé existant :\n{summary or '(aucun)'}\n\nNouveaux échanges :\n{exchanges}")
+            ]).content.strip()
+        except Exception as e:
+            print(f"Erreur lors du résumé de la conversation : {e}")
+            new_summary = None
+        
+        with self.memory_lock:
+            # L'historique a pu être réinitialisé ou rechargé pendant le résumé
+            still_present = (len(self.conversation_history) >= len(evicted)
+                             and all(a is b for a, b in zip(self.conversation_history, evicted)))
+            if not still_present or self.conversation_summary != summary:
+                return
+            if new_summary:
+                self.conversation_summary = new_summary
+            # En cas d'échec, les échanges sont supprimés comme en mode 'window'
+            del self.conversation_history[:len(evicted)]
+    
+    def reset_memory(self, history=None, summary=''):
+        """
+        Remplace l'historique de conversation et son résumé
+        
+        Args:
+            history: Nouvel historique (None = historique vide)
+            summary: Résumé des échanges plus anciens
+        """
+        with self.memory_lock:
+            self.conversation_history = history if history is not None else []
+            self.conversation_summary = summary
+    
+    def lookup_cached_answer(self, model_name, system_prompt, persona, context, history, temperature, max_tokens):
+        """
+        Cherche dans le cache la réponse à la dernière question de l'historique
+        
+        La clé exacte réunit le modèle et ses réglages, le message système (qui contient le
+        contexte retrouvé et le résumé), les échanges précédents transmis au modèle et la
+        question normalisée ; en mode sémantique, une question proche posée au même modèle,
+        avec les mêmes réglages, la même personnalité, le même contexte retrouvé et les mêmes
+        échanges précédents suffit
+        
+        Args:
+            model_name: Nom du modèle Groq
+            system_prompt: Message système de la génération
+            persona: Nom, rôle et objectif de l'assistant
+            context: Contexte issu de la base de données (chaîne vide si aucun)
+            history: Messages de l'historique transmis au modèle (voir select_history_messages)
+            temperature: Température de génération
+            max_tokens: Nombre maximal de tokens de la réponse
+            
+        Returns:
+            tuple: (réponse ou None, similarité, entrée (clé, portée, embedding) à conserver
+                    après la génération ou None si le cache est inactif)
+        """
+        if not self.response_cache.enabled or not history or not isinstance(history[-1], HumanMessage):
+            return None, 0.0, None
+        
+        question = history[-1].content
+        # Les réponses du modèle simulé ne sont jamais rejouées pour le vrai modèle
+        if self.llm_backend_name != 'groq':
+            model_name = f"{self.llm_backend_name}:{model_name}"
+        settings = f"{model_name}:{temperature}:{max_tokens}"
+        # Une relance (« continue », « explique davantage ») dépend des échanges qui la précèdent
+        earlier = fingerprint(self.conversation_summary, *(f"{message.type}:{message.content}" for message in history[:-1]))
+        key = fingerprint(settings, system_prompt, earlier, normalize_question(question))
+        scope, vector = None, None
+        # Clé exacte d'abord : l'embedding n'est calculé (ou repris de la recherche du contexte)
+        # que si elle est absente du cache
+        hit = self.response_cache.get(key)
+        if hit is None and self.response_cache.semantic:
+            database_name, index, _ = self.get_active_database()
+            database = f"{database_name}:{index.ntotal}" if context and index is not None else ''
+            scope = fingerprint(settings, persona, database, fingerprint(context), earlier)
+            vector = self.encode_query(question)[0]
+            hit = self.response_cache.get(key, scope, vector)
+        if hit is None:
+            return None, 0.0, (key, scope, vector)
+        return hit[0], hit[1], (key, scope, vector)
+    
+    def replay_cached_answer(self, answer, similarity, assistant_name, on_token, cancel_event=None,
+                             model_name=None, groq_api_key=None):
+        """
+        Rejoue une réponse du cache mot par mot, comme une réponse du modèle en streaming
+        
+        Args:
+            answer: Réponse conservée
+            similarity: Similarité entre la question et celle de la réponse conservée
+            assistant_name: Nom de l'assistant
+            on_token: Fonction on_token(texte, tag) appelée pour chaque morceau de texte
+            cancel_event: threading.Event interrompant la génération
+            model_name: Modèle de la génération (voir record_answer)
+            groq_api_key: Clé API Groq (voir record_answer)
+            
+        Returns:
+            str: Réponse rejouée (voir end_cancelled_answer en cas d'interruption)
+        """
+        on_token(f"{assistant_name}: ", 'model_name')
+        replayed = ''
+        for piece in re.findall(r'\S+\s*|\s+', answer):
+            if cancel_event is not None and cancel_event.is_set():
+                on_token("\n\n", 'model')
+                return self.end_cancelled_answer(replayed, on_token)
+            replayed += piece
+            on_token(piece, 'model')
+        on_token("\n\n", 'model')
+        
+        if similarity < 1.0:
+            on_token(f"Réponse issue du cache (question similaire à {similarity:.0%}).\n\n", 'system')
+        else:
+            on_token("Réponse issue du cache.\n\n", 'system')
+        self.record_answer(answer, model_name, groq_api_key)
+        return answer
+    
+    def end_cancelled_answer(self, response_content, on_token):
+        """
+        Termine une génération interrompue : la réponse partielle est conservée dans l'historique
+        ([Model] keep_partial_answer) ou abandonnée avec la question restée sans réponse,
+        pour que l'historique alterne toujours question et réponse
+        
+        Args:
+            response_content: Texte reçu avant l'interruption
+            on_token: Fonction on_token(texte, tag) de la génération
+            
+        Returns:
+            str: Réponse partielle conservée, ou None si elle est abandonnée
+        """
+        if response_content and self.config.getboolean('Model', 'keep_partial_answer', fallback=True):
+            with self.memory_lock:
+                self.conversation_history.append(AIMessage(content=response_content))
+            on_token("Génération interrompue : la réponse partielle est conservée dans l'historique.\n\n", 'system')
+            return response_content
+        
+        with self.memory_lock:
+            if self.conversation_history and isinstance(self.conversation_history[-1], HumanMessage):
+                self.conversation_history.pop()
+        on_token("Génération interrompue : la question et la réponse partielle sont retirées de l'historique.\n\n", 'system')
+        return None
+    
+    def cancel_generation(self, cancel_event):
+        """
+        Interrompt une génération en cours et ferme aussitôt sa connexion au service
+        
+        Args:
+            cancel_event: threading.Event passé à stream_answer
+        """
+        self.llm_backend.cancel(cancel_event)
+    
+    def ask(self, query, model_name, groq_api_key=None, use_database=True, top_k=5, max_context_length=3000):
+        """
+        Pose une question au modèle sans interface graphique
+        
+        Args:
+            query: Question de l'utilisateur
+            model_name: Nom du modèle Groq
+            groq_api_key: Clé API Groq (None = clé de la configuration)
+            use_database: Utiliser la base de données chargée pour construire le contexte
+            top_k: Nombre de segments à retrouver
+            max_context_length: Longueur maximale du contexte
+            
+        Returns:
+            dict: 'answer' (None en cas d'échec), 'messages' (messages système émis), 'context',
+                  'backend' et les mesures de la génération : 'time_to_first_token', 'elapsed'
+                  (secondes, recherche du contexte comprise), 'tokens' (morceaux reçus) et
+                  'tokens_per_second'
+        """
+        groq_api_key = groq_api_key or self.config.get('API_KEYS', 'groq_api_key', fallback='')
+        with self.memory_lock:
+            self.conversation_history.append(HumanMessage(content=query))
+        
+        context = ''
+        if use_database and self.get_active_database()[1] is not None:
+            context = self.retrieve_context(query, top_k=top_k, max_context_length=max_context_length)
+        
+        system_messages = []
+        # Mesures de la génération : délai avant le premier token et débit
+        timings = {'first_token': None, 'last_token': None, 'tokens': 0}
+        
+        def on_token(text, tag):
+            if tag == 'system':
+                system_messages.append(text.strip())
+            elif tag == 'model' and text.strip():
+                now = time.perf_counter()
+                if timings['first_token'] is None:
+                    timings['first_token'] = now
+                timings['last_token'] = now
+                timings['tokens'] += 1
+        
+        started = time.perf_counter()
+        answer = self.stream_answer(
+            context,
+            model_name,
+            groq_api_key,
+            self.config.get('Assistant', 'name', fallback='Assistant'),
+            self.config.get('Assistant', 'role', fallback='Assistant'),
+            self.config.get('Assistant', 'objective', fallback='Aider les utilisateurs'),
+            on_token
+        )
+        elapsed = time.perf_counter() - started
+        first_token, last_token = timings['first_token'], timings['last_token']
+        streaming = last_token - first_token if first_token is not None else 0.0
+        return {
+            'answer': answer,
+            'messages': system_messages,
+            'context': context,
+            'backend': self.llm_backend_name,
+            'time_to_first_token': round(first_token - started, 3) if first_token is not None else None,
+            'elapsed': round(elapsed, 3),
+            'tokens': timings['tokens'],
+            'tokens_per_second': round((timings['tokens'] - 1) / streaming, 2) if streaming > 0 else None
+        }
+    
+    def fetch_videos(self, channel_name, video_ids_input, num_videos, api_key, output_widget=None):
+        """
+        Récupère les vidéos à traiter, soit par IDs/URLs, soit depuis une chaîne
+        
+        Args:
+            channel_name: Nom ou ID de la chaîne YouTube
+            video_ids_input: Liste d'IDs ou URLs de vidéos séparés par des virgules
+            num_videos: Nombre de vidéos à récupérer (pour la chaîne)
+            api_key: Clé API YouTube
+            output_widget: Widget pour afficher les sorties (None = console)
+            
+        Returns:
+            list: Vidéos récupérées
+            
+        Raises:
+            QuotaExceeded: Si le quota du jour ou le budget de l'importation ([YouTube] quota_budget) est épuisé
+        """
+        with self.youtube_quota.budget(self.config.getint('YouTube', 'quota_budget', fallback=0)):
+            try:
+                if video_ids_input.strip():
+                    # L'utilisateur a spécifié des vidéos (séparées par des virgules ou des retours à la ligne)
+                    video_ids = [vid for vid in re.split(r'[,\s]+', video_ids_input) if vid]
+                    return self.get_videos_by_ids(video_ids, api_key, output_widget)
+                # Utiliser le nom de la chaîne et le nombre de vidéos
+                return self.get_videos_youtube(channel_name, api_key, num_videos, output_widget)
+            finally:
+                self.log_quota_usage(output_widget)
+    
+    def log_quota_usage(self, output_widget=None):
+        """
+        Affiche le quota de l'API YouTube consommé par l'importation en cours et depuis le début du jour
+        
+        Args:
+            output_widget: Widget pour afficher les sorties (None = console)
+        """
+        usage = self.youtube_quota.today()
+        limit = f"/{usage['daily_limit']}" if usage['daily_limit'] else ""
+        budget = f" sur un budget de {usage['budget']}" if usage.get('budget') else ""
+        self.log_info(f"Quota YouTube consommé : {self.youtube_quota.budget_used} unités{budget} "
+                      f"(aujourd'hui : {usage['units']}{limit} unités)", output_widget)
+    
+    def process_video(self, video, output_widget=None):
+        """
+        Récupère et sauvegarde la transcription et le rapport markdown d'une vidéo
+        
+        Args:
+            video: Données de la vidéo
+            output_widget: Widget pour afficher les sorties (None = console)
+            
+        Returns:
+            bool: True si la transcription a été sauvegardée
+        """
+        video_id = video['id']
+        self.log_info(f"Traitement de la vidéo {video_id} : {video['snippet']['title']}", output_widget)
+        
+        # Récupération de la transcription avec les horodatages des segments
+        transcription, timings = self.get_transcription_with_timings(video_id, ['en', 'fr'], output_widget)
+        if not transcription:
+            return False
+        
+        # Sauvegarde de la transcription
+        self.save_transcription(video_id, transcription, output_widget, timings)
+        
+        # Génération du rapport markdown
+        self.generate_markdown_report(video, transcription, video.get('statistics', {}), output_widget)
+        
+        # Mémoriser la vidéo dans l'état de synchronisation de sa chaîne
+        self.record_ingested_video(video)
+        return True
+    
+    def process_videos(self, videos, output_widget=None, cancel_event=None, progress_callback=None):
+        """
+        Récupère et sauvegarde la transcription et le rapport markdown de chaque vidéo.
+        Les vidéos sont traitées en parallèle ([YouTube] transcript_workers) avec un débit
+        limité ([YouTube] transcript_rate et transcript_burst) ; chaque résultat est écrit dès qu'il arrive.
+        
+        Args:
+            videos: Vidéos à traiter
+            output_widget: Widget pour afficher les sorties (None = console)
+            cancel_event: threading.Event permettant d'annuler les vidéos pas encore commencées
+            progress_callback: Fonction progress_callback(vidéos traitées, vidéos au total,
+                               transcriptions sauvegardées) appelée après chaque vidéo
+            
+        Returns:
+            list: IDs des vidéos dont la transcription a été sauvegardée
+            
+        Raises:
+            PipelineCancelled: Si l'annulation a été demandée
+        """
+        workers = self.config.getint('YouTube', 'transcript_workers', fallback=4)
+        limiter = TokenBucket(self.config.getfloat('YouTube', 'transcript_rate', fallback=2.0),
+                              self.config.getfloat('YouTube', 'transcript_burst', fallback=4.0))
+        processed = []
+        done = 0
+        # Ajout d'un saut de ligne pour séparer les infos générales du traitement des vidéos
+        self.write_output(output_widget, "\n")
+        
+        # Traitement des vidéos au fur et à mesure de leur achèvement
+        for video, saved, error in map_as_completed(lambda video: self.process_video(video, output_widget),
+                                                    videos, workers, limiter, cancel_event):
+            done += 1
+            if error is not None:
+                self.log_error(f"Erreur lors du traitement de la vidéo {video.get('id', 'inconnue')} : {error}", output_widget)
+            elif saved:
+                processed.append(video['id'])
+            if progress_callback:
+                progress_callback(done, len(videos), len(processed))
+        
+        self.log_info(f"Traitement des vidéos terminé : {len(processed)}/{len(videos)} transcriptions sauvegardées.", output_widget)
+        # Ajout d'un séparateur visuel pour bien distinguer chaque traitement
+        self.write_output(output_widget, "\n================\n")
+        # Ajout d'un saut de ligne pour séparer ce bloc d'action (traitement d'un lot de vidéos)
+        self.write_output(output_widget, "\n")
+        return processed
+    
+    def ingest_videos_to_database(self, db_name, channel_name, video_ids_input, num_videos, api_key,
+                                  chunk_size=500, output_widget=None, cancel_event=None, progress_callback=None):
+        """
+        Ingère des vidéos YouTube directement dans une base vectorielle avec un pipeline asyncio
+        (métadonnées -> transcription -> sauvegarde -> découpage -> encodage -> indexation) relié par
+        des files bornées. Chaque vidéo traverse le pipeline dès qu'elle est disponible et la base est
+        enregistrée (et échangée si elle est chargée) toutes les [YouTube] ingest_commit_interval secondes :
+        la chaîne devient interrogeable au fil de l'arrivée de ses vidéos.
+        
+        Args:
+            db_name: Nom de la base de données (créée si elle n'existe pas)
+            channel_name: Nom ou ID de la chaîne YouTube
+            video_ids_input: Liste d'IDs ou URLs de vidéos (prioritaire sur la chaîne)
+            num_videos: Nombre de vidéos récentes de la chaîne à couvrir
+            api_key: Clé API YouTube
+            chunk_size: Taille des chunks de texte d'une nouvelle base
+            output_widget: Widget pour afficher les sorties (None = console)
+            cancel_event: threading.Event permettant d'annuler l'ingestion
+            progress_callback: Fonction progress_callback(vidéos traitées, vidéos au total, segments indexés)
+            
+        Returns:
+            dict: 'database', 'videos' (IDs demandés), 'indexed', 'skipped' (déjà dans la base),
+                  'failed' (IDs), 'chunks_added', 'quota_units' et 'report' (débit de chaque étage)
+            
+        Raises:
+            PipelineCancelled: Si l'annulation a été demandée (les vidéos déjà indexées sont conservées)
+            QuotaExceeded: Si le quota du jour ou le budget de l'importation ([YouTube] quota_budget) est épuisé
+        """
+        quota_budget = self.config.getint('YouTube', 'quota_budget', fallback=0)
+        with self.youtube_quota.budget(quota_budget):
+            # Vidéos demandées, de la plus récente à la plus ancienne pour une chaîne
+            if video_ids_input.strip():
+                video_ids = self.normalize_video_ids([vid for vid in re.split(r'[,\s]+', video_ids_input) if vid], output_widget)
+            else:
+                _, video_ids = self.list_channel_video_ids(channel_name, api_key, num_videos, output_widget)
+            
+            # Base existante (complétée) ou nouvelle base
+            database_folder = self.config.get('Directories', 'database', fallback='5_database')
+            transcriptions_folder = self.config.get('Directories', 'transcriptions', fallback='3_transcriptions')
+            db_path = os.path.join(database_folder, f'{db_name}.pkl')
+            index_path = os.path.join(database_folder, f'faiss_index_{db_name}.bin')
+            if os.path.exists(db_path) and os.path.exists(index_path):
+                with self.database_write_lock, self.database_lock:
+                    with open(db_path, 'rb') as f:
+                        data = pickle.load(f)
+                    index = faiss.read_index(index_path)
+                for key in ('filenames', 'documents', 'metadata'):
+                    data.setdefault(key, [])
+                chunk_size = data.get('chunk_size', chunk_size)
+            else:
+                index = None
+                data = {
+                    'filenames': [],
+                    'documents': [],
+                    'metadata': [],
+                    'creation_date': None,
+                    'source_folder': transcriptions_folder,
+                    'chunk_size': chunk_size
+                }
+            data.setdefault('file_signatures', {})
+            data.setdefault('sources', [])
+            if transcriptions_folder not in data['sources']:
+                data['sources'].append(transcriptions_folder)
+            
+            # Les vidéos déjà présentes dans la base ne sont pas retraitées
+            existing_filenames = set(data['filenames'])
+            skipped = [video_id for video_id in video_ids if f"{video_id}.txt" in existing_filenames]
+            pending_ids = [video_id for video_id in video_ids if f"{video_id}.txt" not in existing_filenames]
+            if skipped:
+                self.log_info(f"{len(skipped)} vidéos déjà présentes dans la base '{db_name}' ont été ignorées", output_widget)
+            
+            model_name = 'sentence-transformers/all-MiniLM-L6-v2'
+            try:
+                model = SentenceTransformer(model_name)
+            except Exception as e:
+                raise ValueError(f"Impossible de charger le modèle {model_name}. Veuillez vérifier votre connexion internet et votre token Hugging Face. Erreur: {e}")
+            
+            youtube = self.get_youtube_client(api_key)
+            workers = self.config.getint('YouTube', 'transcript_workers', fallback=4)
+            limiter = TokenBucket(self.config.getfloat('YouTube', 'transcript_rate', fallback=2.0),
+                                  self.config.getfloat('YouTube', 'transcript_burst', fallback=4.0))
+            commit_interval = self.config.getfloat('YouTube', 'ingest_commit_interval', fallback=5.0)
+            queue_size = self.config.getint('Database', 'pipeline_queue_size', fallback=8)
+            
+            state = {'index': index, 'committed_at': time.monotonic(), 'dirty': False}
+            indexed, failed = [], []
+            progress = {'done': len(skipped), 'chunks': 0}
+            pipeline = AsyncPipeline(queue_size, cancel_event, max_threads=workers + 4)
+            
+            def report_progress():
+                if progress_callback:
+                    progress_callback(progress['done'], len(video_ids), progress['chunks'])
+            
+            def fail(video_id):
+                failed.append(video_id)
+                progress['done'] += 1
+                report_progress()
+            
+            def commit():
+                # Instantané publié : l'index de travail continue d'être complété pendant les recherches.
+                # Le verrou d'écriture n'est pris que pour l'enregistrement, pas pendant les appels réseau
+                with self.database_write_lock:
+                    snapshot_index = faiss.clone_index(state['index'])
+                    snapshot = dict(data)
+                    for key in ('filenames', 'documents', 'metadata'):
+                        snapshot[key] = list(data[key])
+                    snapshot['file_signatures'] = dict(data['file_signatures'])
+                    snapshot['adjacency'], snapshot['chunk_positions'] = self.build_chunk_adjacency(snapshot['filenames'])
+                    snapshot['last_modified'] = os.path.getmtime(db_path) if os.path.exists(db_path) else None
+                    snapshot['num_documents'] = len(snapshot['documents'])
+                    self.save_vector_database(db_name, snapshot_index, snapshot)
+                    if self.get_active_database()[0] == db_name:
+                        self.set_active_database(db_name, snapshot_index, snapshot)
+                state['committed_at'] = time.monotonic()
+                state['dirty'] = False
+            
+            def store_video(video, transcription, timings):
+                self.save_transcription(video['id'], transcription, output_widget, timings)
+                self.generate_markdown_report(video, transcription, video.get('statistics', {}), output_widget)
+                self.record_ingested_video(video)
+            
+            def read_stored_transcription(video_id):
+                filepath = os.path.join(transcriptions_folder, f"{video_id}.txt")
+                text = storage.read_text(filepath)
+                return text, self.load_transcript_timings(filepath, text)
+            
+            async def fetch_metadata(batch_ids, emit):
+                # Les transcriptions déjà sur le disque ne demandent ni métadonnées ni téléchargement
+                to_fetch = [video_id for video_id in batch_ids if not self.is_video_ingested(video_id)]
+                for video_id in batch_ids:
+                    if video_id not in to_fetch:
+                        await emit({'id': video_id, 'video': None})
+                if not to_fetch:
+                    return
+                videos = await pipeline.run_blocking(self.get_video_details, youtube, to_fetch)
+                found_ids = {video['id'] for video in videos}
+                for video_id in to_fetch:
+                    if video_id not in found_ids:
+                        self.log_error(f"Vidéo non trouvée pour l'ID {video_id}", output_widget)
+                        fail(video_id)
+                for video in videos:
+                    await emit({'id': video['id'], 'video': video})
+            
+            async def fetch_transcript(item, emit):
+                if item['video'] is None:
+                    item['text'], item['timings'] = await pipeline.run_blocking(read_stored_transcription, item['id'])
+                else:
+                    if not await pipeline.run_blocking(limiter.acquire, cancel_event):
+                        return
+                    item['text'], item['timings'] = await pipeline.run_blocking(
+                        self.get_transcription_with_timings, item['id'], ['en', 'fr'], output_widget)
+                if not item['text']:
+                    fail(item['id'])
+                    return
+                await emit(item)
+            
+            async def save_transcript(item, emit):
+                if item['video'] is not None:
+                    await pipeline.run_blocking(store_video, item['video'], item['text'], item['timings'])
+                await emit(item)
+            
+            async def chunk_transcript(item, emit):
+                filename = f"{item['id']}.txt"
+                filepath = os.path.join(transcriptions_folder, filename)
+                added_date = os.path.getmtime(storage.stored_path(filepath))
+                chunks = []
+                for idx, chunk in enumerate(self.chunk_document(item['text'], chunk_size, item['timings'])):
+                    chunk_metadata = self.build_chunk_metadata(filename, idx, transcriptions_folder, chunk, item['timings'])
+                    chunk_metadata['added_date'] = added_date
+                    chunks.append((filename, chunk['text'], chunk_metadata))
+                if not chunks:
+                    fail(item['id'])
+                    return
+                await emit((item['id'], chunks))
+            
+            async def encode_chunks(batch, emit):
+                # Toutes les vidéos prêtes sont encodées ensemble, sans attendre de lot complet
+                texts = [text for _, chunks in batch for _, text, _ in chunks]
+                vectors = await pipeline.run_blocking(model.encode, texts)
+                await emit((batch, vectors))
+            
+            async def insert_vectors(item, emit):
+                batch, vectors = item
+                if state['index'] is None:
+                    state['index'] = faiss.IndexFlatL2(vectors.shape[1])
+                state['index'].add(vectors)
+                for video_id, chunks in batch:
+                    for filename, text, chunk_metadata in chunks:
+                        data['filenames'].append(filename)
+                        data['documents'].append(text)
+                        data['metadata'].append(chunk_metadata)
+                    # Empreinte du fichier : la surveillance du dossier ne le réindexera pas
+                    data['file_signatures'].update(
+                        self.get_file_signatures(transcriptions_folder, [f"{video_id}.txt"], with_digest=True))
+                    indexed.append(video_id)
+                    progress['done'] += 1
+                    progress['chunks'] += len(chunks)
+                state['dirty'] = True
+                report_progress()
+                if time.monotonic() - state['committed_at'] >= commit_interval:
+                    await pipeline.run_blocking(commit)
+            
+            async def commit_remaining(emit):
+                if state['dirty']:
+                    await pipeline.run_blocking(commit)
+            
+            pipeline.add_stage("Métadonnées", fetch_metadata, batch=50)
+            pipeline.add_stage("Transcription", fetch_transcript, workers=workers)
+            pipeline.add_stage("Sauvegarde", save_transcript, workers=2)
+            pipeline.add_stage("Découpage", chunk_transcript)
+            pipeline.add_stage("Encodage", encode_chunks, batch=queue_size)
+            pipeline.add_stage("Indexation", insert_vectors, on_end=commit_remaining)
+            
+            self.log_info(f"Ingestion de {len(pending_ids)} vidéos dans la base '{db_name}'", output_widget)
+            report_progress()
+            try:
+                pipeline.run(pending_ids)
+            finally:
+                # Les vidéos indexées avant une annulation ou une erreur restent dans la base
+                if state['dirty']:
+                    commit()
+                self.log_quota_usage(output_widget)
+            
+            report = pipeline.format_report()
+            for line in report:
+                self.log_info(line, output_widget)
+            self.log_info(f"Ingestion terminée : {len(indexed)} vidéos indexées ({progress['chunks']} segments), "
+                          f"{len(skipped)} déjà présentes, {len(failed)} en échec", output_widget)
+            return {
+                'database': db_name,
+                'videos': video_ids,
+                'indexed': indexed,
+                'skipped': skipped,
+                'failed': failed,
+                'chunks_added': progress['chunks'],
+                'quota_units': self.youtube_quota.budget_used,
+                'report': report
+            }
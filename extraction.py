@@ -0,0 +1,135 @@
+"""
+Module extraction.py - Extraction du texte des fichiers sources pour Blow Chat YT
+Contient l'extraction parallèle des PDF et un cache des textes extraits indexé par empreinte de fichier.
+"""
+
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+from storage import content_hash, read_bytes, read_text
+
+# Version de l'extraction : à incrémenter si le texte produit change, pour invalider le cache
+EXTRACTION_VERSION = 1
+
+# Extensions des fichiers pris en charge par les bases de données
+SUPPORTED_EXTENSIONS = ('.txt', '.pdf')
+
+
+def extract_pdf_text(filepath):
+    """
+    Extrait le texte de toutes les pages d'un PDF
+
+    Args:
+        filepath: Chemin du fichier PDF (éventuellement compressé)
+
+    Returns:
+        str: Texte extrait du PDF
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(read_bytes(filepath)))
+    return "".join(page.extract_text() or '' for page in reader.pages)
+
+
+def file_hash(filepath):
+    """
+    Calcule l'empreinte SHA-256 du contenu d'un fichier (décompressé s'il est stocké compressé)
+
+    Args:
+        filepath: Chemin du fichier
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    return content_hash(filepath)
+
+
+class ExtractionCache:
+    """Cache disque des textes extraits des PDF, indexé par l'empreinte du fichier"""
+
+    def __init__(self, cache_folder, max_workers=None):
+        """
+        Initialisation du cache
+
+        Args:
+            cache_folder: Dossier où stocker les textes extraits
+            max_workers: Nombre de processus pour l'extraction (None = nombre de CPU)
+        """
+        self.cache_folder = cache_folder
+        self.max_workers = max_workers or None
+        if not os.path.exists(cache_folder):
+            os.makedirs(cache_folder)
+
+    def _cache_path(self, digest):
+        """Retourne le chemin du fichier de cache pour une empreinte"""
+        return os.path.join(self.cache_folder, f"{digest}_v{EXTRACTION_VERSION}.txt")
+
+    def get(self, digest):
+        """Retourne le texte en cache pour une empreinte ou None"""
+        cache_path = self._cache_path(digest)
+        if not os.path.exists(cache_path):
+            return None
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def put(self, digest, text):
+        """Enregistre le texte extrait pour une empreinte"""
+        cache_path = self._cache_path(digest)
+        temp_path = f"{cache_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, cache_path)
+
+    def create_executor(self):
+        """
+        Crée le pool de processus utilisé pour l'extraction des PDF
+
+        Returns:
+            ProcessPoolExecutor: Pool de processus, ou None s'il ne peut pas être créé
+        """
+        try:
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        except (OSError, RuntimeError, NotImplementedError) as e:
+            # Pool indisponible (environnement restreint) : extraction dans le thread appelant
+            print(f"Extraction parallèle impossible, passage en séquentiel : {e}")
+            return None
+
+    def extract_pdf(self, filepath, digest=None, executor=None):
+        """
+        Extrait le texte d'un PDF en réutilisant le cache
+
+        Args:
+            filepath: Chemin du PDF
+            digest: Empreinte du fichier si déjà calculée
+            executor: Pool de processus pour l'extraction (None = extraction directe)
+
+        Returns:
+            str: Texte extrait du PDF
+        """
+        digest = digest or file_hash(filepath)
+        text = self.get(digest)
+        if text is not None:
+            return text
+        if executor is not None:
+            text = executor.submit(extract_pdf_text, filepath).result()
+        else:
+            text = extract_pdf_text(filepath)
+        self.put(digest, text)
+        return text
+
+
+def read_source_file(filepath):
+    """
+    Lit un fichier source : le texte d'un .txt, l'empreinte d'un .pdf (extrait plus tard),
+    en clair ou compressé
+
+    Args:
+        filepath: Chemin logique du fichier
+
+    Returns:
+        dict: {'filepath', 'text', 'digest'} où 'text' vaut None pour un PDF
+    """
+    if filepath.endswith('.pdf'):
+        return {'filepath': filepath, 'text': None, 'digest': file_hash(filepath)}
+    return {'filepath': filepath, 'text': read_text(filepath), 'digest': None}
@@ -0,0 +1,100 @@
+"""
+Module fetcher.py - Récupération concurrente pour Blow Chat YT
+Contient un limiteur de débit à seau de jetons et l'exécution d'une fonction sur une liste
+d'éléments dans un pool de threads borné, avec les résultats fournis au fil de l'eau.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from pipeline import PipelineCancelled
+
+
+class TokenBucket:
+    """Limiteur de débit à seau de jetons, partagé entre plusieurs threads"""
+
+    def __init__(self, rate, capacity=None):
+        """
+        Initialisation du limiteur
+
+        Args:
+            rate: Nombre de jetons ajoutés par seconde (0 ou moins = pas de limite)
+            capacity: Nombre maximal de jetons disponibles en rafale (défaut : rate)
+        """
+        self.rate = rate
+        self.capacity = max(1.0, capacity or rate or 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, cancel_event=None):
+        """
+        Consomme un jeton en attendant qu'il soit disponible
+
+        Args:
+            cancel_event: threading.Event interrompant l'attente (optionnel)
+
+        Returns:
+            bool: True si un jeton a été obtenu, False si l'attente a été annulée
+        """
+        if self.rate <= 0:
+            return True
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if cancel_event is not None:
+                if cancel_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+def map_as_completed(func, items, workers=4, limiter=None, cancel_event=None):
+    """
+    Applique une fonction à chaque élément dans un pool de threads borné
+
+    Args:
+        func: Fonction func(élément) à appliquer
+        items: Éléments à traiter
+        workers: Nombre maximal de threads simultanés
+        limiter: TokenBucket limitant le nombre d'appels par seconde (optionnel)
+        cancel_event: threading.Event permettant d'annuler les appels pas encore commencés
+
+    Yields:
+        tuple: (élément, résultat, erreur) dans l'ordre de fin des appels ; erreur vaut None en cas de succès
+
+    Raises:
+        PipelineCancelled: Si l'annulation a été demandée
+    """
+    def call(item):
+        if cancel_event is not None and cancel_event.is_set():
+            raise PipelineCancelled("Récupération annulée")
+        if limiter is not None and not limiter.acquire(cancel_event):
+            raise PipelineCancelled("Récupération annulée")
+        return func(item)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    futures = {}
+    try:
+        futures = {executor.submit(call, item): item for item in items}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except PipelineCancelled:
+                continue
+            except Exception as e:
+                yield futures[future], None, e
+    finally:
+        # Les appels non commencés sont abandonnés, ceux en cours se terminent
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
+    if cancel_event is not None and cancel_event.is_set():
+        raise PipelineCancelled("Récupération annulée")
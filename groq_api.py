@@ -0,0 +1,169 @@
+"""
+Module groq_api.py - Clients du modèle de langage Groq pour Blow Chat YT
+Fournit un client ChatGroq réutilisé d'un message à l'autre pour chaque combinaison de réglages
+(modèle, température, nombre maximal de tokens, clé API), tous reposant sur un même pool de
+connexions HTTP : la connexion TLS au service n'est pas rétablie à chaque message.
+Une génération en streaming peut être interrompue depuis un autre thread : sa connexion est
+fermée aussitôt, ce qui arrête la production (et la facturation) des tokens.
+"""
+
+import socket
+import threading
+from collections import OrderedDict
+
+import httpx
+from langchain_groq import ChatGroq
+
+
+def _field_names(model_class):
+    """Retourne les noms des champs d'un modèle pydantic (v1 ou v2)"""
+    fields = getattr(model_class, 'model_fields', None)
+    if fields is None:
+        fields = getattr(model_class, '__fields__', {})
+    return set(fields)
+
+
+# Les versions de langchain_groq sans champ http_async_client transmettent http_client aussi au
+# client asynchrone, qui refuse un httpx.Client : chaque client garde alors ses propres connexions
+SHARED_HTTP_CLIENT = 'http_async_client' in _field_names(ChatGroq)
+
+
+class GroqClientPool:
+    """Clients ChatGroq, un par combinaison de réglages, partageant un pool de connexions"""
+
+    def __init__(self, pool_size=10, max_clients=8, max_retries=2):
+        """
+        Initialisation du pool de clients
+
+        Args:
+            pool_size: Nombre de connexions conservées ouvertes vers le service
+            max_clients: Nombre maximal de clients conservés (les moins récemment utilisés sont oubliés)
+            max_retries: Nombre de nouvelles tentatives de chaque requête
+        """
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.http_client = httpx.Client(limits=limits, event_hooks={'response': [self._register_response]})
+        self.max_clients = max(1, max_clients)
+        self.max_retries = max_retries
+        self.clients = OrderedDict()
+        self.lock = threading.Lock()
+        # Génération du thread courant (cancel_event) et réponses HTTP ouvertes de chaque génération
+        self.local = threading.local()
+        self.responses = {}
+
+    def get(self, model_name, temperature, max_tokens, api_key):
+        """
+        Retourne le client associé à des réglages, en le construisant au premier appel
+
+        Args:
+            model_name: Nom du modèle Groq
+            temperature: Température de génération
+            max_tokens: Nombre maximal de tokens de la réponse
+            api_key: Clé API Groq (transmise au client, jamais à l'environnement du processus)
+
+        Returns:
+            ChatGroq: Client en mode streaming, utilisable depuis plusieurs threads
+        """
+        key = (model_name, temperature, max_tokens, api_key)
+        with self.lock:
+            client = self.clients.get(key)
+            if client is None:
+                options = {'http_client': self.http_client} if SHARED_HTTP_CLIENT else {}
+                client = ChatGroq(
+                    model=model_name,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    api_key=api_key,
+                    timeout=None,
+                    max_retries=self.max_retries,
+                    streaming=True,
+                    **options
+                )
+                self.clients[key] = client
+                # Oublier les clients des réglages les plus anciens (le pool HTTP reste partagé)
+                while len(self.clients) > self.max_clients:
+                    self.clients.popitem(last=False)
+            else:
+                self.clients.move_to_end(key)
+            return client
+
+    def _register_response(self, response):
+        """Associe une réponse HTTP à la génération du thread courant (crochet httpx)"""
+        cancel_event = getattr(self.local, 'cancel_event', None)
+        if cancel_event is None:
+            return
+        with self.lock:
+            self.responses.setdefault(cancel_event, []).append(response)
+        if cancel_event.is_set():
+            response.close()
+
+    def release(self, cancel_event):
+        """
+        Ferme les réponses HTTP encore ouvertes d'une génération ; une génération terminée
+        normalement rend sa connexion au pool, une génération interrompue la coupe
+        """
+        with self.lock:
+            responses = self.responses.pop(cancel_event, [])
+        for response in responses:
+            if not cancel_event.is_set():
+                response.close()
+                continue
+            try:
+                # Réveiller la lecture bloquée dans le thread de la génération (close seul ne l'interrompt pas)
+                network_stream = response.extensions.get('network_stream')
+                sock = network_stream.get_extra_info('socket') if network_stream is not None else None
+                if sock is not None:
+                    sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
+            try:
+                response.close()
+            except Exception:
+                pass
+
+    def stream(self, llm, messages, cancel_event=None):
+        """
+        Génère la réponse du modèle morceau par morceau
+
+        Args:
+            llm: Client retourné par get
+            messages: Messages de la conversation
+            cancel_event: threading.Event interrompant la génération (voir cancel)
+
+        Yields:
+            AIMessageChunk: Morceaux de la réponse, jusqu'à la fin ou l'interruption
+
+        Raises:
+            Exception: Erreur de l'appel (y compris la lecture interrompue par cancel)
+        """
+        if cancel_event is None:
+            yield from llm.stream(messages)
+            return
+        self.local.cancel_event = cancel_event
+        chunks = llm.stream(messages)
+        try:
+            for chunk in chunks:
+                if cancel_event.is_set():
+                    break
+                yield chunk
+        finally:
+            chunks.close()
+            self.local.cancel_event = None
+            self.release(cancel_event)
+
+    def cancel(self, cancel_event):
+        """
+        Interrompt une génération depuis n'importe quel thread : lève cancel_event et ferme
+        immédiatement sa connexion, sans attendre le prochain morceau (sans pool partagé,
+        voir SHARED_HTTP_CLIENT, la génération s'arrête au morceau suivant)
+
+        Args:
+            cancel_event: threading.Event passé à stream
+        """
+        cancel_event.set()
+        self.release(cancel_event)
+
+    def close(self):
+        """Oublie les clients construits et ferme les connexions du pool"""
+        with self.lock:
+            self.clients.clear()
+        self.http_client.close()
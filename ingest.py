@@ -0,0 +1,168 @@
+"""
+Module ingest.py - Pipeline asynchrone d'ingestion pour Blow Chat YT
+Enchaîne des étages asyncio reliés par des files bornées (contre-pression entre étages) :
+les opérations bloquantes (API, disque, encodage) s'exécutent dans un pool de threads et
+chaque élément traverse tout le pipeline sans attendre la fin du lot.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline import Pipeline, PipelineCancelled, PipelineStage
+
+# Marqueur de fin de flux transmis d'un étage au suivant
+_END = object()
+
+
+class AsyncPipeline(Pipeline):
+    """Pipeline d'étages asyncio reliés par des files bornées (même rapport de débit que Pipeline)"""
+
+    def __init__(self, queue_size=8, cancel_event=None, max_threads=8):
+        """
+        Initialisation du pipeline
+
+        Args:
+            queue_size: Taille maximale des files entre deux étages
+            cancel_event: threading.Event permettant d'annuler l'exécution (optionnel)
+            max_threads: Nombre de threads disponibles pour les appels bloquants (voir run_blocking)
+        """
+        super().__init__(queue_size, cancel_event)
+        self.max_threads = max(1, max_threads)
+        self.batches = []
+        self._executor = None
+        self._loop = None
+
+    def add_stage(self, name, func, workers=1, on_end=None, batch=None):
+        """
+        Ajoute un étage à la fin du pipeline
+
+        Args:
+            name: Nom de l'étage
+            func: Coroutine func(item, emit) de traitement d'un élément ; emit est une coroutine
+            workers: Nombre de tâches concurrentes de l'étage
+            on_end: Coroutine on_end(emit) appelée une fois en fin de flux
+            batch: Si défini, func reçoit la liste des éléments déjà disponibles (au plus batch)
+                   au lieu d'un seul élément : les lots ne font jamais attendre un élément prêt ;
+                   la file d'entrée de l'étage contient alors au moins batch éléments
+
+        Returns:
+            AsyncPipeline: Le pipeline lui-même pour chaîner les appels
+        """
+        self.stages.append(PipelineStage(name, func, workers, on_end))
+        self.batches.append(batch)
+        return self
+
+    async def run_blocking(self, func, *args):
+        """
+        Exécute une fonction bloquante dans le pool de threads du pipeline
+
+        Returns:
+            Valeur retournée par la fonction
+        """
+        return await self._loop.run_in_executor(self._executor, func, *args)
+
+    def run(self, items):
+        """
+        Exécute le pipeline sur une séquence d'éléments et attend la fin du traitement
+
+        Args:
+            items: Éléments d'entrée du premier étage
+
+        Returns:
+            list: Statistiques de débit de chaque étage
+
+        Raises:
+            PipelineCancelled: Si l'exécution a été annulée
+            Exception: Première erreur levée par un étage
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self.max_threads)
+        try:
+            return asyncio.run(self._run(items))
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run(self, items):
+        """Crée les files et les tâches des étages puis attend la fin du flux"""
+        self._loop = asyncio.get_running_loop()
+        # La file d'entrée d'un étage par lots peut contenir un lot complet (ex. 50 IDs par appel
+        # videos.list), sinon les lots seraient limités à queue_size éléments
+        sizes = [max(self.queue_size, batch or 0) for batch in self.batches] + [self.queue_size]
+        queues = [asyncio.Queue(maxsize=size) for size in sizes]
+        start_time = time.perf_counter()
+
+        async def feed():
+            for item in items:
+                await queues[0].put(item)
+            await queues[0].put(_END)
+
+        async def take(source, batch):
+            item = await source.get()
+            if item is _END or not batch:
+                return item
+            # Compléter le lot avec les éléments déjà disponibles, sans attendre
+            taken = [item]
+            while len(taken) < batch and not source.empty():
+                following = source.get_nowait()
+                if following is _END:
+                    # Rendre la fin de flux au prochain appel
+                    source.put_nowait(_END)
+                    break
+                taken.append(following)
+            return taken
+
+        async def work(stage, batch, source, target, remaining):
+            async def emit(output):
+                stage.items_out += 1
+                await target.put(output)
+
+            while True:
+                item = await take(source, batch)
+                if item is _END:
+                    # Propager la fin de flux aux autres tâches du même étage
+                    await source.put(_END)
+                    break
+                started = time.perf_counter()
+                await stage.func(item, emit)
+                stage.items_in += len(item) if batch else 1
+                stage.busy_time += time.perf_counter() - started
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                if stage.on_end:
+                    started = time.perf_counter()
+                    await stage.on_end(emit)
+                    stage.busy_time += time.perf_counter() - started
+                await target.put(_END)
+
+        async def drain():
+            while await queues[-1].get() is not _END:
+                pass
+
+        async def watch_cancel():
+            while not self.cancel_event.is_set():
+                await asyncio.sleep(0.1)
+            raise PipelineCancelled("Exécution du pipeline annulée")
+
+        tasks = [asyncio.ensure_future(feed()), asyncio.ensure_future(drain())]
+        for position, (stage, batch) in enumerate(zip(self.stages, self.batches)):
+            remaining = [stage.workers]
+            for _ in range(stage.workers):
+                tasks.append(asyncio.ensure_future(
+                    work(stage, batch, queues[position], queues[position + 1], remaining)))
+        tasks.append(asyncio.ensure_future(watch_cancel()))
+
+        try:
+            # La fin du flux en sortie (drain) termine l'exécution ; une erreur ou l'annulation l'interrompt
+            pending = set(tasks)
+            while not tasks[1].done():
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.elapsed = time.perf_counter() - start_time
+        return self.stats()
@@ -29,7 +29,11 @@ class BlowChatInterface:
                  on_closing_callback,
                  on_enrich_database_callback,
                  on_get_available_databases_callback,
-                 on_get_available_sources_callback):
+                 on_get_available_sources_callback,
+                 on_cancel_database_job_callback=None,
+                 on_cancel_youtube_job_callback=None,
+                 on_cancel_generation_callback=None,
+                 on_draft_changed_callback=None):
         """
         Initialisation de l'interface graphique
         
@@ -46,6 +50,10 @@ class BlowChatInterface:
             on_enrich_database_callback: Fonction à appeler pour enrichir une base de données
             on_get_available_databases_callback: Fonction à appeler pour obtenir la liste des bases disponibles
             on_get_available_sources_callback: Fonction à appeler pour obtenir la liste des sources disponibles
+            on_cancel_database_job_callback: Fonction à appeler pour annuler l'opération en cours sur les bases
+            on_cancel_youtube_job_callback: Fonction à appeler pour annuler la récupération YouTube en cours
+            on_cancel_generation_callback: Fonction à appeler pour interrompre la génération de réponse en cours
+            on_draft_changed_callback: Fonction à appeler à chaque modification de la question en cours de saisie
         """
         # Dictionnaire des couleurs disponibles
         self.colors = {
@@ -77,6 +85,10 @@ class BlowChatInterface:
         self.on_enrich_database = on_enrich_database_callback
         self.on_get_available_databases = on_get_available_databases_callback
         self.on_get_available_sources = on_get_available_sources_callback
+        self.on_cancel_database_job = on_cancel_database_job_callback
+        self.on_cancel_youtube_job = on_cancel_youtube_job_callback
+        self.on_cancel_generation = on_cancel_generation_callback
+        self.on_draft_changed = on_draft_changed_callback
         
         # Liste pour suivre les callbacks "after"
         self.after_ids = []
@@ -150,6 +162,8 @@ class BlowChatInterface:
         
         # Lier la touche Entrée au bouton Envoyer
         self.entry.bind("<Return>", self._on_submit_wrapper)
+        # Suivre la saisie pour la recherche anticipée du contexte
+        self.entry.bind("<KeyRelease>", self._on_draft_changed_wrapper)
         
         # Gérer la fermeture de l'application
         self.app.protocol("WM_DELETE_WINDOW", self._on_closing_wrapper)
@@ -302,6 +316,10 @@ class BlowChatInterface:
         send_button = ctk.CTkButton(input_frame, text="Envoyer", command=self._on_submit_wrapper)
         send_button.pack(side="left", padx=5)
         
+        self.stop_button = ctk.CTkButton(input_frame, text="Arrêter", width=100,
+                                         command=self._cancel_generation_wrapper, state="disabled")
+        self.stop_button.pack(side="left", padx=5)
+        
         # Case à cocher pour utiliser la base de données
         options_frame = ctk.CTkFrame(self.assistant_tab)
         options_frame.pack(fill="x", pady=5)
@@ -309,6 +327,14 @@ class BlowChatInterface:
         use_db_checkbox = ctk.CTkCheckBox(options_frame, text="Cocher pour utiliser la base de données", variable=self.use_database)
         use_db_checkbox.pack(side="left", padx=20)
         
+        # État de la génération en cours (recherche dans la base, génération)
+        self.chat_status_label = ctk.CTkLabel(options_frame, text="")
+        self.chat_status_label.pack(side="left", padx=20)
+        
+        # File des questions envoyées pendant une génération (nombre et temps d'attente)
+        self.request_queue_label = ctk.CTkLabel(options_frame, text="")
+        self.request_queue_label.pack(side="right", padx=20)
+        
     def _create_youtube_tab(self):
         """Création du contenu de l'onglet Outil YouTube"""
         youtube_label = ctk.CTkLabel(self.youtube_tab, text="Outil de récupération d'informations et transcription YouTube")
@@ -342,10 +368,30 @@ class BlowChatInterface:
         self.num_videos_entry.pack(pady=5, anchor="w")
         self.num_videos_entry.insert(0, "5")
         
+        target_database_label = ctk.CTkLabel(right_column, text="Base de données à alimenter (optionnel) :")
+        target_database_label.pack(pady=5, anchor="w")
+        self.target_database_entry = ctk.CTkEntry(right_column, width=200, placeholder_text="ex: ma_chaine")
+        self.target_database_entry.pack(pady=5, anchor="w")
+        
         # Bouton de démarrage
         start_button = ctk.CTkButton(right_column, text="Démarrer", command=self._start_youtube_tool_wrapper)
         start_button.pack(pady=20)
         
+        # Progression de la récupération en cours (transcriptions et rapports)
+        progress_frame = ctk.CTkFrame(self.youtube_tab)
+        progress_frame.pack(fill="x", pady=5, padx=10)
+        
+        self.youtube_progress_label = ctk.CTkLabel(progress_frame, text="Aucune récupération en cours")
+        self.youtube_progress_label.pack(side="left", padx=10)
+        
+        self.youtube_cancel_button = ctk.CTkButton(progress_frame, text="Annuler", width=100,
+                                                   command=self._cancel_youtube_job_wrapper, state="disabled")
+        self.youtube_cancel_button.pack(side="right", padx=10, pady=5)
+        
+        self.youtube_progress_bar = ctk.CTkProgressBar(progress_frame)
+        self.youtube_progress_bar.pack(side="right", fill="x", expand=True, padx=10)
+        self.youtube_progress_bar.set(0)
+        
         # Zone de sortie
         self.youtube_output = ctk.CTkTextbox(self.youtube_tab, font=("Arial", 19))
         self.youtube_output.pack(fill='both', expand=True, pady=5, padx=10)
@@ -425,6 +471,21 @@ class BlowChatInterface:
         enrich_button = ctk.CTkButton(enrich_frame, text="Enrichir la base", command=self._enrich_database_wrapper)
         enrich_button.pack(pady=10)
         
+        # Progression de l'opération en cours (création ou enrichissement)
+        progress_frame = ctk.CTkFrame(self.database_tab)
+        progress_frame.pack(fill="x", pady=5, padx=10)
+        
+        self.database_progress_label = ctk.CTkLabel(progress_frame, text="Aucune opération en cours")
+        self.database_progress_label.pack(side="left", padx=10)
+        
+        self.database_cancel_button = ctk.CTkButton(progress_frame, text="Annuler", width=100,
+                                                    command=self._cancel_database_job_wrapper, state="disabled")
+        self.database_cancel_button.pack(side="right", padx=10, pady=5)
+        
+        self.database_progress_bar = ctk.CTkProgressBar(progress_frame)
+        self.database_progress_bar.pack(side="right", fill="x", expand=True, padx=10)
+        self.database_progress_bar.set(0)
+        
         # Zone de sortie
         self.database_output = ctk.CTkTextbox(self.database_tab, font=("Arial", 19))
         self.database_output.pack(fill='both', expand=True, pady=5, padx=10)
@@ -478,6 +539,11 @@ class BlowChatInterface:
                       self.groq_api_key.get(), self.use_database.get(), self.speed_var.get(),
                       self.model_name_var.get())
     
+    def _on_draft_changed_wrapper(self, event=None):
+        """Wrapper pour le callback de modification de la question en cours de saisie"""
+        if self.on_draft_changed:
+            self.on_draft_changed(self.entry.get(), self.use_database.get())
+    
     def _save_conversation_wrapper(self):
         """Wrapper pour le callback de sauvegarde de conversation"""
         file_path = filedialog.asksaveasfilename(defaultextension=".pkl", filetypes=[("Pickle Files", "*.pkl")])
@@ -501,7 +567,8 @@ class BlowChatInterface:
             return
             
         self.on_start_youtube_tool(channel_name, video_ids, num_videos, 
-                                  self.youtube_api_key.get(), self.youtube_output)
+                                  self.youtube_api_key.get(), self.youtube_output,
+                                  self.target_database_entry.get().strip())
     
     def _start_database_tool_wrapper(self):
         """Wrapper pour le callback de démarrage de l'outil de base de données"""
@@ -526,6 +593,26 @@ class BlowChatInterface:
             
         self.on_enrich_database(self.database_output)
     
+    def _cancel_database_job_wrapper(self):
+        """Wrapper pour le callback d'annulation de l'opération en cours sur les bases"""
+        if self.on_cancel_database_job:
+            self.on_cancel_database_job()
+            self.database_cancel_button.configure(state="disabled")
+            self.database_progress_label.configure(text="Annulation en cours...")
+    
+    def _cancel_youtube_job_wrapper(self):
+        """Wrapper pour le callback d'annulation de la récupération YouTube en cours"""
+        if self.on_cancel_youtube_job:
+            self.on_cancel_youtube_job()
+            self.youtube_cancel_button.configure(state="disabled")
+            self.youtube_progress_label.configure(text="Annulation en cours...")
+    
+    def _cancel_generation_wrapper(self):
+        """Wrapper pour le callback d'interruption de la génération de réponse en cours"""
+        if self.on_cancel_generation:
+            self.on_cancel_generation()
+            self.stop_button.configure(state="disabled")
+    
     def _on_closing_wrapper(self):
         """Wrapper pour le callback de fermeture de l'application avec gestion améliorée"""
         # Éviter les appels multiples pendant la fermeture
@@ -1145,6 +1232,99 @@ class BlowChatInterface:
         if self.selected_source_folder.get() not in sources:
             self.selected_source_folder.set(sources[0])
     
+    def show_database_progress(self, name):
+        """
+        Affiche le début d'une opération en arrière-plan sur les bases de données
+        
+        Args:
+            name: Nom de l'opération
+        """
+        self.database_progress_bar.set(0)
+        self.database_progress_label.configure(text=f"{name} : démarrage...")
+        self.database_cancel_button.configure(state="normal")
+    
+    def update_database_progress(self, fraction, text):
+        """
+        Met à jour la barre de progression de l'opération en cours
+        
+        Args:
+            fraction: Avancement entre 0 et 1
+            text: Texte de progression (fichiers, segments, débit, ETA)
+        """
+        self.database_progress_bar.set(fraction)
+        if self.database_cancel_button.cget("state") == "normal":
+            self.database_progress_label.configure(text=text)
+    
+    def hide_database_progress(self, text):
+        """
+        Indique la fin de l'opération en cours sur les bases de données
+        
+        Args:
+            text: Dernier état de la progression
+        """
+        self.database_progress_label.configure(text=f"Terminé · {text}")
+        self.database_cancel_button.configure(state="disabled")
+    
+    def show_youtube_progress(self, name):
+        """
+        Affiche le début d'une récupération YouTube en arrière-plan
+        
+        Args:
+            name: Nom de l'opération
+        """
+        self.youtube_progress_bar.set(0)
+        self.youtube_progress_label.configure(text=f"{name} : démarrage...")
+        self.youtube_cancel_button.configure(state="normal")
+    
+    def update_youtube_progress(self, fraction, text):
+        """
+        Met à jour la barre de progression de la récupération YouTube
+        
+        Args:
+            fraction: Avancement entre 0 et 1
+            text: Texte de progression (vidéos, transcriptions, débit, ETA)
+        """
+        self.youtube_progress_bar.set(fraction)
+        if self.youtube_cancel_button.cget("state") == "normal":
+            self.youtube_progress_label.configure(text=text)
+    
+    def hide_youtube_progress(self, text):
+        """
+        Indique la fin de la récupération YouTube
+        
+        Args:
+            text: Dernier état de la progression
+        """
+        self.youtube_progress_label.configure(text=f"Terminé · {text}")
+        self.youtube_cancel_button.configure(state="disabled")
+    
+    def set_generation_running(self, running):
+        """
+        Active le bouton Arrêter pendant la génération d'une réponse
+        
+        Args:
+            running: True si une réponse est en cours de génération
+        """
+        self.stop_button.configure(state="normal" if running else "disabled")
+    
+    def set_chat_status(self, text):
+        """
+        Affiche l'état de la génération en cours
+        
+        Args:
+            text: État (ex. « Recherche dans la base de données… »), chaîne vide une fois terminée
+        """
+        self.chat_status_label.configure(text=text)
+    
+    def update_request_queue(self, text):
+        """
+        Affiche l'état de la file des questions
+        
+        Args:
+            text: Nombre de questions en attente et temps d'attente (chaîne vide si la file est vide)
+        """
+        self.request_queue_label.configure(text=text)
+    
     def show_active_database_info(self):
         """Affiche les informations sur la base de données active"""
         if not hasattr(self, 'db_info_text'):
@@ -0,0 +1,163 @@
+"""
+Module jobs.py - Exécution des opérations longues en arrière-plan pour Blow Chat YT
+Contient un exécuteur de tâches annulables avec suivi de progression et transmission
+des messages vers l'interface via une file thread-safe.
+"""
+
+import queue
+import threading
+import time
+
+
+class QueuedTextOutput:
+    """
+    Remplaçant d'une zone de texte CustomTkinter utilisable depuis un thread de travail.
+    Les appels à _textbox.insert() sont déposés dans une file et affichés par le thread Tk.
+    """
+
+    def __init__(self, messages):
+        """
+        Initialisation de la sortie
+
+        Args:
+            messages: File thread-safe recevant des tuples (texte, tag)
+        """
+        self._textbox = self
+        self.messages = messages
+
+    def insert(self, index, text, tag='system'):
+        """Dépose un texte à afficher (même signature que Text.insert)"""
+        self.messages.put((text, tag))
+
+    def see(self, index):
+        """Le défilement est géré par le thread Tk lors de l'affichage"""
+
+
+class BackgroundJob:
+    """Tâche exécutée dans un thread, annulable, avec suivi de progression"""
+
+    def __init__(self, name, target, units=("Fichiers", "segments", "seg/s")):
+        """
+        Initialisation de la tâche
+
+        Args:
+            name: Nom de la tâche (affiché dans l'interface)
+            target: Fonction target(job) exécutée dans le thread de travail
+            units: Libellés (éléments traités, résultats produits, débit) de la progression
+        """
+        self.name = name
+        self.target = target
+        self.units = units
+        self.messages = queue.Queue()
+        self.output = QueuedTextOutput(self.messages)
+        self.cancel_event = threading.Event()
+        self.result = None
+        self.error = None
+        self.files_done = 0
+        self.files_total = 0
+        self.chunks_done = 0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        """Exécute la fonction cible et conserve son résultat ou son erreur"""
+        try:
+            self.result = self.target(self)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished_at = time.perf_counter()
+
+    def start(self):
+        """Démarre la tâche dans son thread"""
+        self.started_at = time.perf_counter()
+        self._thread.start()
+
+    def is_alive(self):
+        """Indique si la tâche est en cours d'exécution"""
+        return self._thread.is_alive()
+
+    def cancel(self):
+        """Demande l'annulation de la tâche"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        """Indique si l'annulation a été demandée"""
+        return self.cancel_event.is_set()
+
+    def post(self, text, tag='system'):
+        """Dépose un message à afficher dans l'interface"""
+        self.messages.put((text, tag))
+
+    def update_progress(self, files_done, files_total, chunks_done):
+        """
+        Met à jour la progression (appelé depuis le thread de travail)
+
+        Args:
+            files_done: Nombre de fichiers traités
+            files_total: Nombre total de fichiers à traiter
+            chunks_done: Nombre de segments encodés et indexés
+        """
+        with self._lock:
+            self.files_done = files_done
+            self.files_total = files_total
+            self.chunks_done = chunks_done
+
+    def drain_messages(self):
+        """
+        Récupère tous les messages en attente (appelé depuis le thread Tk)
+
+        Returns:
+            list: Tuples (texte, tag) dans l'ordre de dépôt
+        """
+        messages = []
+        try:
+            while True:
+                messages.append(self.messages.get_nowait())
+        except queue.Empty:
+            pass
+        return messages
+
+    def progress(self):
+        """
+        Calcule un instantané de la progression
+
+        Returns:
+            dict: 'fraction' (0 à 1), 'files_done', 'files_total', 'chunks_done',
+                  'chunks_per_second', 'elapsed' et 'eta' (secondes ou None si inconnue)
+        """
+        with self._lock:
+            files_done, files_total, chunks_done = self.files_done, self.files_total, self.chunks_done
+        end = self.finished_at or time.perf_counter()
+        elapsed = max(end - (self.started_at or end), 1e-9)
+        fraction = files_done / files_total if files_total else 0.0
+        eta = elapsed * (files_total - files_done) / files_done if files_done else None
+        return {
+            'fraction': min(1.0, fraction),
+            'files_done': files_done,
+            'files_total': files_total,
+            'chunks_done': chunks_done,
+            'chunks_per_second': chunks_done / elapsed,
+            'elapsed': elapsed,
+            'eta': eta
+        }
+
+    def format_progress(self):
+        """
+        Formate la progression pour l'affichage
+
+        Returns:
+            str: Texte du type "Fichiers 3/10 · 120 segments · 45.2 seg/s · ETA 00:32"
+        """
+        progress = self.progress()
+        eta = progress['eta']
+        eta_text = f"{int(eta) // 60:02d}:{int(eta) % 60:02d}" if eta is not None else "--:--"
+        items_label, results_label, rate_label = self.units
+        return (
+            f"{items_label} {progress['files_done']}/{progress['files_total']} · "
+            f"{progress['chunks_done']} {results_label} · "
+            f"{progress['chunks_per_second']:.1f} {rate_label} · ETA {eta_text}"
+        )
@@ -0,0 +1,158 @@
+"""
+Module llm_backend.py - Moteurs de génération des réponses pour Blow Chat YT
+Un moteur fournit les clients du modèle (get), la génération en streaming interruptible
+(stream, cancel) et sa fermeture (close) : GroqClientPool pour le service Groq, ou FakeBackend,
+un modèle local simulé (délai avant le premier token, débit, erreurs injectées) permettant de
+mesurer et de tester l'affichage en streaming, l'historique et la recherche sans réseau.
+"""
+
+import random
+import threading
+import time
+
+# Moteurs disponibles ([Model] backend)
+LLM_BACKENDS = ('groq', 'fake')
+
+
+class FakeBackendError(Exception):
+    """Erreur simulée du modèle (injection d'erreurs du moteur 'fake')"""
+
+
+class FakeMessage:
+    """Morceau ou message de réponse simulé (même attribut content que les messages langchain)"""
+
+    def __init__(self, content):
+        self.content = content
+
+
+class FakeChatModel:
+    """Modèle de conversation simulé, déterministe pour une même question"""
+
+    # Mots utilisés pour générer les réponses
+    WORDS = ("la", "vidéo", "explique", "que", "le", "contexte", "montre", "une", "analyse", "des",
+             "données", "et", "la", "réponse", "cite", "les", "sources", "de", "la", "chaîne")
+
+    def __init__(self, model_name, max_tokens, ttft=0.3, tokens_per_second=50.0, answer_tokens=200,
+                 error_rate=0.0, error_after=0, seed=0):
+        """
+        Initialisation du modèle simulé
+
+        Args:
+            model_name: Nom du modèle (repris dans la réponse)
+            max_tokens: Nombre maximal de tokens de la réponse
+            ttft: Délai avant le premier token (secondes)
+            tokens_per_second: Débit de la réponse (0 = sans délai)
+            answer_tokens: Nombre de tokens d'une réponse
+            error_rate: Proportion des générations interrompues par une erreur
+            error_after: Nombre de tokens produits avant l'erreur injectée
+            seed: Graine des réponses et des erreurs
+        """
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.answer_tokens = answer_tokens
+        self.error_rate = error_rate
+        self.error_after = error_after
+        self.seed = seed
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def _question(self, messages):
+        """Retourne la dernière question des messages"""
+        for message in reversed(messages):
+            if getattr(message, 'type', '') == 'human':
+                return message.content
+        return messages[-1].content if messages else ''
+
+    def _wait(self, delay, cancel_event):
+        """Attend un délai, interrompu par cancel_event"""
+        if delay <= 0:
+            return
+        if cancel_event is not None:
+            cancel_event.wait(delay)
+        else:
+            time.sleep(delay)
+
+    def stream(self, messages, cancel_event=None):
+        """
+        Génère une réponse simulée token par token
+
+        Args:
+            messages: Messages de la conversation
+            cancel_event: threading.Event interrompant la génération
+
+        Yields:
+            FakeMessage: Tokens de la réponse
+
+        Raises:
+            FakeBackendError: Erreur injectée (voir error_rate)
+        """
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        question = self._question(messages)
+        rng = random.Random(f"{self.seed}-{question}")
+        # Les erreurs varient d'un appel à l'autre, les réponses non
+        fails = random.Random(f"{self.seed}-{call}").random() < self.error_rate
+        tokens = [f"Réponse simulée de {self.model_name} à « {question[:60]} » :"]
+        tokens += [rng.choice(self.WORDS) for _ in range(max(0, min(self.answer_tokens, self.max_tokens) - 1))]
+        interval = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+        self._wait(self.ttft, cancel_event)
+        for position, token in enumerate(tokens):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            if fails and position >= self.error_after:
+                raise FakeBackendError(f"Erreur simulée du modèle après {position} tokens")
+            if position:
+                self._wait(interval, cancel_event)
+                token = f" {token}"
+            yield FakeMessage(token)
+        if fails:
+            raise FakeBackendError(f"Erreur simulée du modèle après {len(tokens)} tokens")
+
+    def invoke(self, messages):
+        """Retourne la réponse complète (utilisée pour les résumés de la conversation)"""
+        return FakeMessage("".join(chunk.content for chunk in self.stream(messages)))
+
+
+class FakeBackend:
+    """Moteur local simulé : mêmes méthodes que GroqClientPool, sans réseau ni clé API"""
+
+    def __init__(self, ttft=0.3, tokens_per_second=50.0, answer_tokens=200, error_rate=0.0, error_after=0, seed=0):
+        """
+        Initialisation du moteur simulé (voir FakeChatModel pour les paramètres)
+        """
+        self.settings = {
+            'ttft': ttft,
+            'tokens_per_second': tokens_per_second,
+            'answer_tokens': answer_tokens,
+            'error_rate': error_rate,
+            'error_after': error_after,
+            'seed': seed
+        }
+        self.clients = {}
+        self.lock = threading.Lock()
+
+    def get(self, model_name, temperature, max_tokens, api_key):
+        """Retourne le modèle simulé associé à des réglages (la clé API est ignorée)"""
+        with self.lock:
+            key = (model_name, max_tokens)
+            if key not in self.clients:
+                self.clients[key] = FakeChatModel(model_name, max_tokens, **self.settings)
+            return self.clients[key]
+
+    def stream(self, llm, messages, cancel_event=None):
+        """Génère la réponse simulée morceau par morceau (voir GroqClientPool.stream)"""
+        yield from llm.stream(messages, cancel_event)
+
+    def cancel(self, cancel_event):
+        """Interrompt une génération simulée, y compris pendant l'attente d'un token"""
+        cancel_event.set()
+
+    def close(self):
+        """Oublie les modèles simulés"""
+        with self.lock:
+            self.clients.clear()
+
@@ -0,0 +1,232 @@
+"""
+Module pipeline.py - Pipeline à étages pour Blow Chat YT
+Enchaîne des étages exécutés dans des threads, reliés par des files bornées,
+et mesure le débit de chaque étage pour identifier le goulot d'étranglement.
+"""
+
+import queue
+import threading
+import time
+
+# Marqueur de fin de flux transmis d'un étage au suivant
+_END = object()
+
+
+class PipelineCancelled(Exception):
+    """Exception levée lorsque l'exécution du pipeline est annulée"""
+
+
+class PipelineStage:
+    """Étage du pipeline : une fonction appliquée à chaque élément par un ou plusieurs threads"""
+
+    def __init__(self, name, func, workers=1, on_end=None):
+        """
+        Initialisation de l'étage
+
+        Args:
+            name: Nom de l'étage (utilisé dans le rapport de débit)
+            func: Fonction func(item, emit) qui traite un élément et appelle emit() pour chaque sortie
+            workers: Nombre de threads de l'étage
+            on_end: Fonction on_end(emit) appelée une fois en fin de flux (vidage des lots en cours)
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.on_end = on_end
+        self.items_in = 0
+        self.items_out = 0
+        self.busy_time = 0.0
+        self.lock = threading.Lock()
+
+    def stats(self, elapsed):
+        """
+        Calcule les statistiques de débit de l'étage
+
+        Args:
+            elapsed: Durée totale d'exécution du pipeline en secondes
+
+        Returns:
+            dict: Nom, éléments traités, débit (éléments/s) et taux d'occupation
+        """
+        elapsed = max(elapsed, 1e-9)
+        return {
+            'name': self.name,
+            'items_in': self.items_in,
+            'items_out': self.items_out,
+            'throughput': self.items_in / elapsed,
+            'utilization': min(1.0, self.busy_time / (elapsed * self.workers))
+        }
+
+
+class Pipeline:
+    """Pipeline d'étages reliés par des files bornées (contre-pression entre étages)"""
+
+    def __init__(self, queue_size=8, cancel_event=None):
+        """
+        Initialisation du pipeline
+
+        Args:
+            queue_size: Taille maximale des files entre deux étages
+            cancel_event: threading.Event permettant d'annuler l'exécution (optionnel)
+        """
+        self.queue_size = max(1, queue_size)
+        self.stages = []
+        self.cancel_event = cancel_event or threading.Event()
+        self.elapsed = 0.0
+        self._error = None
+
+    def add_stage(self, name, func, workers=1, on_end=None):
+        """
+        Ajoute un étage à la fin du pipeline
+
+        Args:
+            name: Nom de l'étage
+            func: Fonction func(item, emit) de traitement d'un élément
+            workers: Nombre de threads de l'étage
+            on_end: Fonction on_end(emit) appelée en fin de flux
+
+        Returns:
+            Pipeline: Le pipeline lui-même pour chaîner les appels
+        """
+        self.stages.append(PipelineStage(name, func, workers, on_end))
+        return self
+
+    def _stopped(self):
+        """Indique si l'exécution doit s'arrêter (erreur ou annulation)"""
+        return self._error is not None or self.cancel_event.is_set()
+
+    def _put(self, target, item):
+        """Dépose un élément dans une file en restant attentif à l'arrêt du pipeline"""
+        while not self._stopped():
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, source):
+        """Récupère un élément d'une file en restant attentif à l'arrêt du pipeline"""
+        while not self._stopped():
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def run(self, items):
+        """
+        Exécute le pipeline sur une séquence d'éléments et attend la fin du traitement
+
+        Args:
+            items: Éléments d'entrée du premier étage
+
+        Returns:
+            list: Statistiques de débit de chaque étage
+
+        Raises:
+            PipelineCancelled: Si l'exécution a été annulée
+            Exception: Première erreur levée par un étage
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = []
+        start_time = time.perf_counter()
+
+        def feed():
+            try:
+                for item in items:
+                    if self._stopped():
+                        return
+                    self._put(queues[0], item)
+            except Exception as e:
+                self._error = self._error or e
+            finally:
+                self._put(queues[0], _END)
+
+        def work(stage, source, target, remaining):
+            def emit(output):
+                with stage.lock:
+                    stage.items_out += 1
+                self._put(target, output)
+
+            try:
+                while True:
+                    item = self._get(source)
+                    if item is _END:
+                        # Propager la fin de flux aux autres threads du même étage
+                        self._put(source, _END)
+                        break
+                    started = time.perf_counter()
+                    stage.func(item, emit)
+                    with stage.lock:
+                        stage.items_in += 1
+                        stage.busy_time += time.perf_counter() - started
+            except Exception as e:
+                self._error = self._error or e
+            finally:
+                with stage.lock:
+                    remaining[0] -= 1
+                    last_worker = remaining[0] == 0
+                if last_worker:
+                    try:
+                        if stage.on_end and not self._stopped():
+                            started = time.perf_counter()
+                            stage.on_end(emit)
+                            with stage.lock:
+                                stage.busy_time += time.perf_counter() - started
+                    except Exception as e:
+                        self._error = self._error or e
+                    finally:
+                        self._put(target, _END)
+
+        threads.append(threading.Thread(target=feed, daemon=True))
+        for position, stage in enumerate(self.stages):
+            remaining = [stage.workers]
+            for _ in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=work,
+                    args=(stage, queues[position], queues[position + 1], remaining),
+                    daemon=True
+                ))
+
+        for thread in threads:
+            thread.start()
+
+        # Attendre la fin de flux en sortie du dernier étage
+        while self._get(queues[-1]) is not _END:
+            pass
+        for thread in threads:
+            thread.join()
+
+        self.elapsed = time.perf_counter() - start_time
+        if self._error is not None:
+            raise self._error
+        if self.cancel_event.is_set():
+            raise PipelineCancelled("Exécution du pipeline annulée")
+        return self.stats()
+
+    def stats(self):
+        """
+        Retourne les statistiques de débit de chaque étage
+
+        Returns:
+            list: Dictionnaires de statistiques dans l'ordre des étages
+        """
+        return [stage.stats(self.elapsed) for stage in self.stages]
+
+    def format_report(self):
+        """
+        Formate un rapport lisible du débit de chaque étage
+
+        Returns:
+            list: Lignes du rapport, la dernière indiquant le goulot d'étranglement
+        """
+        stats = self.stats()
+        lines = [
+            f"{stat['name']} : {stat['items_in']} éléments, {stat['throughput']:.1f}/s, "
+            f"occupation {100 * stat['utilization']:.0f}%"
+            for stat in stats
+        ]
+        if stats:
+            bottleneck = max(stats, key=lambda stat: stat['utilization'])
+            lines.append(f"Goulot d'étranglement : {bottleneck['name']} ({self.elapsed:.1f}s au total)")
+        return lines
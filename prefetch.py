@@ -0,0 +1,120 @@
+"""
+Module prefetch.py - Recherche anticipée du contexte pour Blow Chat YT
+Pendant la saisie d'une question, le brouillon est encodé et recherché dans la base en
+arrière-plan ; si la question envoyée est identique ou très proche du brouillon, le contexte
+déjà trouvé est réutilisé et la recherche disparaît du délai de réponse.
+"""
+
+import threading
+import time
+from difflib import SequenceMatcher
+
+from response_cache import normalize_question
+
+
+class RetrievalPrefetcher:
+    """Recherche anticipée du dernier brouillon, dans un thread unique"""
+
+    def __init__(self, retrieve, similarity=0.9, min_chars=8):
+        """
+        Initialisation de la recherche anticipée
+
+        Args:
+            retrieve: Fonction retrieve(texte) -> (empreinte de la base, contexte)
+            similarity: Similarité minimale (0 à 1) entre la question envoyée et le brouillon recherché
+            min_chars: Longueur minimale d'un brouillon pour être recherché
+        """
+        self.retrieve = retrieve
+        self.similarity = similarity
+        self.min_chars = min_chars
+        self.condition = threading.Condition()
+        self.pending = None
+        self.inflight = None
+        self.result = None
+        self.worker = None
+        self.searches = 0
+        self.hits = 0
+        self.misses = 0
+
+    def matches(self, query, draft):
+        """Indique si une question est assez proche d'un brouillon pour réutiliser sa recherche"""
+        query, draft = normalize_question(query), normalize_question(draft)
+        return query == draft or SequenceMatcher(None, query, draft).ratio() >= self.similarity
+
+    def prefetch(self, draft):
+        """
+        Demande la recherche d'un brouillon ; seul le plus récent est recherché
+
+        Args:
+            draft: Texte en cours de saisie
+        """
+        draft = draft.strip()
+        if len(draft) < self.min_chars:
+            return
+        with self.condition:
+            if draft in (self.inflight, self.result and self.result[0]):
+                return
+            self.pending = draft
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, daemon=True)
+                self.worker.start()
+
+    def _run(self):
+        """Recherche les brouillons demandés jusqu'à ce qu'il n'y en ait plus"""
+        while True:
+            with self.condition:
+                draft, self.pending = self.pending, None
+                if draft is None:
+                    self.worker = None
+                    return
+                self.inflight = draft
+            started = time.perf_counter()
+            try:
+                database_key, context = self.retrieve(draft)
+                result = (draft, database_key, context, time.perf_counter() - started)
+            except Exception as e:
+                print(f"Erreur lors de la recherche anticipée : {e}")
+                result = None
+            with self.condition:
+                self.searches += 1
+                if result is not None:
+                    self.result = result
+                self.inflight = None
+                self.condition.notify_all()
+
+    def take(self, query, database_key, timeout=5.0):
+        """
+        Retourne le contexte recherché pour un brouillon proche de la question envoyée ;
+        si ce brouillon est en cours de recherche, attend la fin de celle-ci
+
+        Args:
+            query: Question envoyée
+            database_key: Empreinte de la base active (le contexte d'une autre base n'est pas réutilisé)
+            timeout: Attente maximale d'une recherche en cours (secondes)
+
+        Returns:
+            str: Contexte trouvé, ou None s'il faut faire la recherche
+        """
+        with self.condition:
+            deadline = time.monotonic() + timeout
+            while self.inflight is not None and self.matches(query, self.inflight):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            result = self.result
+            if result is not None and result[1] == database_key and self.matches(query, result[0]):
+                self.hits += 1
+                return result[2]
+            self.misses += 1
+            return None
+
+    def stats(self):
+        """
+        Retourne les compteurs de la recherche anticipée
+
+        Returns:
+            dict: 'searches' (brouillons recherchés), 'hits' et 'misses' (questions envoyées)
+        """
+        with self.condition:
+            return {'searches': self.searches, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,289 @@
+"""
+Module quota.py - Ordonnancement des requêtes de l'API YouTube Data pour Blow Chat YT
+Décompte les unités de quota de chaque type d'appel, enregistre la consommation de chaque jour,
+réessaie les erreurs temporaires avec un délai exponentiel aléatoire et plafonne une importation
+à un budget d'unités.
+"""
+
+import json
+import os
+import random
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from googleapiclient.errors import HttpError
+
+from fetcher import TokenBucket
+from pipeline import PipelineCancelled
+
+# Coût en unités de quota de chaque type d'appel (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    'search.list': 100,
+    'channels.list': 1,
+    'playlistItems.list': 1,
+    'videos.list': 1
+}
+
+# Statuts HTTP temporaires (réessayés)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Raisons d'une erreur 403 liées au débit (réessayées) et à l'épuisement du quota (définitives)
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+QUOTA_REASONS = ('quotaExceeded', 'dailyLimitExceeded')
+
+
+class QuotaExceeded(Exception):
+    """Exception levée lorsque le quota du jour ou le budget de l'importation est épuisé"""
+
+
+def quota_day():
+    """
+    Retourne le jour de quota en cours : le quota de l'API YouTube est remis à zéro à minuit, heure du Pacifique
+
+    Returns:
+        str: Date au format AAAA-MM-JJ
+    """
+    try:
+        from zoneinfo import ZoneInfo
+        now = datetime.now(ZoneInfo('America/Los_Angeles'))
+    except Exception:
+        # Python < 3.9 ou base des fuseaux absente : heure normale du Pacifique
+        now = datetime.now(timezone(timedelta(hours=-8)))
+    return now.strftime('%Y-%m-%d')
+
+
+def describe_error(error):
+    """
+    Décrit une erreur sans l'URL de la requête (qui contient la clé API)
+
+    Args:
+        error: Exception levée par l'exécution de la requête
+
+    Returns:
+        str: Statut HTTP et raison, ou type et message de l'erreur
+    """
+    if isinstance(error, HttpError):
+        return f"HTTP {error.resp.status} {error_reason(error)}".strip()
+    return f"{type(error).__name__}: {error}"
+
+
+def error_reason(error):
+    """
+    Extrait la raison d'une erreur de l'API YouTube
+
+    Args:
+        error: HttpError levée par le client
+
+    Returns:
+        str: Raison (ex. 'quotaExceeded') ou chaîne vide
+    """
+    try:
+        content = error.content.decode('utf-8') if isinstance(error.content, bytes) else error.content
+        return json.loads(content)['error']['errors'][0].get('reason', '')
+    except Exception:
+        return ''
+
+
+class QuotaScheduler:
+    """Exécute les requêtes de l'API YouTube Data en respectant un débit, un quota et un budget"""
+
+    def __init__(self, usage_path, daily_limit=10000, max_retries=5, backoff_base=1.0, backoff_max=60.0, rate=10.0):
+        """
+        Initialisation de l'ordonnanceur
+
+        Args:
+            usage_path: Fichier JSON de la consommation par jour
+            daily_limit: Quota quotidien du projet (unités, 0 = pas de limite)
+            max_retries: Nombre maximal de nouvelles tentatives après une erreur temporaire
+            backoff_base: Délai de la première nouvelle tentative (secondes), doublé à chaque essai
+            backoff_max: Délai maximal entre deux tentatives (secondes)
+            rate: Nombre maximal de requêtes par seconde (0 = pas de limite)
+        """
+        self.usage_path = usage_path
+        self.daily_limit = daily_limit
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = TokenBucket(rate, rate)
+        self.lock = threading.Lock()
+        self.usage = self.load_usage()
+        self.budget_limit = 0
+        self.budget_used = 0
+
+    def load_usage(self):
+        """
+        Charge la consommation enregistrée
+
+        Returns:
+            dict: {jour: {'units', 'calls': {type d'appel: {'count', 'units', 'retries', 'errors'}}}}
+        """
+        if not os.path.exists(self.usage_path):
+            return {}
+        try:
+            with open(self.usage_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Impossible de charger la consommation du quota YouTube : {e}")
+            return {}
+
+    def save_usage(self):
+        """Enregistre la consommation de façon atomique (appelé sous self.lock)"""
+        folder = os.path.dirname(self.usage_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(f"{self.usage_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(self.usage, f, ensure_ascii=False, indent=2)
+        os.replace(f"{self.usage_path}.tmp", self.usage_path)
+
+    def used_today(self):
+        """Retourne le nombre d'unités consommées aujourd'hui"""
+        with self.lock:
+            return self.usage.get(quota_day(), {}).get('units', 0)
+
+    def today(self):
+        """
+        Retourne la consommation du jour
+
+        Returns:
+            dict: 'day', 'units', 'daily_limit', 'calls' et, pendant une importation, 'budget' et 'budget_used'
+        """
+        with self.lock:
+            day = quota_day()
+            usage = self.usage.get(day, {})
+            summary = {
+                'day': day,
+                'units': usage.get('units', 0),
+                'daily_limit': self.daily_limit,
+                'calls': usage.get('calls', {})
+            }
+            if self.budget_limit:
+                summary['budget'] = self.budget_limit
+                summary['budget_used'] = self.budget_used
+            return summary
+
+    def reserve(self, call_type):
+        """
+        Réserve les unités d'un appel avant son exécution (chaque tentative est décomptée,
+        l'API facturant aussi les requêtes en erreur)
+
+        Args:
+            call_type: Type d'appel (clé de QUOTA_COSTS)
+
+        Raises:
+            QuotaExceeded: Si l'appel dépasserait le quota du jour ou le budget de l'importation
+        """
+        cost = QUOTA_COSTS.get(call_type, 1)
+        with self.lock:
+            day = quota_day()
+            usage = self.usage.setdefault(day, {'units': 0, 'calls': {}})
+            if self.daily_limit and usage['units'] + cost > self.daily_limit:
+                raise QuotaExceeded(f"Quota YouTube du jour épuisé ({usage['units']}/{self.daily_limit} unités)")
+            if self.budget_limit and self.budget_used + cost > self.budget_limit:
+                raise QuotaExceeded(f"Budget de l'importation atteint ({self.budget_used}/{self.budget_limit} unités)")
+            usage['units'] += cost
+            self.budget_used += cost
+            calls = usage['calls'].setdefault(call_type, {'count': 0, 'units': 0, 'retries': 0, 'errors': 0})
+            calls['count'] += 1
+            calls['units'] += cost
+            self.save_usage()
+
+    def record(self, call_type, field):
+        """Incrémente un compteur ('retries' ou 'errors') d'un type d'appel du jour"""
+        with self.lock:
+            usage = self.usage.setdefault(quota_day(), {'units': 0, 'calls': {}})
+            calls = usage['calls'].setdefault(call_type, {'count': 0, 'units': 0, 'retries': 0, 'errors': 0})
+            calls[field] += 1
+            self.save_usage()
+
+    def is_retryable(self, error):
+        """
+        Indique si une erreur est temporaire
+
+        Args:
+            error: Exception levée par l'exécution de la requête
+
+        Returns:
+            bool: True pour une erreur de débit, de serveur ou de connexion
+        """
+        if isinstance(error, HttpError):
+            status = error.resp.status
+            if status == 403:
+                return error_reason(error) in RATE_LIMIT_REASONS
+            return status in RETRY_STATUSES
+        return isinstance(error, (socket.timeout, ConnectionError, TimeoutError))
+
+    def backoff_delay(self, attempt):
+        """
+        Délai avant une nouvelle tentative : exponentiel, plafonné et aléatoire (« full jitter »)
+
+        Args:
+            attempt: Numéro de la nouvelle tentative (0 pour la première)
+
+        Returns:
+            float: Délai en secondes
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def execute(self, request, call_type, cancel_event=None):
+        """
+        Exécute une requête de l'API YouTube Data
+
+        Args:
+            request: Requête construite par le client (HttpRequest)
+            call_type: Type d'appel (clé de QUOTA_COSTS) utilisé pour le décompte
+            cancel_event: threading.Event interrompant l'attente entre deux tentatives
+
+        Returns:
+            dict: Réponse de l'API
+
+        Raises:
+            QuotaExceeded: Quota du jour épuisé (signalé par l'API ou atteint localement) ou budget atteint
+            PipelineCancelled: Si l'annulation a été demandée pendant une attente
+            HttpError: Erreur définitive, ou temporaire après max_retries nouvelles tentatives
+        """
+        attempt = 0
+        while True:
+            self.reserve(call_type)
+            if not self.limiter.acquire(cancel_event):
+                raise PipelineCancelled("Requête YouTube annulée")
+            try:
+                return request.execute()
+            except Exception as e:
+                if isinstance(e, HttpError) and error_reason(e) in QUOTA_REASONS:
+                    self.record(call_type, 'errors')
+                    raise QuotaExceeded(f"Quota YouTube épuisé selon l'API ({call_type}) : {describe_error(e)}") from e
+                if not self.is_retryable(e) or attempt >= self.max_retries:
+                    self.record(call_type, 'errors')
+                    raise
+                delay = self.backoff_delay(attempt)
+                attempt += 1
+                self.record(call_type, 'retries')
+                print(f"Erreur temporaire de l'API YouTube ({call_type}) : {describe_error(e)} - nouvelle tentative {attempt}/{self.max_retries} dans {delay:.1f}s")
+                if cancel_event is not None:
+                    if cancel_event.wait(delay):
+                        raise PipelineCancelled("Requête YouTube annulée")
+                else:
+                    time.sleep(delay)
+
+    @contextmanager
+    def budget(self, max_units):
+        """
+        Plafonne les unités consommées par une importation (une importation à la fois)
+
+        Args:
+            max_units: Budget en unités (0 = pas de plafond autre que le quota du jour)
+
+        Yields:
+            QuotaScheduler: L'ordonnanceur, dont budget_used donne les unités consommées
+        """
+        with self.lock:
+            self.budget_limit = max_units
+            self.budget_used = 0
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.budget_limit = 0
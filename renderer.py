@@ -0,0 +1,108 @@
+"""
+Module renderer.py - Affichage des réponses en streaming pour Blow Chat YT
+Les morceaux de texte reçus du modèle sont accumulés puis affichés par images, à une cadence
+fixe : le texte d'une image est regroupé en une insertion par suite de morceaux de même tag,
+et la vitesse choisie limite le nombre de tokens révélés par seconde.
+"""
+
+import time
+from collections import deque
+
+# Vitesses de l'interface et options correspondantes de la section [Stream] ; les anciennes
+# options lent, normal, rapide, tres_rapide et turbo (intervalle de lecture de la file) sont ignorées
+STREAM_SPEEDS = {
+    "Lent": 'lent_token_ms',
+    "Normal": 'normal_token_ms',
+    "Rapide": 'rapide_token_ms',
+    "Très Rapide": 'tres_rapide_token_ms',
+    "Turbo": 'turbo_token_ms'
+}
+
+# Délai entre deux tokens affichés, en millisecondes (0 = sans limite)
+DEFAULT_TOKEN_INTERVALS = {
+    'lent_token_ms': 60,
+    'normal_token_ms': 25,
+    'rapide_token_ms': 10,
+    'tres_rapide_token_ms': 4,
+    'turbo_token_ms': 0
+}
+
+
+def stream_intervals(config):
+    """
+    Calcule une fois pour toutes le délai entre deux tokens de chaque vitesse
+
+    Args:
+        config: ConfigParser de l'application (section [Stream])
+
+    Returns:
+        dict: {vitesse de l'interface: délai entre deux tokens en secondes}
+    """
+    return {
+        speed: max(0.0, config.getfloat('Stream', option, fallback=DEFAULT_TOKEN_INTERVALS[option])) / 1000
+        for speed, option in STREAM_SPEEDS.items()
+    }
+
+
+class StreamRenderer:
+    """Texte en attente d'affichage, révélé image par image au rythme de la vitesse choisie"""
+
+    def __init__(self, token_interval=0.0, frame_rate=30, clock=time.perf_counter):
+        """
+        Initialisation de l'affichage
+
+        Args:
+            token_interval: Délai minimal entre deux tokens du modèle (secondes, 0 = sans limite)
+            frame_rate: Nombre d'images affichées par seconde
+            clock: Horloge en secondes (remplaçable pour les mesures)
+        """
+        self.token_interval = token_interval
+        self.frame_delay = max(1, round(1000 / max(1, frame_rate)))
+        self.clock = clock
+        self.backlog = deque()
+        self.credit = 0.0
+        self.last_frame = None
+
+    @property
+    def pending(self):
+        """Indique s'il reste du texte à afficher"""
+        return bool(self.backlog)
+
+    def feed(self, text, tag):
+        """Ajoute un morceau de texte reçu"""
+        if text:
+            self.backlog.append((text, tag))
+
+    def frame(self, flush=False):
+        """
+        Retourne le texte de l'image suivante ; seuls les tokens du modèle (tag 'model') sont
+        limités par la vitesse, les autres messages sont affichés dès leur tour
+
+        Args:
+            flush: Afficher tout le texte en attente (fin ou interruption de la génération)
+
+        Returns:
+            list: Suites [(texte, tag)] à insérer, une par changement de tag
+        """
+        now = self.clock()
+        if self.last_frame is not None and self.token_interval > 0:
+            self.credit += (now - self.last_frame) / self.token_interval
+        self.last_frame = now
+        unlimited = flush or self.token_interval <= 0
+
+        runs = []
+        while self.backlog:
+            text, tag = self.backlog[0]
+            if tag == 'model' and not unlimited:
+                if self.credit < 1:
+                    break
+                self.credit -= 1
+            self.backlog.popleft()
+            if runs and runs[-1][1] == tag:
+                runs[-1][0] += text
+            else:
+                runs.append([text, tag])
+        if not self.backlog:
+            # Pas d'avance accumulée pendant l'attente du modèle
+            self.credit = min(self.credit, 1.0)
+        return [(text, tag) for text, tag in runs]
@@ -0,0 +1,185 @@
+"""
+Module response_cache.py - Cache des réponses du modèle pour Blow Chat YT
+Évite de renvoyer au modèle une question déjà posée dans les mêmes conditions : la clé exacte
+réunit le modèle, le message système (personnalité et contexte retrouvé) et la question
+normalisée ; le mode sémantique retrouve aussi les questions presque identiques posées au même
+modèle, avec la même personnalité et la même base, par similarité de leurs embeddings.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+
+# Modes du cache ([Model] response_cache)
+CACHE_MODES = ('off', 'exact', 'semantic')
+
+
+def normalize_question(question):
+    """
+    Normalise une question pour la comparaison exacte
+
+    Args:
+        question: Question de l'utilisateur
+
+    Returns:
+        str: Question en minuscules, espaces réduits, sans ponctuation finale
+    """
+    question = unicodedata.normalize('NFKC', question).lower()
+    question = re.sub(r'\s+', ' ', question).strip()
+    return question.rstrip(' ?!.…')
+
+
+def fingerprint(*parts):
+    """Empreinte SHA-256 d'une suite de chaînes"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def unit_vector(vector):
+    """Retourne l'embedding normalisé (norme 1) d'une question, ou None"""
+    if vector is None:
+        return None
+    vector = np.asarray(vector, dtype='float32')
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else None
+
+
+class ResponseCache:
+    """Réponses du modèle conservées en mémoire et sur disque, avec durée de vie et taille maximale"""
+
+    def __init__(self, path, mode='exact', max_entries=500, ttl=86400, threshold=0.92):
+        """
+        Initialisation du cache
+
+        Args:
+            path: Fichier où conserver le cache entre deux sessions
+            mode: 'off', 'exact' ou 'semantic'
+            max_entries: Nombre maximal de réponses (les moins récemment utilisées sont oubliées)
+            ttl: Durée de vie d'une réponse (secondes, 0 = illimitée)
+            threshold: Similarité cosinus minimale entre deux questions en mode sémantique
+        """
+        self.path = path
+        self.mode = mode if mode in CACHE_MODES else 'exact'
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.threshold = threshold
+        self.lock = threading.Lock()
+        self.entries = self.load() if self.enabled else OrderedDict()
+
+    @property
+    def enabled(self):
+        """Indique si le cache est actif"""
+        return self.mode != 'off'
+
+    @property
+    def semantic(self):
+        """Indique si les questions presque identiques sont aussi retrouvées"""
+        return self.mode == 'semantic'
+
+    def load(self):
+        """
+        Charge le cache enregistré
+
+        Returns:
+            OrderedDict: {clé: {'answer', 'created', 'scope', 'vector'}}, du moins au plus récemment utilisé
+        """
+        if not os.path.exists(self.path):
+            return OrderedDict()
+        try:
+            with open(self.path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Impossible de charger le cache des réponses : {e}")
+            return OrderedDict()
+
+    def save(self):
+        """Enregistre le cache de façon atomique (appelé sous self.lock)"""
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(f"{self.path}.tmp", 'wb') as f:
+            pickle.dump(self.entries, f)
+        os.replace(f"{self.path}.tmp", self.path)
+
+    def _purge(self):
+        """Oublie les réponses expirées puis les plus anciennes au-delà de la taille maximale"""
+        if self.ttl:
+            limit = time.time() - self.ttl
+            for key in [key for key, entry in self.entries.items() if entry['created'] < limit]:
+                del self.entries[key]
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key, scope=None, vector=None):
+        """
+        Cherche la réponse d'une question
+
+        Args:
+            key: Clé exacte (voir fingerprint)
+            scope: Conditions de la question pour la recherche sémantique (modèle, personnalité, base)
+            vector: Embedding de la question (mode sémantique)
+
+        Returns:
+            tuple: (réponse, similarité) ou None ; la similarité vaut 1.0 pour une clé exacte
+        """
+        if not self.enabled:
+            return None
+        with self.lock:
+            self._purge()
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry['answer'], 1.0
+            vector = unit_vector(vector) if self.semantic else None
+            if vector is None:
+                return None
+            best_key, best_similarity = None, self.threshold
+            for candidate_key, candidate in self.entries.items():
+                if candidate['scope'] != scope or candidate['vector'] is None:
+                    continue
+                similarity = float(np.dot(candidate['vector'], vector))
+                if similarity >= best_similarity:
+                    best_key, best_similarity = candidate_key, similarity
+            if best_key is None:
+                return None
+            self.entries.move_to_end(best_key)
+            return self.entries[best_key]['answer'], best_similarity
+
+    def put(self, key, answer, scope=None, vector=None):
+        """
+        Conserve la réponse d'une question
+
+        Args:
+            key: Clé exacte
+            answer: Réponse complète du modèle
+            scope: Conditions de la question pour la recherche sémantique
+            vector: Embedding de la question (mode sémantique)
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            vector = unit_vector(vector) if self.semantic else None
+            self.entries[key] = {'answer': answer, 'created': time.time(), 'scope': scope, 'vector': vector}
+            self.entries.move_to_end(key)
+            self._purge()
+            try:
+                self.save()
+            except Exception as e:
+                print(f"Impossible d'enregistrer le cache des réponses : {e}")
+
+    def clear(self):
+        """Vide le cache et supprime sa copie sur disque"""
+        with self.lock:
+            self.entries.clear()
+            if os.path.exists(self.path):
+                os.remove(self.path)
@@ -0,0 +1,156 @@
+"""
+Module scheduler.py - Ordonnancement des questions d'une conversation pour Blow Chat YT
+Une seule réponse est générée à la fois par conversation : une question envoyée pendant une
+génération est mise en file, remplace la précédente ou est refusée selon la politique choisie,
+et une question identique à une question en attente n'est pas mise en file une seconde fois (une
+relance identique à la question en cours, comme « continue », est une nouvelle question).
+"""
+
+import threading
+import time
+from collections import deque
+
+from response_cache import normalize_question
+
+# Politiques disponibles ([Model] request_policy)
+REQUEST_POLICIES = ('queue', 'replace', 'reject')
+
+
+class ScheduledRequest:
+    """Question d'une conversation et ses instants de soumission et de démarrage"""
+
+    def __init__(self, question, payload):
+        """
+        Args:
+            question: Question de l'utilisateur
+            payload: Paramètres de la génération, transmis tels quels à la fonction de démarrage
+        """
+        self.question = question
+        self.payload = payload
+        self.submitted = time.perf_counter()
+        self.started = None
+
+    @property
+    def wait_time(self):
+        """Temps passé en file avant le démarrage (secondes)"""
+        return (self.started or time.perf_counter()) - self.submitted
+
+
+class RequestScheduler:
+    """File des questions d'une conversation : une génération à la fois, dans l'ordre d'arrivée"""
+
+    def __init__(self, start, policy='queue', max_queue=5):
+        """
+        Initialisation de l'ordonnanceur
+
+        Args:
+            start: Fonction start(request) qui lance la génération d'une question ; finish doit
+                   être appelée à la fin de cette génération
+            policy: 'queue' (mise en file), 'replace' (la nouvelle question remplace la
+                    génération en cours et les questions en attente) ou 'reject' (refus)
+            max_queue: Nombre maximal de questions en attente (politique 'queue')
+        """
+        self.start = start
+        self.policy = policy if policy in REQUEST_POLICIES else 'queue'
+        self.max_queue = max(1, max_queue)
+        self.pending = deque()
+        self.running = None
+        # Réentrant : la fonction de démarrage peut consulter l'état de la file
+        self.lock = threading.RLock()
+        self.served = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def is_duplicate(self, question):
+        """
+        Indique si une question identique est déjà en attente (appelé sous self.lock) ; la question
+        en cours n'est pas comparée : la même relance sera traitée après sa réponse, avec un autre historique
+        """
+        normalized = normalize_question(question)
+        return any(normalize_question(request.question) == normalized for request in self.pending)
+
+    def submit(self, question, payload):
+        """
+        Soumet une question
+
+        Args:
+            question: Question de l'utilisateur
+            payload: Paramètres de la génération
+
+        Returns:
+            tuple: (décision, position) ; décision parmi 'started', 'queued', 'replaced' (la
+                   génération en cours doit être interrompue par l'appelant), 'duplicate' et
+                   'rejected' ; position dans la file pour 'queued' et 'replaced', 0 sinon
+        """
+        request = ScheduledRequest(question, payload)
+        with self.lock:
+            if self.running is None:
+                self._start(request)
+                return 'started', 0
+            if self.is_duplicate(question):
+                return 'duplicate', 0
+            if self.policy == 'reject':
+                return 'rejected', 0
+            if self.policy == 'replace':
+                self.pending.clear()
+                self.pending.append(request)
+                return 'replaced', 1
+            if len(self.pending) >= self.max_queue:
+                return 'rejected', 0
+            self.pending.append(request)
+            return 'queued', len(self.pending)
+
+    def _start(self, request):
+        """Démarre une question (appelé sous self.lock)"""
+        request.started = time.perf_counter()
+        self.running = request
+        self.served += 1
+        self.total_wait += request.wait_time
+        self.max_wait = max(self.max_wait, request.wait_time)
+        self.start(request)
+
+    def finish(self):
+        """
+        Signale la fin de la génération en cours et démarre la question suivante
+
+        Returns:
+            ScheduledRequest: Question démarrée, ou None si la file est vide
+        """
+        with self.lock:
+            self.running = None
+            if not self.pending:
+                return None
+            request = self.pending.popleft()
+            self._start(request)
+            return request
+
+    def clear(self):
+        """
+        Abandonne les questions en attente (la génération en cours n'est pas interrompue)
+
+        Returns:
+            int: Nombre de questions abandonnées
+        """
+        with self.lock:
+            dropped = len(self.pending)
+            self.pending.clear()
+            return dropped
+
+    def stats(self):
+        """
+        Retourne l'état de la file
+
+        Returns:
+            dict: 'policy', 'running', 'depth' (questions en attente), 'served', 'average_wait',
+                  'max_wait' et 'oldest_wait' (attente de la plus ancienne question en file), en secondes
+        """
+        with self.lock:
+            return {
+                'policy': self.policy,
+                'running': self.running is not None,
+                'depth': len(self.pending),
+                'served': self.served,
+                'average_wait': self.total_wait / self.served if self.served else 0.0,
+                'max_wait': self.max_wait,
+                'oldest_wait': self.pending[0].wait_time if self.pending else 0.0
+            }
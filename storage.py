@@ -0,0 +1,181 @@
+"""
+Module storage.py - Stockage des fichiers texte de Blow Chat YT
+Écrit les transcriptions et les rapports en clair ou compressés (gzip, un fichier par document)
+et les relit de façon transparente : un fichier est toujours désigné par son nom logique
+(ex. 'abc.txt'), qu'il soit stocké sous 'abc.txt' ou 'abc.txt.gz'.
+"""
+
+import gzip
+import hashlib
+import os
+
+# Suffixe des fichiers compressés
+COMPRESSED_SUFFIX = '.gz'
+
+# Modes de stockage disponibles ([YouTube] compression)
+COMPRESSION_MODES = ('none', 'gzip')
+
+
+def logical_name(filename):
+    """
+    Retourne le nom logique d'un fichier stocké
+
+    Args:
+        filename: Nom ou chemin du fichier, compressé ou non
+
+    Returns:
+        str: Nom sans le suffixe de compression
+    """
+    if filename.endswith(COMPRESSED_SUFFIX):
+        return filename[:-len(COMPRESSED_SUFFIX)]
+    return filename
+
+
+def stored_path(path):
+    """
+    Retourne le chemin réel d'un fichier désigné par son chemin logique
+
+    Args:
+        path: Chemin logique du fichier
+
+    Returns:
+        str: Chemin du fichier en clair, sinon du fichier compressé, sinon None
+    """
+    path = logical_name(path)
+    if os.path.isfile(path):
+        return path
+    if os.path.isfile(path + COMPRESSED_SUFFIX):
+        return path + COMPRESSED_SUFFIX
+    return None
+
+
+def exists(path):
+    """Indique si un fichier existe, en clair ou compressé"""
+    return stored_path(path) is not None
+
+
+def read_bytes(path):
+    """
+    Lit le contenu d'un fichier, décompressé si nécessaire
+
+    Args:
+        path: Chemin logique du fichier
+
+    Returns:
+        bytes: Contenu du fichier
+
+    Raises:
+        FileNotFoundError: Si le fichier n'existe sous aucune forme
+    """
+    real_path = stored_path(path)
+    if real_path is None:
+        raise FileNotFoundError(f"Fichier introuvable : {path}")
+    if real_path.endswith(COMPRESSED_SUFFIX):
+        with gzip.open(real_path, 'rb') as f:
+            return f.read()
+    with open(real_path, 'rb') as f:
+        return f.read()
+
+
+def read_text(path):
+    """Lit le texte UTF-8 d'un fichier, décompressé si nécessaire"""
+    return read_bytes(path).decode('utf-8')
+
+
+def write_bytes(path, data, compression='none', level=6):
+    """
+    Écrit un fichier de façon atomique, en clair ou compressé ; l'autre forme du même
+    fichier éventuellement présente est supprimée
+
+    Args:
+        path: Chemin logique du fichier
+        data: Contenu à écrire
+        compression: 'none' ou 'gzip'
+        level: Niveau de compression gzip (1 à 9)
+
+    Returns:
+        str: Chemin réel du fichier écrit
+    """
+    path = logical_name(path)
+    if compression == 'gzip':
+        target, other = path + COMPRESSED_SUFFIX, path
+        # mtime=0 : un même contenu donne toujours le même fichier
+        data = gzip.compress(data, compresslevel=level, mtime=0)
+    else:
+        target, other = path, path + COMPRESSED_SUFFIX
+    with open(f"{target}.tmp", 'wb') as f:
+        f.write(data)
+    os.replace(f"{target}.tmp", target)
+    if os.path.exists(other):
+        os.remove(other)
+    return target
+
+
+def write_text(path, text, compression='none', level=6):
+    """Écrit un fichier texte UTF-8 de façon atomique, en clair ou compressé (voir write_bytes)"""
+    return write_bytes(path, text.encode('utf-8'), compression, level)
+
+
+def content_hash(path):
+    """
+    Calcule l'empreinte SHA-256 du contenu décompressé d'un fichier : compresser ou
+    décompresser un fichier ne change pas son empreinte
+
+    Args:
+        path: Chemin logique ou réel du fichier
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    real_path = stored_path(path)
+    if real_path is None:
+        raise FileNotFoundError(f"Fichier introuvable : {path}")
+    digest = hashlib.sha256()
+    opener = gzip.open if real_path.endswith(COMPRESSED_SUFFIX) else open
+    with opener(real_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def list_files(folder, extensions):
+    """
+    Liste les fichiers d'un dossier ayant une des extensions données, en clair ou compressés,
+    en un seul parcours du dossier
+
+    Args:
+        folder: Dossier à parcourir
+        extensions: Tuple des extensions logiques acceptées (ex. ('.txt', '.pdf'))
+
+    Returns:
+        list: Noms logiques des fichiers, triés et sans doublon
+    """
+    compressed_extensions = tuple(extension + COMPRESSED_SUFFIX for extension in extensions)
+    names = set()
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if entry.name.endswith(extensions + compressed_extensions) and entry.is_file():
+                names.add(logical_name(entry.name))
+    return sorted(names)
+
+
+def convert_file(path, compression='gzip', level=6):
+    """
+    Stocke un fichier existant sous la forme demandée en conservant sa date de modification
+
+    Args:
+        path: Chemin logique du fichier
+        compression: 'none' ou 'gzip'
+        level: Niveau de compression gzip
+
+    Returns:
+        tuple: (taille avant, taille après) en octets, ou None si le fichier est déjà sous cette forme
+    """
+    real_path = stored_path(path)
+    if real_path is None or real_path.endswith(COMPRESSED_SUFFIX) == (compression == 'gzip'):
+        return None
+    size_before = os.path.getsize(real_path)
+    source_stat = os.stat(real_path)
+    target = write_bytes(path, read_bytes(real_path), compression, level)
+    os.utime(target, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    return size_before, os.path.getsize(target)
@@ -0,0 +1,296 @@
+"""
+Module transport.py - Couche de transport de l'ingestion YouTube pour Blow Chat YT
+Permet de remplacer les appels à l'API YouTube Data et à l'API des transcriptions par un
+enregistrement local rejoué hors ligne, ou par une chaîne synthétique de taille et de latence
+configurables, afin de mesurer l'ingestion de façon reproductible sans réseau.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import httplib2
+from youtube_transcript_api import YouTubeTranscriptApi
+
+# Modes de transport disponibles ([YouTube] transport)
+TRANSPORT_MODES = ('live', 'record', 'replay', 'synthetic')
+
+
+class ReplayMiss(Exception):
+    """Exception levée lorsqu'une requête rejouée n'a pas été enregistrée"""
+
+
+def _make_response(status, headers, content):
+    """Construit une réponse httplib2 à partir d'un statut, d'en-têtes et d'un contenu"""
+    info = {key.lower(): value for key, value in headers.items()}
+    info['status'] = str(status)
+    return httplib2.Response(info), content
+
+
+class Cassette:
+    """Enregistrement sur disque de réponses, une réponse par fichier JSON indexé par l'empreinte de la requête"""
+
+    def __init__(self, folder):
+        """
+        Initialisation de l'enregistrement
+
+        Args:
+            folder: Dossier des réponses enregistrées
+        """
+        self.folder = folder
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def _path(self, key):
+        """Retourne le chemin du fichier d'une requête"""
+        return os.path.join(self.folder, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json")
+
+    def get(self, key):
+        """
+        Retourne la réponse enregistrée pour une requête
+
+        Raises:
+            ReplayMiss: Si la requête n'a pas été enregistrée
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise ReplayMiss(f"Requête absente de l'enregistrement '{self.folder}' : {key}")
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['response']
+
+    def put(self, key, response):
+        """Enregistre la réponse d'une requête"""
+        path = self._path(key)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump({'request': key, 'response': response}, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+
+def _request_key(method, uri, body):
+    """
+    Clé d'une requête HTTP, sans la clé API (jamais enregistrée sur disque)
+
+    Returns:
+        str: Méthode, URI aux paramètres triés et corps de la requête
+    """
+    parsed = urlparse(uri)
+    query = sorted((name, value) for name, value in parse_qsl(parsed.query) if name != 'key')
+    uri = urlunparse(parsed._replace(query=urlencode(query)))
+    if isinstance(body, bytes):
+        body = body.decode('utf-8', errors='replace')
+    return f"{method} {uri} {body or ''}"
+
+
+class RecordingHttp:
+    """Transport HTTP qui enregistre chaque réponse d'un transport réel"""
+
+    def __init__(self, http, cassette):
+        """
+        Args:
+            http: Transport réel (PooledHttp)
+            cassette: Cassette où enregistrer les réponses
+        """
+        self.http = http
+        self.cassette = cassette
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        """Exécute la requête sur le transport réel et enregistre la réponse"""
+        response, content = self.http.request(uri, method=method, body=body, headers=headers, **kwargs)
+        self.cassette.put(_request_key(method, uri, body), {
+            'status': response.status,
+            'headers': {key: value for key, value in response.items() if key != 'status'},
+            'content': content.decode('utf-8', errors='replace')
+        })
+        return response, content
+
+    def close(self):
+        """Ferme le transport réel"""
+        self.http.close()
+
+
+class ReplayHttp:
+    """Transport HTTP qui rejoue les réponses enregistrées, sans réseau"""
+
+    def __init__(self, cassette, latency=0.0):
+        """
+        Args:
+            cassette: Cassette contenant les réponses
+            latency: Délai simulé de chaque requête (secondes)
+        """
+        self.cassette = cassette
+        self.latency = latency
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        """Retourne la réponse enregistrée pour la requête"""
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.cassette.get(_request_key(method, uri, body))
+        return _make_response(recorded['status'], recorded['headers'], recorded['content'].encode('utf-8'))
+
+    def close(self):
+        """Rien à fermer"""
+
+
+class LiveTranscriptSource:
+    """Source des transcriptions : API des transcriptions YouTube"""
+
+    def get_transcript(self, video_id, languages):
+        """
+        Récupère les segments de la transcription d'une vidéo
+
+        Returns:
+            list: Segments {'text', 'start', 'duration'}
+        """
+        return YouTubeTranscriptApi.get_transcript(video_id, languages)
+
+
+class RecordingTranscriptSource:
+    """Source des transcriptions qui enregistre les réponses (et les erreurs) d'une source réelle"""
+
+    def __init__(self, source, cassette):
+        self.source = source
+        self.cassette = cassette
+
+    def get_transcript(self, video_id, languages):
+        """Récupère la transcription sur la source réelle et l'enregistre"""
+        key = f"transcript {video_id} {','.join(languages)}"
+        try:
+            segments = self.source.get_transcript(video_id, languages)
+        except Exception as e:
+            self.cassette.put(key, {'error': str(e)})
+            raise
+        self.cassette.put(key, {'segments': segments})
+        return segments
+
+
+class ReplayTranscriptSource:
+    """Source des transcriptions qui rejoue les réponses enregistrées"""
+
+    def __init__(self, cassette, latency=0.0):
+        self.cassette = cassette
+        self.latency = latency
+
+    def get_transcript(self, video_id, languages):
+        """Retourne la transcription enregistrée (ou relève l'erreur enregistrée)"""
+        if self.latency:
+            time.sleep(self.latency)
+        recorded = self.cassette.get(f"transcript {video_id} {','.join(languages)}")
+        if 'error' in recorded:
+            raise Exception(recorded['error'])
+        return recorded['segments']
+
+
+class SyntheticChannel:
+    """
+    Chaîne YouTube synthétique déterministe : sert à la fois de transport HTTP pour l'API
+    YouTube Data (recherche, chaîne, playlist des uploads, vidéos) et de source des transcriptions
+    """
+
+    # Mots utilisés pour générer le texte des transcriptions
+    WORDS = ("vidéo", "données", "modèle", "recherche", "contexte", "réponse", "question", "analyse",
+             "transcription", "chaîne", "segment", "index", "vecteur", "document", "assistant", "rapport")
+
+    def __init__(self, num_videos=500, latency=0.05, segments=120, missing_ratio=0.0, seed=0):
+        """
+        Initialisation de la chaîne synthétique
+
+        Args:
+            num_videos: Nombre de vidéos de la chaîne
+            latency: Délai simulé de chaque requête (secondes)
+            segments: Nombre de segments de chaque transcription
+            missing_ratio: Proportion de vidéos sans transcription
+            seed: Graine des données générées
+        """
+        self.num_videos = num_videos
+        self.latency = latency
+        self.segments = segments
+        self.missing_ratio = missing_ratio
+        self.seed = seed
+        self.channel_id = f"UCsynthetic{seed:011d}"
+        self.playlist_id = f"UU{self.channel_id[2:]}"
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def video_id(self, index):
+        """Retourne l'ID (11 caractères) de la vidéo d'index donné (0 = la plus ancienne)"""
+        return f"syn{index:08d}"
+
+    def _index(self, video_id):
+        """Retourne l'index d'une vidéo synthétique ou None"""
+        if video_id.startswith("syn") and video_id[3:].isdigit() and int(video_id[3:]) < self.num_videos:
+            return int(video_id[3:])
+        return None
+
+    def _wait(self):
+        """Simule la latence d'une requête et la compte"""
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _video(self, index):
+        """Données (snippet et statistiques) d'une vidéo"""
+        return {
+            'kind': 'youtube#video',
+            'id': self.video_id(index),
+            'snippet': {
+                'title': f"Vidéo synthétique {index}",
+                'description': f"Description de la vidéo synthétique {index}",
+                'publishedAt': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(1704067200 + index * 86400)),
+                'channelId': self.channel_id
+            },
+            'statistics': {'viewCount': str(1000 + index), 'likeCount': str(index)}
+        }
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        """Répond aux requêtes de l'API YouTube Data utilisées par l'application"""
+        self._wait()
+        parsed = urlparse(uri)
+        params = dict(parse_qsl(parsed.query))
+        endpoint = parsed.path.rstrip('/').split('/')[-1]
+
+        if endpoint == 'search':
+            payload = {'items': [{'id': {'kind': 'youtube#channel', 'channelId': self.channel_id}}]}
+        elif endpoint == 'channels':
+            found = params.get('id') == self.channel_id
+            payload = {'items': [{'contentDetails': {'relatedPlaylists': {'uploads': self.playlist_id}}}] if found else []}
+        elif endpoint == 'playlistItems':
+            start = int(params.get('pageToken') or 0)
+            page_size = int(params.get('maxResults', 50))
+            # Playlist des uploads : de la plus récente à la plus ancienne
+            indexes = list(range(self.num_videos - 1, -1, -1))[start:start + page_size]
+            payload = {'items': [{'contentDetails': {'videoId': self.video_id(index)},
+                                  'snippet': self._video(index)['snippet']} for index in indexes]}
+            if start + page_size < self.num_videos:
+                payload['nextPageToken'] = str(start + page_size)
+        elif endpoint == 'videos':
+            indexes = [self._index(video_id) for video_id in params.get('id', '').split(',')]
+            payload = {'items': [self._video(index) for index in indexes if index is not None]}
+        else:
+            content = json.dumps({'error': {'code': 404, 'message': f"Point d'accès inconnu : {endpoint}"}})
+            return _make_response(404, {'content-type': 'application/json'}, content.encode('utf-8'))
+
+        return _make_response(200, {'content-type': 'application/json'}, json.dumps(payload).encode('utf-8'))
+
+    def get_transcript(self, video_id, languages):
+        """Génère la transcription déterministe d'une vidéo synthétique"""
+        self._wait()
+        index = self._index(video_id)
+        rng = random.Random(f"{self.seed}-{video_id}")
+        if index is None or rng.random() < self.missing_ratio:
+            raise Exception(f"Aucune transcription disponible pour la vidéo {video_id}")
+        segments = []
+        start = 0.0
+        for _ in range(self.segments):
+            duration = round(rng.uniform(1.5, 6.0), 2)
+            text = " ".join(rng.choice(self.WORDS) for _ in range(rng.randint(5, 14)))
+            segments.append({'text': text, 'start': round(start, 2), 'duration': duration})
+            start += duration
+        return segments
+
+    def close(self):
+        """Rien à fermer"""
@@ -0,0 +1,136 @@
+"""
+Module watcher.py - Surveillance d'un dossier source pour Blow Chat YT
+Détecte les fichiers nouveaux, modifiés ou supprimés par scrutation périodique et les
+regroupe sur une fenêtre d'attente avant de déclencher leur traitement.
+"""
+
+import os
+import threading
+import time
+
+from extraction import SUPPORTED_EXTENSIONS
+from pipeline import PipelineCancelled
+from storage import COMPRESSED_SUFFIX, logical_name
+
+# Horodatages d'une transcription ('abc.timings.json' à côté de 'abc.txt')
+TIMINGS_SUFFIX = '.timings.json'
+
+
+def source_name(filename):
+    """Retourne le fichier source concerné par un changement (la transcription pour ses horodatages)"""
+    if filename.endswith(TIMINGS_SUFFIX):
+        return filename[:-len(TIMINGS_SUFFIX)] + '.txt'
+    return filename
+
+
+class FolderWatcher:
+    """Surveillance d'un dossier par scrutation, avec regroupement des changements (anti-rebond)"""
+
+    def __init__(self, folder, on_change, interval=5.0, debounce=10.0, extensions=SUPPORTED_EXTENSIONS,
+                 max_retry_delay=300.0):
+        """
+        Initialisation de la surveillance
+
+        Args:
+            folder: Dossier à surveiller
+            on_change: Fonction on_change(noms des fichiers nouveaux, modifiés ou supprimés) appelée
+                       dans le thread de surveillance, avec None pour le premier lot (synchronisation
+                       complète) ; en cas d'erreur, le lot est repris après un délai croissant
+            interval: Intervalle entre deux scrutations du dossier (secondes)
+            debounce: Délai sans nouveau changement avant de traiter un lot (secondes)
+            extensions: Extensions des fichiers surveillés
+            max_retry_delay: Délai maximal entre deux tentatives d'un lot en échec (secondes)
+        """
+        self.folder = folder
+        self.on_change = on_change
+        self.interval = max(0.1, interval)
+        self.debounce = max(0.0, debounce)
+        self.extensions = extensions
+        self.max_retry_delay = max(self.interval, max_retry_delay)
+        self.stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def snapshot(self):
+        """
+        Relève l'état des fichiers surveillés
+
+        Returns:
+            dict: {nom logique du fichier: (taille, date de modification en ns)}, un fichier
+                  compressé ('abc.txt.gz') étant désigné par son nom logique ('abc.txt') ; les
+                  horodatages des transcriptions ('abc.timings.json') sont aussi relevés
+        """
+        extensions = self.extensions + (TIMINGS_SUFFIX,)
+        extensions += tuple(extension + COMPRESSED_SUFFIX for extension in extensions)
+        state = {}
+        try:
+            entries = os.scandir(self.folder)
+        except OSError:
+            return state
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(extensions) and entry.is_file():
+                    stat = entry.stat()
+                    state[logical_name(entry.name)] = (stat.st_size, stat.st_mtime_ns)
+        return state
+
+    def start(self):
+        """Démarre la surveillance ; le premier lot est une synchronisation complète du dossier"""
+        self._thread.start()
+
+    def stop(self, timeout=5.0):
+        """
+        Arrête la surveillance (un traitement en cours est annulé via stop_event)
+
+        Args:
+            timeout: Durée maximale d'attente de la fin du thread (secondes)
+        """
+        self.stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _run(self):
+        """Boucle de scrutation : accumule les changements puis les traite après le délai d'attente"""
+        previous = self.snapshot()
+        # Fichiers ajoutés, modifiés ou supprimés pendant que l'application était fermée :
+        # synchronisation complète dès le démarrage (y compris les sources enregistrées dans la base)
+        full_sync = True
+        pending = set()
+        last_change = time.monotonic() - self.debounce
+        failures = 0
+        retry_at = 0.0
+
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            if (full_sync or pending) and now - last_change >= self.debounce and now >= retry_at:
+                batch, pending = pending, set()
+                try:
+                    self.on_change(None if full_sync else sorted(batch))
+                except PipelineCancelled:
+                    return
+                except Exception as e:
+                    # Lot conservé : nouvelle tentative après un délai doublé à chaque échec,
+                    # l'erreur n'étant signalée qu'une fois
+                    if not failures:
+                        print(f"Erreur lors du traitement des fichiers de '{self.folder}' : {e} "
+                              f"(nouvelles tentatives jusqu'à la réussite)")
+                    failures += 1
+                    retry_at = time.monotonic() + min(self.max_retry_delay, self.interval * 2 ** min(failures, 16))
+                    pending.update(batch)
+                else:
+                    if failures:
+                        print(f"Traitement des fichiers de '{self.folder}' rétabli après {failures} échecs")
+                    failures = 0
+                    retry_at = 0.0
+                    full_sync = False
+
+            if self.stop_event.wait(self.interval):
+                return
+
+            current = self.snapshot()
+            changed = {filename for filename, state in current.items() if previous.get(filename) != state}
+            changed |= set(previous) - set(current)
+            changed = {source_name(filename) for filename in changed}
+            previous = current
+            if changed:
+                pending |= changed
+                last_change = time.monotonic()
@@ -0,0 +1,128 @@
+"""
+Module youtube_api.py - Client de l'API YouTube Data pour Blow Chat YT
+Fournit un client unique par clé API, construit sans accès réseau à partir d'un document de
+découverte en cache, et un transport HTTP partagé avec pool de connexions.
+"""
+
+import json
+import os
+import threading
+
+import httplib2
+import requests
+from googleapiclient.discovery import build, build_from_document
+from requests.adapters import HTTPAdapter
+
+
+class PooledHttp:
+    """Transport HTTP compatible httplib2 reposant sur une session requests avec pool de connexions"""
+
+    def __init__(self, pool_size=10, timeout=30):
+        """
+        Initialisation du transport
+
+        Args:
+            pool_size: Nombre de connexions conservées ouvertes par hôte
+            timeout: Délai maximal d'une requête (secondes)
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, uri, method='GET', body=None, headers=None, redirections=5, connection_type=None):
+        """
+        Exécute une requête (même signature que httplib2.Http.request)
+
+        Returns:
+            tuple: (httplib2.Response, contenu en octets)
+        """
+        response = self.session.request(method, uri, data=body, headers=headers,
+                                        timeout=self.timeout, allow_redirects=redirections > 0)
+        info = {key.lower(): value for key, value in response.headers.items()}
+        # Le contenu est déjà décompressé par requests
+        info.pop('content-encoding', None)
+        info['status'] = str(response.status_code)
+        info['reason'] = response.reason
+        return httplib2.Response(info), response.content
+
+    def close(self):
+        """Ferme les connexions du pool"""
+        self.session.close()
+
+
+class YouTubeClientPool:
+    """Clients de l'API YouTube Data v3, un par clé API, construits à la demande"""
+
+    def __init__(self, discovery_cache_folder, http=None):
+        """
+        Initialisation du pool de clients
+
+        Args:
+            discovery_cache_folder: Dossier du document de découverte mis en cache
+            http: Transport partagé par les clients (défaut : PooledHttp)
+        """
+        self.discovery_path = os.path.join(discovery_cache_folder, 'youtube.v3.json')
+        self.http = http or PooledHttp()
+        self.clients = {}
+        self.document = None
+        self.lock = threading.Lock()
+
+    def load_discovery_document(self, api_key):
+        """
+        Charge le document de découverte : cache local, sinon copie fournie avec
+        google-api-python-client, sinon téléchargement (enregistré dans le cache)
+
+        Args:
+            api_key: Clé API utilisée si le document doit être téléchargé
+
+        Returns:
+            str: Document de découverte au format JSON
+        """
+        if os.path.exists(self.discovery_path):
+            with open(self.discovery_path, 'r', encoding='utf-8') as f:
+                return f.read()
+
+        document = None
+        try:
+            from googleapiclient.discovery_cache import get_static_doc
+            document = get_static_doc('youtube', 'v3')
+        except ImportError:
+            pass
+        if document is None:
+            service = build('youtube', 'v3', developerKey=api_key, http=self.http, cache_discovery=False)
+            document = json.dumps(service._rootDesc)
+
+        folder = os.path.dirname(self.discovery_path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        with open(f"{self.discovery_path}.tmp", 'w', encoding='utf-8') as f:
+            f.write(document)
+        os.replace(f"{self.discovery_path}.tmp", self.discovery_path)
+        return document
+
+    def get(self, api_key):
+        """
+        Retourne le client associé à une clé API, en le construisant au premier appel
+
+        Args:
+            api_key: Clé API YouTube
+
+        Returns:
+            Resource: Client de l'API YouTube Data v3
+        """
+        with self.lock:
+            client = self.clients.get(api_key)
+            if client is None:
+                if self.document is None:
+                    self.document = self.load_discovery_document(api_key)
+                client = build_from_document(self.document, developerKey=api_key, http=self.http)
+                self.clients[api_key] = client
+            return client
+
+    def close(self):
+        """Oublie les clients construits et ferme le transport"""
+        with self.lock:
+            self.clients.clear()
+        self.http.close()